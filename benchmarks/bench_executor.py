@@ -0,0 +1,72 @@
+"""
+Benchmark dos modos de execução da malha de interpolação (``PrecipitationModel.executor``).
+
+Para cada modo ("serial", "threads" e "processes"), calcula a precipitação das previsões
+de exemplo duas vezes com o mesmo modelo: a primeira a frio (triangulação, pesos e pool
+criados) e a segunda com os pesos em cache e o pool já iniciado, que é o custo de cada
+chamada seguinte (ex.: modo serviço ou conjuntos com várias rodadas).
+
+Uso:
+    python benchmarks/bench_executor.py [--repeat N] [--max-workers N]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+DATA_DIR: str = os.path.join(BASE_DIR, "data")
+
+sys.path.insert(0, BASE_DIR)
+
+from utils import model as model_module  # noqa: E402
+from utils.data_reader import read_contour_file, read_forecast_cube  # noqa: E402
+from utils.model import PREDICTION_EXECUTORS, PrecipitationModel  # noqa: E402
+from utils.preprocess import apply_contour, transform_data  # noqa: E402
+
+
+def _clear_model_caches() -> None:
+    """Descarta triangulações e pesos em cache para medir execuções a frio."""
+    model_module._triangulation.cache_clear()
+    model_module._grid_axes.cache_clear()
+    model_module._interpolation_weights.cache_clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    contour = read_contour_file(os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln"))
+    df = transform_data(apply_contour(contour, read_forecast_cube(DATA_DIR)))
+    dates = df["data_previsao"].sort_values().unique()
+
+    print(f"CPUs: {os.cpu_count()} | workers: {args.max_workers or 'padrão'}")
+    print(f"{'modo':>10} {'frio [s]':>10} {'quente [s]':>11} {'acumulado [mm]':>15}")
+    for executor in PREDICTION_EXECUTORS:
+        _clear_model_caches()
+        model = PrecipitationModel(df, executor=executor, max_workers=args.max_workers)
+        try:
+            start = time.perf_counter()
+            accumulated = float(np.sum(model.predict_many(dates)))
+            cold = time.perf_counter() - start
+
+            warm = np.inf
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                model.predict_many(dates)
+                warm = min(warm, time.perf_counter() - start)
+        finally:
+            model.close()
+
+        print(f"{executor:>10} {cold:>10.3f} {warm:>11.3f} {accumulated:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark do tempo de importação (python -X importtime) dos pontos de entrada.
+
+Cada cenário é executado em um interpretador novo; o tempo reportado é o melhor de N
+execuções do tempo cumulativo de importação do módulo de entrada, junto com os pacotes
+de terceiros mais caros. Os cenários são:
+
+    - compute: ``import main`` (caminho sem figuras, usado por --no-plot)
+    - plot:    ``import main`` seguido de ``import utils.plotter`` (matplotlib)
+
+Uso:
+    python benchmarks/bench_import.py [--repeat N] [--output benchmarks/results/import_time.csv]
+"""
+
+import os
+import re
+import sys
+import csv
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+
+SCENARIOS: Dict[str, str] = {
+    "compute": "import main",
+    "plot": "import main; import utils.plotter",
+}
+
+# Módulos reportados: pontos de entrada e pacotes de terceiros
+MODULES: Tuple[str, ...] = (
+    "main",
+    "utils.plotter",
+    "numpy",
+    "pandas",
+    "scipy",
+    "matplotlib",
+    "geopandas",
+)
+
+# Linha do -X importtime: "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _import_times(statement: str) -> Dict[str, int]:
+    """
+    Executa ``statement`` em um interpretador novo e retorna o tempo cumulativo (µs)
+    de importação de cada módulo.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in process.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is not None:
+            _, cumulative, _, module = match.groups()
+            times[module] = int(cumulative)
+    return times
+
+
+def measure(statement: str, repeat: int) -> Dict[str, int]:
+    """
+    Melhor tempo (µs) de ``repeat`` execuções para cada módulo de ``MODULES`` importado.
+
+    Um pacote importado indiretamente (ex.: numpy pelo pandas) é contabilizado apenas
+    na primeira importação, logo os tempos dos pacotes estão contidos nos de "main".
+    """
+    runs = [_import_times(statement) for _ in range(repeat)]
+
+    return {
+        module: min(run[module] for run in runs)
+        for module in MODULES
+        if all(module in run for run in runs)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--output",
+        help="Arquivo CSV onde os resultados são gravados (ex.: benchmarks/results/import_time.csv)",
+    )
+    args = parser.parse_args()
+
+    rows: List[Tuple[str, str, int]] = []
+    for scenario, statement in SCENARIOS.items():
+        for module, elapsed in measure(statement, args.repeat).items():
+            rows.append((scenario, module, elapsed))
+
+    print(f"{'cenário':>10} {'módulo':>12} {'tempo [ms]':>11}")
+    for scenario, module, elapsed in rows:
+        print(f"{scenario:>10} {module:>12} {elapsed / 1000:>11.1f}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["cenario", "modulo", "tempo_us"])
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
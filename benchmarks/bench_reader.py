@@ -0,0 +1,106 @@
+"""
+Benchmark do leitor de arquivos .dat: leitor vetorizado vs. leitor original (listas Python),
+e leitura dos pontos próximos à bacia (retângulo envolvente) vs. leitura completa.
+
+Uso:
+    python benchmarks/bench_reader.py [--repeat N]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+DATA_DIR: str = os.path.join(BASE_DIR, "data")
+
+sys.path.insert(0, BASE_DIR)
+
+from utils.data_reader import (  # noqa: E402
+    iter_dat_file,
+    read_contour_file,
+    read_dat_file_to_dataframe,
+)
+from utils.spatial import contour_bounding_box  # noqa: E402
+
+
+def legacy_read_dat_file_to_dataframe(file_path: str) -> pd.DataFrame:
+    """Leitor original, baseado em readlines/split/map(float) por linha."""
+    with open(file_path, "r") as f:
+        raw_file = f.readlines()
+
+    list_dados = [line.split() for line in raw_file]
+    float_raw_lines = [list(map(float, raw_line)) for raw_line in list_dados]
+    df = pd.DataFrame(float_raw_lines, columns=["lat", "long", "data_value"])
+    df["file_path"] = file_path
+    return df
+
+
+def _time_reader(reader, file_paths, repeat: int) -> float:
+    """Retorna o melhor tempo (s) de leitura de todos os arquivos."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for file_path in file_paths:
+            reader(file_path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    file_paths = sorted(glob.glob(os.path.join(DATA_DIR, "*.dat")))
+
+    # Garante que ambos os leitores produzem o mesmo resultado
+    for file_path in file_paths:
+        pd.testing.assert_frame_equal(
+            legacy_read_dat_file_to_dataframe(file_path),
+            read_dat_file_to_dataframe(file_path),
+        )
+
+    legacy = _time_reader(legacy_read_dat_file_to_dataframe, file_paths, args.repeat)
+    vectorized = _time_reader(read_dat_file_to_dataframe, file_paths, args.repeat)
+
+    print(f"Arquivos: {len(file_paths)}")
+    print(f"Leitor original:   {legacy * 1000:8.1f} ms")
+    print(f"Leitor vetorizado: {vectorized * 1000:8.1f} ms")
+    print(f"Speedup:           {legacy / vectorized:8.1f}x")
+
+    # Leitura apenas do retângulo envolvente da bacia (modo incremental e serviço)
+    bbox = contour_bounding_box(
+        read_contour_file(os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln"))
+    )
+    for file_path in file_paths:
+        np.testing.assert_array_equal(
+            read_dat_file_to_dataframe(file_path, bbox=bbox)[
+                ["lat", "long", "data_value"]
+            ].to_numpy(),
+            np.array(list(iter_dat_file(file_path, bbox=bbox))).reshape(-1, 3),
+        )
+
+    subset = _time_reader(
+        lambda file_path: read_dat_file_to_dataframe(file_path, bbox=bbox),
+        file_paths,
+        args.repeat,
+    )
+    streaming = _time_reader(
+        lambda file_path: list(iter_dat_file(file_path, bbox=bbox)),
+        file_paths,
+        args.repeat,
+    )
+    print(f"Retângulo (linha a linha): {streaming * 1000:8.1f} ms")
+    print(f"Retângulo (vetorizado):    {subset * 1000:8.1f} ms")
+    print(f"Leitura completa:          {vectorized * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
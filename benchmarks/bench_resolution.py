@@ -0,0 +1,90 @@
+"""
+Benchmark de convergência da resolução da malha de interpolação.
+
+Para cada resolução e tipo de ponto flutuante, calcula a precipitação acumulada das
+previsões de exemplo e reporta tempo, pico de memória (tracemalloc) e a diferença
+para a resolução mais alta avaliada.
+
+Uso:
+    python benchmarks/bench_resolution.py [--resolutions 100 250 500 1000 2000] [--tile-rows 128]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+DATA_DIR: str = os.path.join(BASE_DIR, "data")
+
+sys.path.insert(0, BASE_DIR)
+
+from utils import model as model_module  # noqa: E402
+from utils.data_reader import read_contour_file, read_forecast_cube  # noqa: E402
+from utils.model import PrecipitationModel  # noqa: E402
+from utils.preprocess import apply_contour, transform_data  # noqa: E402
+
+
+def _clear_model_caches() -> None:
+    """Descarta triangulações e pesos em cache para medir execuções a frio."""
+    model_module._triangulation.cache_clear()
+    model_module._grid_axes.cache_clear()
+    model_module._interpolation_weights.cache_clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--resolutions", type=int, nargs="+", default=[100, 250, 500, 1000, 2000]
+    )
+    parser.add_argument(
+        "--tile-rows",
+        type=int,
+        default=128,
+        help="Linhas por bloco na avaliação em blocos (0 desativa)",
+    )
+    args = parser.parse_args()
+
+    contour = read_contour_file(os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln"))
+    df = transform_data(apply_contour(contour, read_forecast_cube(DATA_DIR)))
+    dates = df["data_previsao"].sort_values().unique()
+
+    tile_rows = args.tile_rows or None
+    rows = []
+    for resolution in sorted(args.resolutions):
+        for dtype in (np.float64, np.float32):
+            _clear_model_caches()
+            tracemalloc.start()
+            start = time.perf_counter()
+
+            model = PrecipitationModel(
+                df, resolution=resolution, dtype=dtype, tile_rows=tile_rows
+            )
+            accumulated = float(np.sum(model.predict_many(dates)))
+
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            rows.append((resolution, np.dtype(dtype).name, accumulated, elapsed, peak))
+
+    reference = rows[-2][2]
+    print(f"Avaliação em blocos: {tile_rows or 'desativada'} linhas")
+    print(
+        f"{'resolução':>10} {'dtype':>8} {'acumulado [mm]':>15} "
+        f"{'erro [mm]':>10} {'tempo [s]':>10} {'pico [MB]':>10}"
+    )
+    for resolution, dtype, accumulated, elapsed, peak in rows:
+        print(
+            f"{resolution:>10} {dtype:>8} {accumulated:>15.4f} "
+            f"{accumulated - reference:>10.4f} {elapsed:>10.3f} {peak / 2**20:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Suíte de benchmarks do pipeline sobre dados sintéticos (ver benchmarks/synthetic.py).
+
+Para cada combinação de espaçamento da grade, número de datas e número de vértices do
+contorno, gera os arquivos sintéticos e executa o pipeline completo (leitura, contorno,
+transformação e predição), reportando por etapa o tempo (melhor de N execuções a frio),
+a vazão em linhas/s e o pico de memória (tracemalloc, em uma execução separada para não
+distorcer os tempos). As etapas são as registradas por ``utils.profiler``.
+
+Os resultados são gravados em benchmarks/results/bench_<commit>.json, que não é
+versionado (o resumo fica em docs/modeling.md), e podem ser comparados entre commits:
+
+Uso:
+    python benchmarks/run_benchmarks.py [--spacings 0.4 0.2] [--dates 10 40] [--vertices 1058 10000]
+    python benchmarks/run_benchmarks.py --compare results/bench_<base>.json results/bench_<novo>.json
+"""
+
+import os
+import sys
+import json
+import shutil
+import platform
+import argparse
+import tempfile
+import itertools
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+RESULTS_DIR: str = os.path.join(FILE_DIR, "results")
+
+sys.path.insert(0, BASE_DIR)
+
+from benchmarks.synthetic import (  # noqa: E402
+    grid_coordinates,
+    write_bln_contour,
+    write_eta40_files,
+)
+from utils import model as model_module  # noqa: E402
+from utils.data_reader import read_contour_file, read_forecast_cube  # noqa: E402
+from utils.model import PrecipitationModel  # noqa: E402
+from utils.preprocess import apply_contour, transform_data  # noqa: E402
+from utils.profiler import PROFILER, stage  # noqa: E402
+
+# Variação relativa de tempo a partir da qual uma etapa é considerada uma regressão
+REGRESSION_THRESHOLD = 0.10
+
+
+def _clear_model_caches() -> None:
+    """Descarta triangulações e pesos em cache para medir execuções a frio."""
+    model_module._triangulation.cache_clear()
+    model_module._grid_axes.cache_clear()
+    model_module._interpolation_weights.cache_clear()
+
+
+def _git_commit() -> str:
+    """Hash curto do commit atual, com o sufixo "-dirty" se houver alterações não commitadas."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if status else commit
+
+
+def run_pipeline(folder_path: str, contour_path: str) -> None:
+    """Executa o pipeline completo sobre uma pasta de previsões, sem cache em disco."""
+    with stage("end_to_end"):
+        contour = read_contour_file(contour_path)
+        df = transform_data(apply_contour(contour, read_forecast_cube(folder_path)))
+        dates = df["data_previsao"].sort_values().unique()
+        PrecipitationModel(data=df).predict_many(dates)
+
+
+def measure_case(folder_path: str, contour_path: str, repeat: int) -> Dict[str, dict]:
+    """
+    Mede as etapas do pipeline: melhor tempo de ``repeat`` execuções e pico de memória.
+
+    Returns:
+        Dict[str, dict]: Medidas de cada etapa (tempo, CPU, linhas, vazão e pico de memória).
+    """
+    stages: Dict[str, dict] = {}
+
+    for _ in range(repeat):
+        _clear_model_caches()
+        PROFILER.reset()
+        PROFILER.start()
+        run_pipeline(folder_path, contour_path)
+        PROFILER.stop()
+
+        for name, stats in PROFILER.stats.items():
+            best = stages.get(name)
+            if best is None or stats.wall_time < best["wall_time"]:
+                stages[name] = {
+                    "calls": stats.calls,
+                    "wall_time": stats.wall_time,
+                    "cpu_time": stats.cpu_time,
+                    "rows": stats.rows,
+                    "throughput": (
+                        stats.rows / stats.wall_time
+                        if stats.rows and stats.wall_time > 0
+                        else None
+                    ),
+                }
+
+    # Execução separada para a memória: o tracemalloc distorce os tempos
+    _clear_model_caches()
+    PROFILER.reset()
+    PROFILER.start(trace_memory=True)
+    run_pipeline(folder_path, contour_path)
+    PROFILER.stop()
+    for name, stats in PROFILER.stats.items():
+        stages.setdefault(name, {})["peak_memory"] = stats.peak_memory
+
+    PROFILER.reset()
+    return stages
+
+
+def run_benchmarks(
+    spacings: List[float], dates: List[int], vertices: List[int], repeat: int
+) -> dict:
+    """
+    Executa a suíte para todas as combinações de parâmetros.
+
+    Returns:
+        dict: Os resultados, com os metadados do ambiente e as medidas de cada caso.
+    """
+    cases = []
+    work_dir = tempfile.mkdtemp(prefix="btg-bench-")
+    try:
+        for spacing, n_dates, n_vertices in itertools.product(
+            spacings, dates, vertices
+        ):
+            folder_path = os.path.join(work_dir, f"s{spacing}_d{n_dates}")
+            if not os.path.isdir(folder_path):
+                write_eta40_files(folder_path, n_dates=n_dates, spacing=spacing)
+            contour_path = os.path.join(work_dir, f"v{n_vertices}.bln")
+            if not os.path.exists(contour_path):
+                write_bln_contour(contour_path, n_vertices=n_vertices)
+
+            n_points = len(grid_coordinates(spacing)[0])
+            print(
+                f"Caso: espaçamento {spacing}° ({n_points} pontos), "
+                f"{n_dates} datas, {n_vertices} vértices",
+                flush=True,
+            )
+            cases.append(
+                {
+                    "spacing": spacing,
+                    "n_points": n_points,
+                    "n_dates": n_dates,
+                    "n_vertices": n_vertices,
+                    "stages": measure_case(folder_path, contour_path, repeat),
+                }
+            )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
+def _case_key(case: dict) -> tuple:
+    return case["spacing"], case["n_dates"], case["n_vertices"]
+
+
+def print_results(results: dict) -> None:
+    """Imprime uma tabela com as medidas de cada caso e etapa."""
+    print(f"\nCommit {results['commit']} - melhor de {results['repeat']} execuções")
+    print(
+        f"{'espaç.':>6} {'datas':>5} {'vért.':>6} {'etapa':>22} {'tempo [ms]':>11} "
+        f"{'linhas/s':>12} {'pico [MB]':>10}"
+    )
+    for case in results["cases"]:
+        for name, stats in case["stages"].items():
+            throughput = stats.get("throughput")
+            peak = stats.get("peak_memory")
+            print(
+                f"{case['spacing']:>6} {case['n_dates']:>5} {case['n_vertices']:>6} "
+                f"{name:>22} {stats['wall_time'] * 1000:>11.1f} "
+                f"{'' if throughput is None else f'{throughput:.3g}':>12} "
+                f"{'' if peak is None else f'{peak / 2**20:.1f}':>10}"
+            )
+
+
+def compare(base_path: str, new_path: str, threshold: float) -> bool:
+    """
+    Compara os tempos por caso e etapa de dois arquivos de resultados.
+
+    Returns:
+        bool: True se alguma etapa ficou mais lenta que o limiar de regressão.
+    """
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    base_cases = {_case_key(case): case for case in base["cases"]}
+
+    print(f"Base: {base['commit']}  Novo: {new['commit']}  Limiar: {threshold:.0%}")
+    print(
+        f"{'espaç.':>6} {'datas':>5} {'vért.':>6} {'etapa':>22} "
+        f"{'base [ms]':>10} {'novo [ms]':>10} {'razão':>7}"
+    )
+    regression = False
+    for case in new["cases"]:
+        base_case = base_cases.get(_case_key(case))
+        if base_case is None:
+            continue
+        for name, stats in case["stages"].items():
+            base_stats = base_case["stages"].get(name)
+            if base_stats is None or base_stats["wall_time"] <= 0:
+                continue
+
+            ratio = stats["wall_time"] / base_stats["wall_time"]
+            flag = "  REGRESSÃO" if ratio > 1 + threshold else ""
+            regression = regression or bool(flag)
+            print(
+                f"{case['spacing']:>6} {case['n_dates']:>5} {case['n_vertices']:>6} "
+                f"{name:>22} {base_stats['wall_time'] * 1000:>10.1f} "
+                f"{stats['wall_time'] * 1000:>10.1f} {ratio:>7.2f}{flag}"
+            )
+
+    return regression
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--spacings", type=float, nargs="+", default=[0.4, 0.2])
+    parser.add_argument("--dates", type=int, nargs="+", default=[10, 40])
+    parser.add_argument("--vertices", type=int, nargs="+", default=[1058, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output",
+        help="Arquivo JSON dos resultados. Padrão: benchmarks/results/bench_<commit>.json",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "NOVO"),
+        help="Compara dois arquivos de resultados em vez de executar a suíte",
+    )
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.compare:
+        regression = compare(*args.compare, threshold=args.threshold)
+        sys.exit(1 if regression else 0)
+
+    results = run_benchmarks(args.spacings, args.dates, args.vertices, args.repeat)
+    print_results(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench_{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResultados: {output}")
+
+
+if __name__ == "__main__":
+    main()
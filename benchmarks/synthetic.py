@@ -0,0 +1,173 @@
+"""
+Geradores de dados sintéticos para os benchmarks: previsões ETA40 (.dat) e contornos (.bln).
+
+Os arquivos seguem o layout dos arquivos reais: registros de largura fixa
+``"-75.00 -35.00   0.0\\r\\n"`` ordenados por latitude e longitude, nomes no padrão
+``ETA40_pDDMMYYaDDMMYY.dat`` e contornos com cabeçalho ``"n,0"`` seguido de ``lat,long``.
+
+Uso:
+    python benchmarks/synthetic.py PASTA [--spacing 0.4] [--dates 10] [--vertices 1058]
+"""
+
+import os
+import argparse
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import numpy as np
+
+# Extensão da grade do modelo ETA40 (ver data/*.dat)
+LAT_RANGE: Tuple[float, float] = (-75.0, -30.2)
+LONG_RANGE: Tuple[float, float] = (-35.0, 5.0)
+GRID_SPACING: float = 0.4
+
+# Centro e raio aproximados da bacia de Camargos
+BASIN_CENTER: Tuple[float, float] = (-44.3, -21.8)
+BASIN_RADIUS: float = 0.45
+
+# Data de emissão das previsões sintéticas
+ISSUE_DATE: date = date(2021, 12, 1)
+
+
+def grid_coordinates(spacing: float = GRID_SPACING) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coordenadas de uma grade regular sobre a extensão do ETA40, na ordem dos arquivos reais.
+
+    Args:
+        spacing (float): Espaçamento da grade, em graus.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: As latitudes e longitudes de cada ponto.
+    """
+    lat = np.round(np.arange(LAT_RANGE[0], LAT_RANGE[1] + spacing / 2, spacing), 2)
+    long = np.round(np.arange(LONG_RANGE[0], LONG_RANGE[1] + spacing / 2, spacing), 2)
+    grid_lat, grid_long = np.meshgrid(lat, long, indexing="ij")
+    return grid_lat.ravel(), grid_long.ravel()
+
+
+def precipitation_field(
+    lat: np.ndarray, long: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Campo de precipitação suave (mm), com regiões secas, arredondado a 0,1 mm.
+
+    Args:
+        lat (np.ndarray): Latitudes dos pontos.
+        long (np.ndarray): Longitudes dos pontos.
+        rng (np.random.Generator): Gerador de números aleatórios.
+
+    Returns:
+        np.ndarray: A precipitação de cada ponto.
+    """
+    phase = rng.uniform(0, 2 * np.pi, size=2)
+    frequency = rng.uniform(0.1, 0.4, size=2)
+    field = 20 * (
+        np.sin(frequency[0] * lat + phase[0]) * np.cos(frequency[1] * long + phase[1])
+    )
+    field += rng.gamma(0.5, 2.0, size=lat.shape)
+    return np.round(np.clip(field, 0, 999.9), 1)
+
+
+def write_eta40_files(
+    folder_path: str,
+    n_dates: int = 10,
+    spacing: float = GRID_SPACING,
+    seed: int = 0,
+) -> List[str]:
+    """
+    Escreve ``n_dates`` arquivos de previsão ETA40 sintéticos, um por dia a partir da emissão.
+
+    Args:
+        folder_path (str): Pasta de destino (criada se não existir).
+        n_dates (int): Número de datas (arquivos) de previsão.
+        spacing (float): Espaçamento da grade, em graus (0,4 nos arquivos reais).
+        seed (int): Semente do gerador de números aleatórios.
+
+    Returns:
+        List[str]: Os caminhos dos arquivos escritos.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    lat, long = grid_coordinates(spacing)
+
+    # Coordenadas formatadas uma única vez: apenas a precipitação muda entre arquivos
+    coordinates = np.char.add(
+        np.char.mod("%6.2f ", lat), np.char.mod("%6.2f", long)
+    ).astype(object)
+
+    file_paths = []
+    for day in range(1, n_dates + 1):
+        target_date = ISSUE_DATE + timedelta(days=day)
+        file_name = f"ETA40_p{ISSUE_DATE.strftime('%d%m%y')}a{target_date.strftime('%d%m%y')}.dat"
+        file_path = os.path.join(folder_path, file_name)
+
+        values = np.char.mod("%6.1f", precipitation_field(lat, long, rng)).astype(
+            object
+        )
+        with open(file_path, "w", newline="") as f:
+            f.write("".join(coordinates + values + "\r\n"))
+        file_paths.append(file_path)
+
+    return file_paths
+
+
+def write_bln_contour(
+    file_path: str,
+    n_vertices: int = 1058,
+    center: Tuple[float, float] = BASIN_CENTER,
+    radius: float = BASIN_RADIUS,
+    seed: int = 0,
+) -> str:
+    """
+    Escreve um contorno sintético (polígono estrelado fechado) no formato .bln.
+
+    Args:
+        file_path (str): Caminho do arquivo de destino.
+        n_vertices (int): Número de vértices, incluindo o vértice de fechamento.
+        center (Tuple[float, float]): Centro (lat, long) da bacia.
+        radius (float): Raio médio da bacia, em graus.
+        seed (int): Semente do gerador de números aleatórios.
+
+    Returns:
+        str: O caminho do arquivo escrito.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Raio suave em função do ângulo: soma de poucos harmônicos
+    angle = np.linspace(0, 2 * np.pi, n_vertices - 1, endpoint=False)
+    harmonics = np.arange(1, 6)
+    amplitude = rng.uniform(0, 0.15, size=len(harmonics)) / harmonics
+    phase = rng.uniform(0, 2 * np.pi, size=len(harmonics))
+    scale = 1 + np.sum(
+        amplitude[:, None] * np.sin(harmonics[:, None] * angle + phase[:, None]), axis=0
+    )
+
+    lat = center[0] + radius * scale * np.cos(angle)
+    long = center[1] + radius * scale * np.sin(angle)
+    lat, long = np.append(lat, lat[0]), np.append(long, long[0])
+
+    os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+    with open(file_path, "w", newline="") as f:
+        f.write(f"{n_vertices},0\r\n")
+        f.writelines(f"{x!r},{y!r}\r\n" for x, y in zip(lat.tolist(), long.tolist()))
+
+    return file_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("folder_path")
+    parser.add_argument("--spacing", type=float, default=GRID_SPACING)
+    parser.add_argument("--dates", type=int, default=10)
+    parser.add_argument("--vertices", type=int, default=1058)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    write_eta40_files(args.folder_path, args.dates, args.spacing, args.seed)
+    write_bln_contour(
+        os.path.join(args.folder_path, "SINTETICA.bln"), args.vertices, seed=args.seed
+    )
+
+
+if __name__ == "__main__":
+    main()
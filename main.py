@@ -1,30 +1,31 @@
 import os
+import argparse
 import numpy as np
 import pandas as pd
-
+from typing import List, Optional
 
 # Módulos auxiliares
-from utils.data_reader import multithreading_reader_dat_file, read_contour_file
+from utils.cache import ArrayCache, default_cache
+from utils.data_reader import read_contour_file, read_forecast_cube
 from utils.preprocess import apply_contour, transform_data
-from utils.model import PrecipitationModel
-from utils.plotter import result_figure
+from utils.model import PREDICTION_EXECUTORS, PrecipitationModel
+from utils.profiler import PROFILER, stage
 
 # Variáveis globais
 FILE_DIR = os.path.abspath(__file__)
 BASE_DIR = os.path.dirname(FILE_DIR)
 DATA_DIR = os.path.join(BASE_DIR, "data")
+CONTOUR_FILE = os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln")
 
 
-def load_data() -> pd.DataFrame:
-    """Carrega os dados dos arquivos"""
+def load_data(cache: Optional[ArrayCache] = None) -> pd.DataFrame:
+    """Carrega os dados dos arquivos, reaproveitando o cache em disco quando fornecido"""
 
     # DataFrame com os dados
-    contour = (
-        read_contour_file(file_path=os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln")),
-    )[0]
+    contour = (read_contour_file(file_path=CONTOUR_FILE, cache=cache),)[0]
 
-    # DataFrame com as previsões de precitações
-    forecast = multithreading_reader_dat_file(folder_path=DATA_DIR)
+    # Cubo com as previsões de precitações
+    forecast = read_forecast_cube(folder_path=DATA_DIR, cache=cache)
 
     # DataFrame com previsões e dados da área da bacia
     df = apply_contour(contour, forecast)
@@ -32,26 +33,310 @@ def load_data() -> pd.DataFrame:
     return df
 
 
-def main() -> None:
+def compute(cache: Optional[ArrayCache] = None, executor: str = "serial") -> pd.Series:
+    """
+    Calcula a precipitação diária da bacia para cada data de previsão, sem gerar figuras.
+
+    Este caminho não importa o matplotlib (``utils.plotter`` só é importado ao gerar a
+    figura do resultado), reduzindo o tempo de inicialização de execuções em lote.
+
+    Args:
+        cache (Optional[ArrayCache]): Cache em disco dos arquivos já processados.
+        executor (str): Modo de execução da malha de interpolação (ver ``PrecipitationModel``).
+
+    Returns:
+        pd.Series: A precipitação de cada data, indexada pelas datas de previsão em ordem
+        cronológica.
+    """
     # Dataframe base
-    df: pd.DataFrame = load_data().pipe(transform_data)
+    df: pd.DataFrame = load_data(cache=cache).pipe(transform_data)
+
+    # Resultado de predição para cada data, em ordem cronológica
+    model = PrecipitationModel(data=df.copy(), executor=executor)
+    try:
+        return model.predict_all()
+    finally:
+        model.close()
+
+
+def compute_mask(
+    cache: Optional[ArrayCache] = None, tolerance: Optional[float] = None
+) -> pd.Series:
+    """
+    Calcula a precipitação média diária da bacia pela máscara do contorno sobre a grade.
+
+    Cada célula da grade é ponderada pela fração coberta pelo polígono da bacia (ver
+    ``BasinMask``); a máscara é calculada uma única vez e cada data custa um produto escalar.
+
+    Args:
+        cache (Optional[ArrayCache]): Cache em disco dos arquivos já processados.
+        tolerance (Optional[float]): Tolerância, em graus, da simplificação do contorno
+            (ver ``read_contour_file``). Se None, o contorno original é utilizado.
+
+    Returns:
+        pd.Series: A precipitação média de cada data, indexada pelas datas de previsão em
+        ordem cronológica.
+    """
+    from utils.basin_mask import basin_mask
+
+    contour = read_contour_file(
+        file_path=CONTOUR_FILE, cache=cache, tolerance=tolerance
+    )
+    forecast = read_forecast_cube(folder_path=DATA_DIR, cache=cache)
+
+    mask = basin_mask(contour, forecast.lat, forecast.long)
+    daily = pd.Series(
+        mask.mean(forecast.values),
+        index=pd.DatetimeIndex(forecast.file_table()["data_previsao"]),
+        name="precipitacao",
+    )
+    return daily.sort_index(kind="stable")
+
+
+def latest_run_summary(result: pd.DataFrame) -> str:
+    """
+    Resume o acumulado da rodada mais recente de ``IncrementalPipeline.result``.
+
+    Args:
+        result (pd.DataFrame): Resultado diário e acumulado por rodada.
+
+    Returns:
+        str: Texto com a rodada, a última data prevista e o acumulado até ela.
+    """
+    last = result[result["data_emissao"] == result["data_emissao"].max()].iloc[-1]
+    return (
+        f"Rodada {last['data_emissao']:%d/%m/%y} até {last['data_previsao']:%d/%m/%y}: "
+        f"precipitação acumulada {np.round(last['precipitacao_acumulada'], 2)} mm"
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(
+        description="Previsão de precipitação acumulada - Bacia Rio Grande"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Não lê nem grava o cache em disco dos arquivos já processados",
+    )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="Apenas calcula o resultado numérico, sem gerar a figura (não importa o matplotlib)",
+    )
+    parser.add_argument(
+        "--executor",
+        choices=PREDICTION_EXECUTORS,
+        default="serial",
+        help="Distribui blocos da malha de interpolação entre threads ou processos",
+    )
+    parser.add_argument(
+        "--contour-dir",
+        help="Pasta com contornos .bln: calcula a precipitação de todas as bacias",
+    )
+    parser.add_argument(
+        "--mask",
+        action="store_true",
+        help=(
+            "Calcula a precipitação média da bacia (cada célula da grade ponderada pela "
+            "fração coberta pelo contorno, sem interpolação) em vez do máximo da integral "
+            "sobre a malha interpolada; os dois valores não são comparáveis"
+        ),
+    )
+    parser.add_argument(
+        "--simplify",
+        type=float,
+        metavar="TOL",
+        help="Simplifica o contorno (Douglas-Peucker, tolerância em graus) antes de calcular a máscara de --mask",
+    )
+    parser.add_argument(
+        "--ensemble",
+        action="store_true",
+        help="Previsões por conjunto: acumulado e percentis por rodada entre os membros",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Processa apenas os arquivos de previsão novos ou alterados desde a última execução",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Modo serviço: observa a pasta de previsões e processa os arquivos novos assim que chegam",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Intervalo, em segundos, entre as varreduras da pasta no modo --watch",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Grava o tempo, a CPU e as linhas de cada etapa em um relatório .json ou .csv",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help=(
+            "Inclui o pico de memória (tracemalloc) de cada etapa no relatório de --profile; "
+            "incompatível com --executor threads, e a memória de outros processos não é medida"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    # O tracemalloc mede o processo inteiro: com threads, o pico de uma etapa incluiria
+    # as alocações das etapas de outras threads
+    if args.profile_memory and args.executor == "threads":
+        parser.error("--profile-memory não pode ser usado com --executor threads")
+
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+
+    if not args.profile:
+        run(args)
+        return
+
+    # Registro de tempos por etapa, gravado mesmo se a execução falhar
+    PROFILER.start(trace_memory=args.profile_memory)
+    try:
+        with stage("main"):
+            run(args)
+    finally:
+        PROFILER.report(args.profile)
+        PROFILER.stop()
+
+
+def run(args: argparse.Namespace) -> None:
+    """Executa o modo selecionado pelos argumentos de linha de comando"""
+    cache = default_cache(enabled=not args.no_cache)
+
+    # Processamento em lote de várias bacias
+    if args.contour_dir:
+        from utils.basins import process_basins
+
+        result = process_basins(args.contour_dir, DATA_DIR, cache=cache)
+        accumulated = result.groupby("bacia", sort=False)[
+            "precipitacao_acumulada"
+        ].last()
+        for basin, value in accumulated.items():
+            print(f"{basin}: precipitação acumulada {np.round(value, 2)} mm")
+        return
+
+    # Modo serviço: observa a pasta e processa os arquivos novos
+    if args.watch:
+        import asyncio
+        from utils.service import ForecastService
+
+        def report(result: pd.DataFrame) -> None:
+            print(f"Arquivos: {len(result)} | {latest_run_summary(result)}", flush=True)
+
+        service = ForecastService(
+            CONTOUR_FILE, DATA_DIR, poll_interval=args.interval, on_result=report
+        )
+        try:
+            asyncio.run(service.run())
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # Previsões de várias rodadas e membros de um conjunto
+    if args.ensemble:
+        from utils.ensemble import ensemble_statistics, read_ensemble_cube
+
+        ensemble = read_ensemble_cube(DATA_DIR, cache=cache)
+        contour = read_contour_file(
+            CONTOUR_FILE, cache=cache, tolerance=args.simplify if args.mask else None
+        )
+
+        if args.mask:
+            from utils.basin_mask import basin_mask
+
+            daily = basin_mask(contour, ensemble.lat, ensemble.long).mean(
+                ensemble.values
+            )
+        else:
+            latitude, longitude, fields = ensemble.basin_fields(contour)
+            model = PrecipitationModel(executor=args.executor)
+            try:
+                daily = model.predict_fields(latitude, longitude, fields)
+            finally:
+                model.close()
+
+        statistics = ensemble_statistics(ensemble, daily)
+        label = (
+            "precipitação média acumulada na bacia"
+            if args.mask
+            else "precipitação acumulada"
+        )
+
+        # Acumulado até a última data prevista de cada rodada
+        for (run_date, target_date), row in (
+            statistics.groupby(level="rodada").tail(1).iterrows()
+        ):
+            print(
+                f"Rodada {pd.Timestamp(run_date):%d/%m/%y} até "
+                f"{pd.Timestamp(target_date):%d/%m/%y} ({int(row['membros'])} membro(s)): "
+                f"{label} {np.round(row['p50'], 2)} mm "
+                f"(p10 {np.round(row['p10'], 2)} mm, p90 {np.round(row['p90'], 2)} mm)"
+            )
+        return
+
+    # Processamento incremental: apenas arquivos novos ou alterados
+    if args.incremental:
+        from utils.incremental import IncrementalPipeline
+
+        pipeline = IncrementalPipeline(read_contour_file(CONTOUR_FILE, cache=cache))
+        processed = pipeline.update(DATA_DIR)
+        result = pipeline.result(DATA_DIR)
+
+        print(f"Arquivos processados: {processed} de {len(result)}")
+        print(latest_run_summary(result))
+        return
+
+    # Pool de renderização iniciado antes do cálculo: o matplotlib é importado em
+    # paralelo, em outro processo, e a figura nunca atrasa o resultado numérico
+    render_pool = None
+    if not args.no_plot:
+        from utils.render import start_render_pool, submit_figure
+
+        render_pool = start_render_pool()
 
-    # Datas de predição
-    dates = df["data_previsao"].sort_values().unique()
+    try:
+        if args.mask:
+            result = compute_mask(cache=cache, tolerance=args.simplify)
+        else:
+            result = compute(cache=cache, executor=args.executor)
 
-    # Resultado de predição para cada data
-    model = PrecipitationModel(data=df.copy())
-    result = [model.predict(date) for date in dates]
+        # Calculando o resultado acumulado: a máscara resulta na média da bacia, e não
+        # no máximo da integral sobre a malha, e por isso é identificada à parte
+        cumulative_result = np.cumsum(result)
+        label = (
+            "Precipitação média acumulada na bacia"
+            if args.mask
+            else "Precipitação acumulada"
+        )
 
-    # Calculando o resultado acumulado
-    cumulative_result = np.cumsum(result)
+        print(
+            f"{label}: {np.round(np.max(cumulative_result), 2)} mm",
+            flush=True,
+        )
 
-    print(f"Precipitação acumulada: {np.round(np.max(cumulative_result), 2)} mm")
+        if render_pool is None:
+            return
 
-    # Figura do resultado - /images/result.png
-    result_figure(result)
-    result_dir = os.path.join(os.path.join(DATA_DIR, "images"), "result.png")
-    print(f"Resultado gráfico: {result_dir}")
+        # Figura do resultado - /images/result.png. A figura é gerada no processo de
+        # renderização, então a etapa mede o envio e a espera pelo resultado
+        with stage("result_figure"):
+            figure = submit_figure(render_pool, "result_figure", result).result()
+        print(f"Resultado gráfico: {figure}")
+    finally:
+        if render_pool is not None:
+            render_pool.shutdown()
 
 
 if __name__ == "__main__":
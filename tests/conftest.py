@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+
+# Os módulos são importados como ``utils.<módulo>``, a partir da raiz do projeto
+sys.path.insert(0, BASE_DIR)
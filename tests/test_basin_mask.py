@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.basin_mask import SUPERSAMPLE, BasinMask, points_in_polygon
+from utils.data_reader import read_contour_file, read_forecast_cube
+from utils.spatial import GRID_SPACING, contour_part_offsets
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+DATA_DIR: str = os.path.join(BASE_DIR, "data")
+CONTOUR_FILE: str = os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln")
+
+
+def _brute_force_coverage(polygon, lat, long, cell_size, offsets=None) -> np.ndarray:
+    """Fração coberta de todas as células, com os pontos de amostragem em todas elas."""
+    samples = (np.arange(SUPERSAMPLE) + 0.5) / SUPERSAMPLE - 0.5
+    offset_lat, offset_long = np.meshgrid(
+        samples * cell_size[0], samples * cell_size[1], indexing="ij"
+    )
+    return points_in_polygon(
+        lat[:, None] + offset_lat.ravel(),
+        long[:, None] + offset_long.ravel(),
+        polygon,
+        offsets=offsets,
+    ).mean(axis=1)
+
+
+def _dense_coverage(mask: BasinMask, n_points: int) -> np.ndarray:
+    coverage = np.zeros(n_points)
+    coverage[mask.cells] = mask.weights
+    return coverage
+
+
+def test_thin_strip_matches_brute_force():
+    # Faixa de 0,1 x 2 graus que atravessa as células sem tocar nenhum de seus cantos
+    lat, long = (
+        axis.ravel()
+        for axis in np.meshgrid(np.arange(-2.0, 2.01, 0.4), np.arange(-2.0, 2.01, 0.4))
+    )
+    strip = np.array(
+        [[0.05, -1.0], [0.15, -1.0], [0.15, 1.0], [0.05, 1.0], [0.05, -1.0]]
+    )
+    cell_size = (0.4, 0.4)
+
+    mask = BasinMask(strip, lat, long, cell_size=cell_size)
+
+    expected = _brute_force_coverage(strip, lat, long, cell_size)
+    np.testing.assert_array_equal(_dense_coverage(mask, len(lat)), expected)
+    assert mask.area == pytest.approx(0.2, rel=0.15)
+
+
+def test_real_contour_matches_brute_force():
+    contour = read_contour_file(CONTOUR_FILE)
+    cube = read_forecast_cube(DATA_DIR, executor="serial")
+    polygon = contour[["lat", "long"]].to_numpy()
+    offsets = contour_part_offsets(contour)
+    cell_size = (GRID_SPACING, GRID_SPACING)
+
+    mask = BasinMask(polygon, cube.lat, cube.long, offsets=offsets)
+
+    expected = _brute_force_coverage(
+        polygon, cube.lat, cube.long, cell_size, offsets=offsets
+    )
+    np.testing.assert_array_equal(_dense_coverage(mask, len(cube.lat)), expected)
@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.cache import ArrayCache
+from utils.data_reader import read_forecast_cube
+
+
+@pytest.fixture
+def source_path(tmp_path) -> str:
+    path = tmp_path / "origem.dat"
+    path.write_text("-44.60 -22.20   1.0\r\n")
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path) -> ArrayCache:
+    return ArrayCache(cache_dir=str(tmp_path / "cache"))
+
+
+def test_store_and_load(cache, source_path):
+    cache.store("teste", [source_path], {"values": np.arange(5.0)})
+
+    arrays = cache.load("teste", [source_path])
+    np.testing.assert_array_equal(arrays["values"], np.arange(5.0))
+
+
+def test_store_overwrites_corrupted_entry(cache, source_path):
+    cache.store("teste", [source_path], {"values": np.arange(5.0)})
+
+    # Corrompe o arquivo .npy da entrada
+    entry_dir = os.path.join(cache.cache_dir, cache.key("teste", [source_path]))
+    with open(os.path.join(entry_dir, "values.npy"), "wb") as f:
+        f.write(b"corrompido")
+    assert cache.load("teste", [source_path]) is None
+
+    arrays = cache.get_or_compute(
+        "teste", [source_path], lambda: {"values": np.arange(3.0)}
+    )
+    np.testing.assert_array_equal(arrays["values"], np.arange(3.0))
+
+    stored = cache.load("teste", [source_path])
+    np.testing.assert_array_equal(stored["values"], np.arange(3.0))
+    assert os.listdir(cache.cache_dir) == [os.path.basename(entry_dir)]
+
+
+def test_store_replaces_entry_with_other_arrays(cache, source_path):
+    cache.store("teste", [source_path], {"coordinates": np.zeros((2, 2))})
+    cache.store("teste", [source_path], {"offsets": np.array([0, 2])})
+
+    arrays = cache.load("teste", [source_path])
+    assert set(arrays) == {"offsets"}
+
+
+def test_load_rejects_entry_without_expected_arrays(cache, source_path):
+    cache.store("teste", [source_path], {"lat": np.zeros(2), "long": np.zeros(2)})
+
+    assert cache.load("teste", [source_path], keys=("lat", "long", "values")) is None
+    assert set(cache.load("teste", [source_path], keys=("lat", "long"))) == {
+        "lat",
+        "long",
+    }
+
+
+def test_incomplete_cube_entry_is_a_miss(cache, tmp_path):
+    folder = tmp_path / "dados"
+    folder.mkdir()
+    for name in ("ETA40_p011221a021221.dat", "ETA40_p011221a031221.dat"):
+        (folder / name).write_text("-44.60 -22.20   1.0\r\n-44.20 -22.20   2.0\r\n")
+    file_paths = sorted(str(path) for path in folder.iterdir())
+
+    # Entrada sem o array "values" (ex.: gravada por uma versão anterior)
+    cache.store("forecast_cube", file_paths, {"lat": np.zeros(2), "long": np.zeros(2)})
+
+    cube = read_forecast_cube(str(folder), executor="serial", cache=cache)
+    np.testing.assert_array_equal(cube.values, [[1.0, 2.0], [1.0, 2.0]])
+
+
+def test_store_removes_superseded_entries(cache, tmp_path, source_path):
+    other_path = tmp_path / "outro.dat"
+    other_path.write_text("-44.60 -22.20   2.0\r\n")
+
+    cache.store("teste", [source_path], {"values": np.arange(5.0)})
+    cache.store("outro", [source_path], {"values": np.arange(5.0)})
+    cache.store("teste", [source_path, str(other_path)], {"values": np.arange(6.0)})
+
+    assert cache.load("teste", [source_path]) is None
+    assert cache.load("outro", [source_path]) is not None
+    assert len(cache._entries()) == 2
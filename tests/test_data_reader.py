@@ -0,0 +1,118 @@
+import os
+import glob
+import shutil
+
+import numpy as np
+import pytest
+
+from utils.data_reader import (
+    FixedLayoutDatReader,
+    iter_dat_file,
+    memory_mapped_reader_dat_file,
+    read_bln_file,
+    read_contour_file,
+    read_dat_file,
+    read_dat_file_subset,
+)
+from utils.spatial import contour_bounding_box
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+DATA_DIR: str = os.path.join(BASE_DIR, "data")
+CONTOUR_FILE: str = os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln")
+DAT_FILES = sorted(glob.glob(os.path.join(DATA_DIR, "*.dat")))
+
+
+def test_read_bln_file_ignores_third_column(tmp_path):
+    path = tmp_path / "contorno.bln"
+    path.write_text(
+        "3,1\n-44.1,-22.1,0\n-44.2,-22.3,0\n-44.1,-22.4,5\n"
+        "2,0\n-45.0,-21.0,1.5\n-45.5,-21.5,1.5\n"
+    )
+
+    coordinates, offsets = read_bln_file(str(path))
+
+    np.testing.assert_array_equal(
+        coordinates,
+        [
+            [-44.1, -22.1],
+            [-44.2, -22.3],
+            [-44.1, -22.4],
+            [-45.0, -21.0],
+            [-45.5, -21.5],
+        ],
+    )
+    np.testing.assert_array_equal(offsets, [0, 3, 5])
+
+
+def test_memory_mapped_reader_matches_read_dat_file():
+    reader = FixedLayoutDatReader(DAT_FILES[0])
+    cells = reader.cells_for_contour(read_contour_file(CONTOUR_FILE))
+
+    cube = memory_mapped_reader_dat_file(DATA_DIR, cells, reader=reader)
+
+    assert cube.file_paths == DAT_FILES
+    for row, file_path in enumerate(DAT_FILES):
+        data = read_dat_file(file_path)
+        np.testing.assert_array_equal(cube.lat, data[cells, 0])
+        np.testing.assert_array_equal(cube.long, data[cells, 1])
+        np.testing.assert_array_equal(cube.values[row], data[cells, 2])
+
+
+def test_memory_mapped_reader_rejects_another_layout(tmp_path):
+    reader = FixedLayoutDatReader(DAT_FILES[0])
+
+    # Mesmo tamanho em bytes, mas com os registros deslocados em uma posição
+    with open(DAT_FILES[0], "rb") as f:
+        content = f.read()
+    shifted = tmp_path / os.path.basename(DAT_FILES[0])
+    shifted.write_bytes(
+        content[reader.record_length :] + content[: reader.record_length]
+    )
+
+    with pytest.raises(ValueError):
+        reader.read_values(str(shifted), [0, 1])
+
+    truncated = tmp_path / os.path.basename(DAT_FILES[1])
+    shutil.copy(DAT_FILES[1], truncated)
+    with open(truncated, "r+b") as f:
+        f.truncate(reader.nbytes - reader.record_length)
+
+    with pytest.raises(ValueError):
+        reader.read_values(str(truncated), [0])
+
+
+@pytest.mark.parametrize("fixed_layout", [True, False])
+def test_subset_readers_match_read_dat_file(tmp_path, fixed_layout):
+    file_path = DAT_FILES[0]
+    if not fixed_layout:
+        # Mesmos pontos em colunas de largura variável: leitura por ``read_dat_file``
+        file_path = str(tmp_path / "variavel.dat")
+        data = read_dat_file(DAT_FILES[0])
+        with open(file_path, "w") as f:
+            f.writelines(f"{y:g} {x:g} {v:g}\n" for y, x, v in data)
+
+    data = read_dat_file(file_path)
+    bbox = contour_bounding_box(read_contour_file(CONTOUR_FILE))
+    inside = (
+        (data[:, 0] >= bbox[0])
+        & (data[:, 0] <= bbox[1])
+        & (data[:, 1] >= bbox[2])
+        & (data[:, 1] <= bbox[3])
+    )
+    rows = np.flatnonzero(inside)[::3]
+
+    np.testing.assert_array_equal(read_dat_file_subset(file_path), data)
+    np.testing.assert_array_equal(
+        read_dat_file_subset(file_path, bbox=bbox), data[inside]
+    )
+    np.testing.assert_array_equal(
+        read_dat_file_subset(file_path, bbox=bbox, rows=rows), data[rows]
+    )
+    np.testing.assert_array_equal(
+        np.array(list(iter_dat_file(file_path, bbox=bbox))), data[inside]
+    )
+    np.testing.assert_array_equal(
+        np.array(list(iter_dat_file(file_path, rows=rows))), data[rows]
+    )
@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils.ensemble import ensemble_statistics, read_ensemble_cube
+
+# Grade sintética de três pontos, no layout de largura fixa dos arquivos ETA40
+LAT = np.array([-22.0, -22.0, -21.6])
+LONG = np.array([-44.4, -44.0, -44.0])
+
+
+def _write_member(folder, run: int, member: int, lead: int) -> None:
+    """Arquivo de previsão com o valor 100 * rodada + 10 * membro + antecedência + ponto."""
+    issue = date(2021, 12, 1) + timedelta(days=run)
+    target = issue + timedelta(days=lead)
+    name = f"ETA40_p{issue:%d%m%y}a{target:%d%m%y}_m{member:02d}.dat"
+
+    values = 100 * run + 10 * member + lead + np.arange(len(LAT))
+    lines = [f"{y:6.2f} {x:6.2f} {v:5.1f}\r\n" for y, x, v in zip(LAT, LONG, values)]
+    with open(folder / name, "w", newline="") as f:
+        f.write("".join(lines))
+
+
+def test_two_runs_two_members_round_trip(tmp_path):
+    # A segunda rodada não tem a previsão de dois dias
+    for run, lead in [(0, 1), (0, 2), (1, 1)]:
+        for member in (1, 2):
+            _write_member(tmp_path, run, member, lead)
+
+    ensemble = read_ensemble_cube(str(tmp_path), executor="serial")
+
+    assert ensemble.values.shape == (2, 2, 2, 3)
+    assert ensemble.members == ["m01", "m02"]
+    np.testing.assert_array_equal(ensemble.leads, [1, 2])
+    np.testing.assert_array_equal(
+        ensemble.runs, np.array(["2021-12-01", "2021-12-02"], dtype="datetime64[D]")
+    )
+    np.testing.assert_array_equal(ensemble.values[0, 1, 1], [22.0, 23.0, 24.0])
+    assert np.isnan(ensemble.values[1, :, 1]).all()
+
+    # Média dos pontos da bacia: 100 * rodada + 10 * membro + antecedência + 1
+    statistics = ensemble_statistics(ensemble, ensemble.values.mean(axis=-1))
+
+    expected = pd.DataFrame(
+        {
+            "media": [17.0, 35.0, 117.0],
+            "minimo": [12.0, 25.0, 112.0],
+            "maximo": [22.0, 45.0, 122.0],
+            "p50": [17.0, 35.0, 117.0],
+            "membros": [2, 2, 2],
+        },
+        index=pd.MultiIndex.from_arrays(
+            [
+                pd.to_datetime(["2021-12-01", "2021-12-01", "2021-12-02"]),
+                pd.to_datetime(["2021-12-02", "2021-12-03", "2021-12-03"]),
+            ],
+            names=["rodada", "data_previsao"],
+        ),
+    )
+    pd.testing.assert_frame_equal(
+        statistics[expected.columns], expected, check_index_type=False
+    )
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from utils.forecast_cube import ForecastCube
+
+
+@pytest.fixture
+def cube() -> ForecastCube:
+    return ForecastCube(
+        lat=np.array([-22.0, -22.0, -21.6, -21.6]),
+        long=np.array([-44.4, -44.0, -44.4, -44.0]),
+        values=np.arange(12, dtype=np.float64).reshape(3, 4),
+        file_paths=[
+            "data/ETA40_p011221a021221.dat",
+            "data/ETA40_p011221a031221.dat",
+            "data/ETA40_p011221a041221.dat",
+        ],
+    )
+
+
+def test_long_dataframe_round_trip(cube):
+    data = cube.to_long_dataframe()
+
+    assert list(data.columns) == ["lat", "long", "data_value", "file_path"]
+    assert len(data) == cube.n_dates * cube.n_points
+
+    same = ForecastCube.from_long_dataframe(data)
+
+    assert same.file_paths == cube.file_paths
+    np.testing.assert_array_equal(same.lat, cube.lat)
+    np.testing.assert_array_equal(same.long, cube.long)
+    np.testing.assert_array_equal(same.values, cube.values)
+
+    # Com as linhas em ordem inversa, arquivos e pontos são apenas reordenados
+    reversed_cube = ForecastCube.from_long_dataframe(data.iloc[::-1])
+
+    assert reversed_cube.file_paths == cube.file_paths[::-1]
+    np.testing.assert_array_equal(reversed_cube.lat, cube.lat[::-1])
+    np.testing.assert_array_equal(reversed_cube.long, cube.long[::-1])
+    np.testing.assert_array_equal(reversed_cube.values, cube.values[::-1, ::-1])
+
+
+def test_long_dataframe_with_missing_point_is_rejected(cube):
+    data = cube.to_long_dataframe().drop(index=5)
+
+    with pytest.raises(ValueError):
+        ForecastCube.from_long_dataframe(data)
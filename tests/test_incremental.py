@@ -0,0 +1,50 @@
+import os
+import glob
+import shutil
+
+import numpy as np
+import pytest
+
+from utils.data_reader import read_contour_file
+from utils.incremental import IncrementalPipeline
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+DATA_DIR: str = os.path.join(BASE_DIR, "data")
+CONTOUR_FILE: str = os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln")
+
+
+@pytest.fixture
+def folder(tmp_path) -> str:
+    """Pasta com as previsões da rodada 01/12/21."""
+    folder = tmp_path / "dados"
+    folder.mkdir()
+    for file_path in glob.glob(os.path.join(DATA_DIR, "*.dat")):
+        shutil.copy(file_path, folder)
+    return str(folder)
+
+
+def test_accumulation_does_not_mix_runs(folder, tmp_path):
+    pipeline = IncrementalPipeline(
+        read_contour_file(CONTOUR_FILE), state_path=str(tmp_path / "estado.json")
+    )
+    pipeline.update(folder)
+    first_run = pipeline.result(folder)["precipitacao_acumulada"].iloc[-1]
+
+    # Nova rodada, emitida em 02/12/21, com uma única data prevista
+    shutil.copy(
+        os.path.join(folder, "ETA40_p011221a031221.dat"),
+        os.path.join(folder, "ETA40_p021221a031221.dat"),
+    )
+    assert pipeline.update(folder) == 1
+    result = pipeline.result(folder)
+
+    runs = result.groupby("data_emissao")
+    assert runs.ngroups == 2
+    np.testing.assert_allclose(runs["precipitacao_acumulada"].last().iloc[0], first_run)
+
+    second_run = result[result["arquivo"] == "ETA40_p021221a031221.dat"]
+    np.testing.assert_allclose(
+        second_run["precipitacao_acumulada"], second_run["precipitacao"]
+    )
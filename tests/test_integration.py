@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from scipy.spatial import Delaunay
+
+from utils.integration import BasinIntegrator
+from utils.spatial import derive_polygon_order
+
+
+def _square(center: float, half: float) -> np.ndarray:
+    """Quadrado fechado (primeiro vértice repetido ao final) centrado em (center, center)."""
+    low, high = center - half, center + half
+    return np.array([[low, low], [high, low], [high, high], [low, high], [low, low]])
+
+
+@pytest.fixture
+def triangulation() -> Delaunay:
+    lat, long = np.meshgrid(np.linspace(0.0, 10.0, 11), np.linspace(0.0, 10.0, 11))
+    return Delaunay(np.column_stack([lat.ravel(), long.ravel()]))
+
+
+def test_disjoint_parts_are_summed(triangulation):
+    first, second = _square(2.5, 1.0), _square(7.5, 1.5)
+    polygon = np.vstack([first, second])
+    offsets = np.array([0, len(first), len(polygon)])
+
+    integrator = BasinIntegrator(triangulation, polygon, offsets)
+
+    assert integrator.area == pytest.approx(4.0 + 9.0)
+
+
+def test_nested_part_is_a_hole(triangulation):
+    outer, inner = _square(5.0, 3.0), _square(5.0, 1.0)
+    polygon = np.vstack([outer, inner])
+    offsets = np.array([0, len(outer), len(polygon)])
+
+    integrator = BasinIntegrator(triangulation, polygon, offsets)
+    values = np.ones((len(triangulation.points), 1))
+
+    assert integrator.area == pytest.approx(36.0 - 4.0)
+    assert integrator.total(values)[0] == pytest.approx(32.0)
+
+
+def test_polygon_order_does_not_join_parts():
+    first, second = _square(2.5, 1.0)[:-1], _square(7.5, 1.5)[:-1]
+    points = np.vstack([first, second])
+    parts = np.repeat([0, 1], len(first))
+
+    order = derive_polygon_order(points[:, 0], points[:, 1], parts)
+
+    assert order == derive_polygon_order(
+        first[:, 0], first[:, 1]
+    ) + derive_polygon_order(second[:, 0], second[:, 1])
+
+
+def test_linear_field_mean_is_the_value_at_the_centroid(triangulation):
+    outer, inner = _square(5.0, 3.0), _square(4.0, 1.0)
+    polygon = np.vstack([outer, inner])
+    offsets = np.array([0, len(outer), len(polygon)])
+
+    integrator = BasinIntegrator(triangulation, polygon, offsets)
+    lat, long = triangulation.points.T
+    values = 2.0 * lat - 3.0 * long + 1.0
+
+    # Centroide do quadrado [2, 8]² sem o buraco [3, 5]²: (36 * 5 - 4 * 4) / 32
+    centroid = (36.0 * 5.0 - 4.0 * 4.0) / 32.0
+    assert integrator.mean(values) == pytest.approx(
+        2.0 * centroid - 3.0 * centroid + 1.0
+    )
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.model import PrecipitationModel
+
+
+@pytest.fixture
+def model() -> PrecipitationModel:
+    """Modelo com duas datas sobre os mesmos pontos (grade 3 x 3), em malha pequena."""
+    rng = np.random.default_rng(0)
+    lat, long = (
+        axis.ravel()
+        for axis in np.meshgrid([-45.0, -44.6, -44.2], [-22.6, -22.2, -21.8])
+    )
+    dates = pd.to_datetime(["2021-12-02", "2021-12-03"])
+
+    data = pd.DataFrame(
+        {
+            "lat_aproximacao": np.tile(lat, len(dates)),
+            "long_aproximacao": np.tile(long, len(dates)),
+            "data_value": rng.uniform(0.0, 20.0, size=len(dates) * len(lat)),
+            "data_previsao": np.repeat(dates, len(lat)),
+        }
+    )
+    return PrecipitationModel(data, resolution=50)
+
+
+@pytest.mark.parametrize("date", ["02/12/21", "2021-12-02"])
+def test_predict_accepts_string_dates(model, date):
+    expected = model.predict(pd.Timestamp("2021-12-02"))
+
+    assert model.predict(date) == expected
+    assert model.predict_many([date])[0] == expected
+
+
+def test_predict_unknown_date_raises_key_error(model):
+    with pytest.raises(KeyError):
+        model.predict("05/12/21")
+
+    with pytest.raises(KeyError):
+        model.predict("não é uma data")
+
+
+@pytest.mark.parametrize("executor", ["threads", "processes"])
+def test_parallel_matches_serial(model, executor):
+    dates = ["02/12/21", "03/12/21"]
+    parallel = PrecipitationModel(
+        model.df, resolution=50, executor=executor, max_workers=2, tile_rows=20
+    )
+    try:
+        # Duas chamadas reaproveitam o mesmo pool e os mesmos pesos compartilhados
+        first = parallel.predict_many(dates)
+        second = parallel.predict_many(dates)
+    finally:
+        parallel.close()
+
+    np.testing.assert_allclose(first, model.predict_many(dates))
+    np.testing.assert_array_equal(first, second)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from utils.profiler import StageProfiler
+
+# Tamanho do buffer alocado nas etapas (50 MB)
+BUFFER_BYTES = 50 * 2**20
+
+
+@pytest.fixture
+def profiler() -> StageProfiler:
+    profiler = StageProfiler()
+    profiler.start(trace_memory=True)
+    yield profiler
+    profiler.stop()
+
+
+def test_outer_peak_before_nested_stage_is_kept(profiler):
+    with profiler.stage("outer"):
+        buffer = np.ones(BUFFER_BYTES, dtype=np.uint8)
+        del buffer
+
+        with profiler.stage("inner"):
+            pass
+
+    assert profiler.stats["outer"].peak_memory >= BUFFER_BYTES
+    assert profiler.stats["inner"].peak_memory < BUFFER_BYTES
+
+
+def test_outer_peak_includes_nested_stage(profiler):
+    with profiler.stage("outer"):
+        with profiler.stage("inner"):
+            buffer = np.ones(BUFFER_BYTES, dtype=np.uint8)
+            del buffer
+
+    assert profiler.stats["inner"].peak_memory >= BUFFER_BYTES
+    assert profiler.stats["outer"].peak_memory >= BUFFER_BYTES
+
+
+def test_memory_profile_is_rejected_with_threads():
+    from main import parse_args
+
+    with pytest.raises(SystemExit):
+        parse_args(
+            ["--profile", "profile.json", "--profile-memory", "--executor", "threads"]
+        )
+
+    assert parse_args(["--profile-memory", "--executor", "processes"]).profile_memory
@@ -0,0 +1,44 @@
+import os
+import glob
+import shutil
+import asyncio
+
+import numpy as np
+
+from utils.service import ForecastService
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+DATA_DIR: str = os.path.join(BASE_DIR, "data")
+CONTOUR_FILE: str = os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln")
+
+
+def test_scan_once_without_run(tmp_path):
+    folder = tmp_path / "dados"
+    folder.mkdir()
+    for file_path in glob.glob(os.path.join(DATA_DIR, "*.dat")):
+        shutil.copy(file_path, folder)
+
+    results = []
+    service = ForecastService(
+        CONTOUR_FILE,
+        str(folder),
+        max_workers=2,
+        state_path=str(tmp_path / "estado.json"),
+        on_result=results.append,
+    )
+
+    async def scan_twice():
+        # Os arquivos só são processados quando não mudam entre duas varreduras
+        return [await service.scan_once(), await service.scan_once()]
+
+    try:
+        processed = asyncio.run(scan_twice())
+    finally:
+        service.close()
+
+    assert processed == [0, 10]
+    np.testing.assert_allclose(
+        results[-1]["precipitacao_acumulada"].iloc[-1], 112.9, atol=0.01
+    )
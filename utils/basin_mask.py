@@ -0,0 +1,422 @@
+import itertools
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from utils.profiler import profiled
+from utils.spatial import GRID_SPACING, _check_contour_columns, contour_part_offsets
+
+# Pontos de amostragem, por eixo, dentro de cada célula (fração de cobertura com
+# resolução de 1 / SUPERSAMPLE² da área da célula)
+SUPERSAMPLE = 8
+
+# Número máximo de pares (linha de varredura, aresta) avaliados por vez no teste de pertinência
+POINT_IN_POLYGON_CHUNK = 2_000_000
+
+# Número de máscaras (contorno e grade) mantidas em memória
+MASK_CACHE_SIZE = 16
+
+
+def _polygon_edges(
+    polygon: np.ndarray, offsets: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vértices (n, 2) em float64, sem o vértice de fechamento repetido de cada parte, e o
+    índice do vértice seguinte de cada vértice (arestas fechadas dentro de cada parte).
+    """
+    polygon = np.asarray(polygon, dtype=np.float64)
+    if offsets is None:
+        offsets = np.array([0, len(polygon)])
+    offsets = np.asarray(offsets, dtype=np.intp)
+
+    # Remove o último vértice das partes em que ele repete o primeiro
+    starts, ends = offsets[:-1], offsets[1:]
+    closed = ends - starts > 1
+    closed[closed] = np.all(
+        polygon[starts[closed]] == polygon[ends[closed] - 1], axis=1
+    )
+    keep = np.ones(len(polygon), dtype=bool)
+    keep[ends[closed] - 1] = False
+    polygon = polygon[keep]
+    offsets = np.concatenate([[0], np.cumsum(keep)])[offsets]
+
+    # O vértice seguinte ao último de cada parte é o primeiro da mesma parte
+    following = np.arange(1, len(polygon) + 1)
+    starts, ends = offsets[:-1], offsets[1:]
+    filled = ends > starts
+    following[ends[filled] - 1] = starts[filled]
+    return polygon, following
+
+
+def points_in_polygon(
+    lat: np.ndarray,
+    long: np.ndarray,
+    polygon: np.ndarray,
+    chunk_size: int = POINT_IN_POLYGON_CHUNK,
+    offsets: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Teste vetorizado de pertinência de pontos a um polígono (regra par-ímpar).
+
+    Os pontos são agrupados por longitude (linhas de varredura). Para cada linha, as
+    latitudes em que as arestas do polígono a cruzam são calculadas de uma só vez e
+    ordenadas; um ponto é interno se o número de cruzamentos acima de sua latitude for
+    ímpar. Em grades e amostragens regulares, muitos pontos compartilham a mesma linha e
+    o custo passa a ser proporcional a linhas × arestas, e não a pontos × arestas.
+
+    Com várias partes, as arestas de todas elas são contadas juntas: partes disjuntas
+    formam a união e partes contidas em outras formam buracos.
+
+    Args:
+        lat (np.ndarray): Latitudes dos pontos.
+        long (np.ndarray): Longitudes dos pontos.
+        polygon (np.ndarray): Array (n, 2) com os vértices (lat, long) do polígono.
+        chunk_size (int): Número máximo de pares (linha, aresta) avaliados por bloco.
+        offsets (Optional[np.ndarray]): Início de cada parte em ``polygon``, seguido do
+            número de vértices (ver ``read_bln_file``). Se None, há uma única parte.
+
+    Returns:
+        np.ndarray: Array booleano, com o formato de ``lat``, indicando os pontos internos.
+    """
+    shape = np.shape(lat)
+    lat = np.asarray(lat, dtype=np.float64).ravel()
+    long = np.asarray(long, dtype=np.float64).ravel()
+
+    polygon, following = _polygon_edges(polygon, offsets)
+    lat_1, long_1 = polygon[:, 0], polygon[:, 1]
+    lat_2, long_2 = lat_1[following], long_1[following]
+
+    # Linhas de varredura e pontos de cada linha, contíguos em 'order'
+    rows, row_index = np.unique(long, return_inverse=True)
+    order = np.argsort(row_index, kind="stable")
+    sorted_rows = row_index[order]
+
+    inside = np.zeros(len(lat), dtype=bool)
+    rows_per_chunk = max(1, chunk_size // max(1, len(polygon)))
+
+    for first in range(0, len(rows), rows_per_chunk):
+        last = min(first + rows_per_chunk, len(rows))
+        points = order[slice(*np.searchsorted(sorted_rows, [first, last]))]
+        row_long = rows[first:last, None]
+
+        # Latitude de cruzamento de cada aresta com cada linha (-inf se não cruzar)
+        crosses = (long_1 > row_long) != (long_2 > row_long)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing = lat_1 + (row_long - long_1) * (lat_2 - lat_1) / (long_2 - long_1)
+        crossing = np.where(crosses, crossing, -np.inf)
+
+        # Com vários pontos por linha, os cruzamentos são ordenados uma vez por linha e
+        # as colunas que são -inf em todas as linhas são descartadas
+        if len(points) > last - first:
+            crossing.sort(axis=1)
+            crossing = crossing[:, len(polygon) - crosses.sum(axis=1).max(initial=0) :]
+
+        above = crossing[row_index[points] - first] > lat[points, None]
+        inside[points] = np.count_nonzero(above, axis=1) % 2 == 1
+
+    return inside.reshape(shape)
+
+
+def _cells_crossed_by_edges(
+    polygon: np.ndarray,
+    offsets: Optional[np.ndarray],
+    lat: np.ndarray,
+    long: np.ndarray,
+    cell_size: Tuple[float, float],
+) -> np.ndarray:
+    """
+    Indica as células (centradas em ``lat``, ``long``) que alguma aresta do polígono toca.
+
+    As coordenadas são escaladas para que as células sejam quadrados unitários e as
+    arestas são divididas em trechos de no máximo uma célula, de modo que cada trecho só
+    pode tocar as células a uma distância de Chebyshev de até 1 do seu ponto médio. Os
+    pares (trecho, célula) candidatos são então confirmados pelo teste exato de interseção
+    entre segmento e retângulo (sobreposição dos retângulos envolventes e cantos da célula
+    de lados diferentes da reta do trecho).
+
+    Returns:
+        np.ndarray: Array booleano com uma posição por célula.
+    """
+    scale = np.array(cell_size, dtype=np.float64)
+    centers = np.column_stack([lat, long]) / scale
+    crossed = np.zeros(len(centers), dtype=bool)
+
+    vertices, following = _polygon_edges(polygon, offsets)
+    vertices = vertices / scale
+    start, end = vertices, vertices[following]
+    if len(start) == 0 or len(centers) == 0:
+        return crossed
+
+    # Trechos de no máximo uma célula em cada eixo
+    pieces = np.maximum(1, np.ceil(np.abs(end - start).max(axis=1))).astype(np.intp)
+    edge = np.repeat(np.arange(len(start)), pieces)
+    step = np.arange(len(edge)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    direction = (end - start)[edge] / pieces[edge, None]
+    piece_start = start[edge] + direction * step[:, None]
+    piece_end = piece_start + direction
+
+    # Pares candidatos (trecho, célula) pela distância de Chebyshev ao ponto médio
+    tree = cKDTree(centers)
+    hits = tree.query_ball_point((piece_start + piece_end) / 2, r=1.0, p=np.inf)
+    counts = np.fromiter(map(len, hits), dtype=np.intp, count=len(hits))
+    piece = np.repeat(np.arange(len(hits)), counts)
+    cell = np.fromiter(
+        itertools.chain.from_iterable(hits), dtype=np.intp, count=counts.sum()
+    )
+
+    # Sobreposição dos retângulos envolventes do trecho e da célula
+    low = np.minimum(piece_start[piece], piece_end[piece])
+    high = np.maximum(piece_start[piece], piece_end[piece])
+    overlap = np.all(
+        (low <= centers[cell] + 0.5) & (high >= centers[cell] - 0.5), axis=1
+    )
+
+    # Cantos da célula estritamente do mesmo lado da reta do trecho: não há interseção
+    corners = np.array([[-0.5, -0.5], [-0.5, 0.5], [0.5, -0.5], [0.5, 0.5]])
+    relative = centers[cell, None, :] + corners - piece_start[piece, None, :]
+    side = (
+        direction[piece, None, 0] * relative[..., 1]
+        - direction[piece, None, 1] * relative[..., 0]
+    )
+    separated = np.all(side > 0, axis=1) | np.all(side < 0, axis=1)
+
+    crossed[cell[overlap & ~separated]] = True
+    return crossed
+
+
+class BasinMask(object):
+    """
+    Máscara de uma bacia sobre uma grade de pontos, com a fração de cada célula coberta
+    pelo polígono do contorno.
+
+    Cada ponto da grade é o centro de uma célula retangular de tamanho ``cell_size``.
+    Apenas as células que intersectam o retângulo envolvente do polígono são avaliadas:
+    as inteiramente internas ou externas são identificadas pelos seus cantos e pelas
+    arestas do contorno que as atravessam, e a fração de cobertura das células da borda é
+    estimada por ``supersample²`` pontos de amostragem, testados com ``points_in_polygon``. Apenas as células com cobertura
+    positiva são guardadas, de modo que a precipitação média da bacia em cada data é um
+    produto escalar sobre poucas colunas do array de valores.
+
+    A máscara depende apenas do contorno e da grade: use ``basin_mask`` para obtê-la do
+    cache em memória em vez de recalculá-la.
+
+    Args:
+        polygon (np.ndarray): Array (n, 2) com os vértices (lat, long) do contorno.
+        lat (np.ndarray): Latitudes dos pontos (centros das células) da grade.
+        long (np.ndarray): Longitudes dos pontos da grade.
+        cell_size (Tuple[float, float]): Dimensões (lat, long) das células, em graus.
+        supersample (int): Pontos de amostragem por eixo dentro de cada célula.
+        offsets (Optional[np.ndarray]): Início de cada parte do contorno em ``polygon``,
+            seguido do número de vértices. Se None, o contorno tem uma única parte.
+
+    Attributes:
+        cells (np.ndarray): Índices, na grade, das células cobertas (ao menos parcialmente).
+        weights (np.ndarray): Fração coberta de cada célula de ``cells``, em (0, 1].
+        cell_area (float): Área de uma célula, em graus².
+        area (float): Área da bacia estimada pela máscara, em graus².
+    """
+
+    def __init__(
+        self,
+        polygon: np.ndarray,
+        lat: np.ndarray,
+        long: np.ndarray,
+        cell_size: Tuple[float, float] = (GRID_SPACING, GRID_SPACING),
+        supersample: int = SUPERSAMPLE,
+        offsets: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Rasteriza o polígono sobre as células da grade.
+        """
+        if supersample < 1:
+            raise ValueError("O número de pontos de amostragem deve ser positivo")
+
+        polygon = np.asarray(polygon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64).ravel()
+        long = np.asarray(long, dtype=np.float64).ravel()
+        half_lat, half_long = cell_size[0] / 2, cell_size[1] / 2
+
+        # Células candidatas: as que intersectam o retângulo envolvente do polígono
+        lat_min, long_min = polygon.min(axis=0)
+        lat_max, long_max = polygon.max(axis=0)
+        candidates = np.flatnonzero(
+            (lat + half_lat >= lat_min)
+            & (lat - half_lat <= lat_max)
+            & (long + half_long >= long_min)
+            & (long - half_long <= long_max)
+        )
+
+        # Células com os quatro cantos dentro do contorno e não atravessadas por nenhuma
+        # aresta estão inteiramente dentro; as atravessadas por arestas formam a borda.
+        # Os cantos sozinhos não bastam: uma parte estreita ou uma aresta que corte a
+        # célula pode deixar os quatro cantos do mesmo lado
+        corner_lat = np.array([-1, -1, 1, 1]) * half_lat
+        corner_long = np.array([-1, 1, -1, 1]) * half_long
+        corners = points_in_polygon(
+            lat[candidates, None] + corner_lat,
+            long[candidates, None] + corner_long,
+            polygon,
+            offsets=offsets,
+        )
+        boundary = _cells_crossed_by_edges(
+            polygon, offsets, lat[candidates], long[candidates], cell_size
+        )
+        coverage = (corners.all(axis=1) & ~boundary).astype(np.float64)
+
+        # Fração de cobertura das células da borda: pontos de amostragem
+        # (n_borda, supersample²) centrados em cada célula
+        samples = (np.arange(supersample) + 0.5) / supersample - 0.5
+        offset_lat, offset_long = np.meshgrid(
+            samples * cell_size[0], samples * cell_size[1], indexing="ij"
+        )
+        edge_cells = candidates[boundary]
+        coverage[boundary] = points_in_polygon(
+            lat[edge_cells, None] + offset_lat.ravel(),
+            long[edge_cells, None] + offset_long.ravel(),
+            polygon,
+            offsets=offsets,
+        ).mean(axis=1)
+
+        covered = coverage > 0
+        self.cells = candidates[covered]
+        self.weights = coverage[covered]
+        self.cell_area = float(cell_size[0] * cell_size[1])
+        self.area = float(self.weights.sum() * self.cell_area)
+
+        for array in (self.cells, self.weights):
+            array.flags.writeable = False
+
+    def total(self, values: np.ndarray) -> np.ndarray:
+        """
+        Integral da precipitação sobre a bacia (mm × graus²).
+
+        Args:
+            values (np.ndarray): Array (..., n_points) com os valores nos pontos da grade
+                (ex.: ``ForecastCube.values`` ou ``EnsembleCube.values``).
+
+        Returns:
+            np.ndarray: A integral de cada campo, com o formato ``values.shape[:-1]``.
+        """
+        return np.take(values, self.cells, axis=-1) @ self.weights * self.cell_area
+
+    def mean(self, values: np.ndarray) -> np.ndarray:
+        """
+        Média da precipitação sobre a bacia, ponderada pela fração coberta de cada célula (mm).
+
+        Args:
+            values (np.ndarray): Array (..., n_points) com os valores nos pontos da grade.
+
+        Returns:
+            np.ndarray: A média de cada campo (NaN se a bacia não cobrir nenhuma célula).
+        """
+        if self.area <= 0:
+            return np.full(np.shape(values)[:-1], np.nan)
+        return np.take(values, self.cells, axis=-1) @ (
+            self.weights / self.weights.sum()
+        )
+
+
+@lru_cache(maxsize=MASK_CACHE_SIZE)
+@profiled("basin_mask", rows=lambda mask: len(mask.cells))
+def _basin_mask(
+    polygon_key: bytes,
+    offsets_key: bytes,
+    lat_key: bytes,
+    long_key: bytes,
+    cell_size: Tuple[float, float],
+    supersample: int,
+) -> BasinMask:
+    """
+    Máscara em cache de um contorno sobre uma grade.
+
+    Args:
+        polygon_key (bytes): Os vértices (lat, long), em float64, serializados com ``tobytes``.
+        offsets_key (bytes): O início de cada parte do contorno, em int64, serializado com
+            ``tobytes``.
+        lat_key (bytes): As latitudes da grade, em float64, serializadas com ``tobytes``.
+        long_key (bytes): As longitudes da grade, em float64, serializadas com ``tobytes``.
+        cell_size (Tuple[float, float]): Dimensões (lat, long) das células.
+        supersample (int): Pontos de amostragem por eixo dentro de cada célula.
+
+    Returns:
+        BasinMask: A máscara (compartilhada entre chamadas; seus arrays são somente leitura).
+    """
+    return BasinMask(
+        np.frombuffer(polygon_key, dtype=np.float64).reshape(-1, 2),
+        np.frombuffer(lat_key, dtype=np.float64),
+        np.frombuffer(long_key, dtype=np.float64),
+        cell_size=cell_size,
+        supersample=supersample,
+        offsets=np.frombuffer(offsets_key, dtype=np.int64),
+    )
+
+
+def basin_mask(
+    contour: pd.DataFrame,
+    lat: np.ndarray,
+    long: np.ndarray,
+    cell_size: Tuple[float, float] = (GRID_SPACING, GRID_SPACING),
+    supersample: int = SUPERSAMPLE,
+) -> BasinMask:
+    """
+    Máscara de um contorno sobre uma grade de pontos, calculada uma única vez por
+    contorno e grade (cache LRU em memória).
+
+    Example:
+        cube = read_forecast_cube(DATA_DIR)
+        mask = basin_mask(contour, cube.lat, cube.long)
+        daily = mask.mean(cube.values)
+
+    Args:
+        contour (pd.DataFrame): Contorno da bacia (colunas "lat" e "long" e, se houver
+            várias partes, "parte", como em ``read_contour_file``).
+        lat (np.ndarray): Latitudes dos pontos da grade (ex.: ``ForecastCube.lat``).
+        long (np.ndarray): Longitudes dos pontos da grade.
+        cell_size (Tuple[float, float]): Dimensões (lat, long) das células, em graus.
+        supersample (int): Pontos de amostragem por eixo dentro de cada célula.
+
+    Returns:
+        BasinMask: A máscara da bacia.
+    """
+    _check_contour_columns(contour)
+
+    return _basin_mask(
+        contour.loc[:, ["lat", "long"]].to_numpy(dtype=np.float64).tobytes(),
+        contour_part_offsets(contour).tobytes(),
+        np.ascontiguousarray(lat, dtype=np.float64).tobytes(),
+        np.ascontiguousarray(long, dtype=np.float64).tobytes(),
+        (float(cell_size[0]), float(cell_size[1])),
+        int(supersample),
+    )
+
+
+def interpolation_grid_mask(
+    contour: pd.DataFrame,
+    latitude_linspace: np.ndarray,
+    longitude_linspace: np.ndarray,
+    supersample: int = SUPERSAMPLE,
+) -> BasinMask:
+    """
+    Máscara de um contorno sobre a malha de interpolação de ``PrecipitationModel``.
+
+    Os pontos seguem a ordem de ``np.meshgrid(latitude_linspace, longitude_linspace)``,
+    ou seja, a máscara se aplica a ``PredictionResult.precipitation_grid.reshape(..., -1)``.
+
+    Args:
+        contour (pd.DataFrame): Contorno da bacia (colunas "lat" e "long").
+        latitude_linspace (np.ndarray): As latitudes (regularmente espaçadas) da malha.
+        longitude_linspace (np.ndarray): As longitudes (regularmente espaçadas) da malha.
+        supersample (int): Pontos de amostragem por eixo dentro de cada célula.
+
+    Returns:
+        BasinMask: A máscara da bacia sobre a malha.
+    """
+    grid_x, grid_y = np.meshgrid(latitude_linspace, longitude_linspace)
+    cell_size = (
+        float(latitude_linspace[1] - latitude_linspace[0]),
+        float(longitude_linspace[1] - longitude_linspace[0]),
+    )
+    return basin_mask(contour, grid_x.ravel(), grid_y.ravel(), cell_size, supersample)
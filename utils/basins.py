@@ -0,0 +1,108 @@
+import os
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import ArrayCache
+from utils.data_reader import list_dat_files, read_contour_file, read_forecast_cube
+from utils.forecast_cube import ForecastCube
+from utils.model import PrecipitationModel
+from utils.preprocess import apply_contour, transform_data
+from utils.spatial import ContourGridIndex
+
+# Número mínimo de pontos da grade para a interpolação de uma bacia
+MIN_BASIN_POINTS = 3
+
+
+def read_contour_dir(
+    contour_dir: str,
+    pattern: str = "*.bln",
+    cache: Optional[ArrayCache] = None,
+    tolerance: Optional[float] = None,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Lê todos os arquivos de contorno de uma pasta.
+
+    Args:
+        contour_dir (str): Caminho da pasta contendo os arquivos .bln.
+        pattern (str): Padrão glob dos arquivos de contorno.
+        cache (Optional[ArrayCache]): Cache em disco das coordenadas já lidas.
+        tolerance (Optional[float]): Tolerância, em graus, da simplificação dos contornos
+            (ver ``read_contour_file``). Se None, os contornos são lidos sem simplificação.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Contornos indexados pelo nome da bacia (nome do arquivo sem extensão).
+    """
+    return {
+        os.path.splitext(os.path.basename(file_path))[0]: read_contour_file(
+            file_path, cache=cache, tolerance=tolerance
+        )
+        for file_path in list_dat_files(contour_dir, pattern)
+    }
+
+
+def process_basins(
+    contours: Union[str, Dict[str, pd.DataFrame]],
+    forecast: Union[str, ForecastCube],
+    cache: Optional[ArrayCache] = None,
+) -> pd.DataFrame:
+    """
+    Calcula a precipitação diária e acumulada de várias bacias em uma única passada.
+
+    A previsão é lida uma única vez e todas as bacias compartilham a mesma KD-tree da
+    grade; para cada bacia, a ordem poligonal é derivada do próprio contorno.
+
+    Args:
+        contours (Union[str, Dict[str, pd.DataFrame]]): Pasta com os arquivos .bln ou
+            contornos já lidos, indexados pelo nome da bacia.
+        forecast (Union[str, ForecastCube]): Pasta com os arquivos .dat ou cubo já lido.
+        cache (Optional[ArrayCache]): Cache em disco utilizado na leitura dos arquivos.
+
+    Returns:
+        pd.DataFrame: DataFrame com as colunas "bacia", "data_previsao", "precipitacao"
+        e "precipitacao_acumulada", uma linha por bacia e data de previsão.
+
+    Raises:
+        ValueError: Se alguma bacia estiver associada a menos de três pontos da grade.
+    """
+    if isinstance(contours, str):
+        contours = read_contour_dir(contours, cache=cache)
+
+    if isinstance(forecast, str):
+        forecast = read_forecast_cube(forecast, cache=cache)
+
+    indices = ContourGridIndex.from_cube_many(contours, forecast)
+
+    results: List[pd.DataFrame] = []
+    for name, index in indices.items():
+        polygon_order = index.polygon_order
+        if len(polygon_order) < MIN_BASIN_POINTS:
+            raise ValueError(
+                f"A bacia '{name}' está associada a {len(polygon_order)} ponto(s) da "
+                f"grade; são necessários ao menos {MIN_BASIN_POINTS} para a interpolação"
+            )
+
+        df = transform_data(
+            apply_contour(contours[name], forecast, index=index),
+            polygon_order=polygon_order,
+        )
+
+        # Datas de predição
+        dates = df["data_previsao"].sort_values().unique()
+
+        model = PrecipitationModel(data=df)
+        daily = model.predict_many(dates)
+
+        results.append(
+            pd.DataFrame(
+                {
+                    "bacia": name,
+                    "data_previsao": dates,
+                    "precipitacao": daily,
+                    "precipitacao_acumulada": np.cumsum(daily),
+                }
+            )
+        )
+
+    return pd.concat(results, ignore_index=True)
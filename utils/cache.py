@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+CACHE_DIR: str = os.path.join(BASE_DIR, ".cache")
+
+# Variável de ambiente que desativa o cache (opt-out), por exemplo BTG_NO_CACHE=1
+NO_CACHE_ENV: str = "BTG_NO_CACHE"
+
+# Limites padrão de eviction
+DEFAULT_MAX_BYTES: int = 2 * 1024**3
+DEFAULT_MAX_AGE: float = 30 * 24 * 60 * 60
+
+# Arquivo de cada entrada com o namespace e os arquivos de origem
+MANIFEST_FILE: str = "manifest.json"
+
+
+class ArrayCache(object):
+    """
+    Cache em disco de arrays NumPy derivados de arquivos de entrada (.dat, .bln).
+
+    Cada entrada é um diretório com um arquivo .npy por array, identificado pelo hash do
+    namespace e do caminho, mtime e tamanho de cada arquivo de origem. Uma alteração em
+    qualquer arquivo de origem gera uma nova chave. As leituras utilizam ``mmap_mode="r"``,
+    de modo que uma execução repetida mapeia os dados do disco sem tokenizar texto.
+
+    Ao armazenar uma entrada, as entradas do mesmo namespace que compartilham algum
+    arquivo de origem com ela (ex.: o cubo de uma pasta antes da chegada de um novo
+    arquivo) são removidas, e em seguida os limites de tamanho e idade são aplicados.
+
+    Args:
+        cache_dir (str): Diretório onde as entradas são armazenadas.
+        max_bytes (int): Tamanho máximo do cache; as entradas menos usadas são removidas antes.
+        max_age (float): Idade máxima, em segundos, desde o último acesso a uma entrada.
+        enabled (bool): Se False, o cache nunca lê nem escreve nada em disco.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Inicializa o cache com o diretório e os limites de eviction.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled
+
+    def key(self, namespace: str, source_paths: Iterable[str]) -> str:
+        """
+        Calcula a chave de uma entrada a partir dos arquivos de origem.
+
+        Args:
+            namespace (str): Identificador do tipo de dado armazenado (ex.: "forecast_cube").
+            source_paths (Iterable[str]): Arquivos dos quais os arrays foram derivados.
+
+        Returns:
+            str: A chave hexadecimal da entrada.
+        """
+        digest = hashlib.sha1(namespace.encode())
+        for source_path in source_paths:
+            stat = os.stat(source_path)
+            digest.update(
+                f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}".encode()
+            )
+        return digest.hexdigest()
+
+    def load(
+        self,
+        namespace: str,
+        source_paths: Iterable[str],
+        keys: Optional[Iterable[str]] = None,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Carrega uma entrada do cache como arrays mapeados em memória (somente leitura).
+
+        Args:
+            namespace (str): Identificador do tipo de dado armazenado.
+            source_paths (Iterable[str]): Arquivos dos quais os arrays foram derivados.
+            keys (Optional[Iterable[str]]): Nomes dos arrays esperados. Uma entrada com
+                outros arrays (incompleta ou de outro formato) é tratada como ausente.
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: Os arrays da entrada, ou None se não estiver em cache.
+        """
+        if not self.enabled:
+            return None
+
+        entry_dir = os.path.join(self.cache_dir, self.key(namespace, source_paths))
+        if not os.path.isdir(entry_dir):
+            return None
+
+        try:
+            arrays = {
+                filename[:-4]: np.load(os.path.join(entry_dir, filename), mmap_mode="r")
+                for filename in os.listdir(entry_dir)
+                if filename.endswith(".npy")
+            }
+            # Atualiza o instante de último acesso, utilizado pela eviction
+            os.utime(entry_dir)
+        except (OSError, ValueError):
+            return None
+
+        if keys is not None and set(arrays) != set(keys):
+            return None
+
+        return arrays
+
+    def store(
+        self,
+        namespace: str,
+        source_paths: Iterable[str],
+        arrays: Dict[str, np.ndarray],
+    ) -> None:
+        """
+        Armazena os arrays de uma entrada e aplica a eviction.
+
+        A escrita é feita em um diretório temporário renomeado ao final, para que
+        leitores concorrentes nunca vejam uma entrada incompleta.
+        """
+        if not self.enabled:
+            return
+
+        source_paths = [os.path.abspath(source_path) for source_path in source_paths]
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry_dir = os.path.join(self.cache_dir, self.key(namespace, source_paths))
+        tmp_dir = f"{entry_dir}.tmp-{os.getpid()}"
+
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+            json.dump({"namespace": namespace, "sources": source_paths}, f)
+
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            # Entrada já existente (corrompida, incompleta ou gravada por outro processo):
+            # é movida para o lado e substituída pela nova, calculada das mesmas origens
+            stale_dir = f"{entry_dir}.tmp-stale-{os.getpid()}"
+            try:
+                os.replace(entry_dir, stale_dir)
+                os.replace(tmp_dir, entry_dir)
+            except OSError:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            shutil.rmtree(stale_dir, ignore_errors=True)
+
+        self._remove_superseded(namespace, source_paths, entry_dir)
+        self.evict()
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        source_paths: List[str],
+        compute: Callable[[], Dict[str, np.ndarray]],
+        keys: Optional[Iterable[str]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Retorna a entrada em cache ou a calcula com ``compute`` e a armazena.
+
+        Args:
+            keys (Optional[Iterable[str]]): Nomes dos arrays esperados (ver ``load``).
+        """
+        arrays = self.load(namespace, source_paths, keys)
+        if arrays is None:
+            arrays = compute()
+            self.store(namespace, source_paths, arrays)
+        return arrays
+
+    def _entries(self) -> List[Tuple[str, float, int]]:
+        """Lista as entradas como (diretório, instante do último acesso, tamanho em bytes)."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, name)
+            if not os.path.isdir(entry_dir) or ".tmp-" in name:
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, filename))
+                for filename in os.listdir(entry_dir)
+            )
+            entries.append((entry_dir, os.path.getmtime(entry_dir), size))
+        return entries
+
+    def _remove_superseded(
+        self, namespace: str, source_paths: List[str], entry_dir: str
+    ) -> None:
+        """Remove as entradas de ``namespace`` com arquivos de origem em comum com ``entry_dir``."""
+        sources = set(source_paths)
+        for other_dir, _, _ in self._entries():
+            if other_dir == entry_dir:
+                continue
+            try:
+                with open(os.path.join(other_dir, MANIFEST_FILE)) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if manifest.get("namespace") == namespace and sources.intersection(
+                manifest.get("sources", [])
+            ):
+                shutil.rmtree(other_dir, ignore_errors=True)
+
+    def evict(self) -> None:
+        """
+        Remove as entradas mais antigas que ``max_age`` e, em seguida, as menos usadas
+        recentemente até que o cache ocupe no máximo ``max_bytes``.
+        """
+        now = time.time()
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+
+        total_bytes = sum(size for _, _, size in entries)
+        for entry_dir, last_access, size in entries:
+            if now - last_access <= self.max_age and total_bytes <= self.max_bytes:
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_bytes -= size
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+def default_cache(enabled: bool = True) -> ArrayCache:
+    """
+    Cria o cache padrão do projeto, desativado se a variável de ambiente BTG_NO_CACHE estiver definida.
+
+    Args:
+        enabled (bool): Permite desativar o cache explicitamente (ex.: flag --no-cache).
+
+    Returns:
+        ArrayCache: O cache configurado.
+    """
+    return ArrayCache(enabled=enabled and not os.environ.get(NO_CACHE_ENV))
@@ -1,79 +1,688 @@
 import os
 import re
+import glob
+import mmap
+import hashlib
 import multiprocessing
-from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from utils.cache import ArrayCache
+from utils.forecast_cube import ForecastCube
+from utils.profiler import profiled
+from utils.spatial import ContourGridIndex, simplify_polygon
 
-def read_contour_file(file_path: str) -> pd.DataFrame:
+# Colunas dos arquivos de previsão .dat
+DAT_COLUMNS = ["lat", "long", "data_value"]
+
+# Colunas das linhas dos arquivos de contorno .bln: "lat,long" ou, no cabeçalho, "n,flag"
+BLN_COLUMNS = ["x", "y"]
+
+# Retângulo envolvente (lat_min, lat_max, long_min, long_max), ver ``contour_bounding_box``
+BoundingBox = Tuple[float, float, float, float]
+
+# Layout de um registro de largura fixa: "-75.00 -35.00   0.0\r\n"
+FIXED_RECORD_PATTERN = re.compile(rb"^(\s*\S+)(\s+\S+)(\s+\S+)(\r?\n)$")
+
+# Modos de execução suportados na leitura de várias previsões
+EXECUTOR_MODES = ("threads", "processes", "serial")
+
+# Arrays de uma entrada do cubo no cache em disco
+CUBE_CACHE_KEYS = ("lat", "long", "values")
+
+
+@profiled()
+def read_contour_file(
+    file_path: str,
+    cache: Optional[ArrayCache] = None,
+    tolerance: Optional[float] = None,
+) -> pd.DataFrame:
     """
     Lê um arquivo de contorno e extrai as coordenadas de latitude e longitude.
 
     Args:
         file_path (str): O caminho para o arquivo de contorno.
+        cache (Optional[ArrayCache]): Cache em disco das coordenadas já lidas (e
+            simplificadas). Se None, o arquivo é sempre lido.
+        tolerance (Optional[float]): Se definida, o contorno é simplificado pelo algoritmo
+            de Douglas-Peucker com essa tolerância, em graus (ver ``simplify_polygon``).
+
+    Returns:
+        pd.DataFrame: Um DataFrame contendo as coordenadas de latitude e longitude e a
+        parte (bloco do arquivo .bln) de cada vértice.
+
+    Raises:
+        ValueError: Se o número de linhas de algum bloco não corresponder ao valor
+            especificado em seu cabeçalho.
+    """
+
+    def parse() -> Dict[str, np.ndarray]:
+        coordinates, offsets = read_bln_file(file_path)
+        if tolerance is not None:
+            coordinates, offsets = simplify_polygon(coordinates, tolerance, offsets)
+        return {"coordinates": coordinates, "offsets": offsets}
+
+    if cache is None:
+        arrays = parse()
+    else:
+        namespace = "bln" if tolerance is None else f"bln_dp_{tolerance!r}"
+        arrays = cache.get_or_compute(
+            namespace, [file_path], parse, keys=("coordinates", "offsets")
+        )
+
+    coordinates, offsets = arrays["coordinates"], arrays["offsets"]
+
+    contour = pd.DataFrame(coordinates, columns=["lat", "long"])
+    contour["parte"] = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+    return contour
+
+
+def read_bln_file(file_path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lê um arquivo .bln com um ou mais blocos (cabeçalho "n,flag" seguido de n vértices).
+
+    O arquivo é tokenizado de uma só vez pelo leitor em C do pandas; apenas os
+    cabeçalhos são percorridos em Python, um por bloco, e não um por vértice. Apenas as
+    duas primeiras colunas são lidas, de modo que vértices "x,y,z" também são aceitos.
+
+    Args:
+        file_path (str): Caminho do arquivo .bln.
 
     Returns:
-        pd.DataFrame: Um DataFrame contendo as coordenadas de latitude e longitude.
+        Tuple[np.ndarray, np.ndarray]: Array (n, 2) contíguo com os vértices (lat, long) de
+        todos os blocos e array (n_blocos + 1,) com o início de cada bloco, seguido do
+        número total de vértices.
 
     Raises:
-        AssertionError: Se o número de linhas no arquivo não corresponder ao valor especificado no cabeçalho.
+        ValueError: Se o arquivo estiver vazio ou se o número de linhas de algum bloco não
+            corresponder ao valor especificado em seu cabeçalho.
     """
-    line_split_comp = re.compile(r"\s*,")
+    rows = pd.read_csv(
+        file_path,
+        header=None,
+        names=BLN_COLUMNS,
+        usecols=[0, 1],
+        skipinitialspace=True,
+        dtype=np.float64,
+    ).to_numpy()
+
+    if len(rows) == 0:
+        raise ValueError(f"O arquivo de contorno '{file_path}' está vazio")
 
-    with open(file_path, "r") as f:
-        raw_file = f.readlines()
+    # Linhas de cabeçalho: cada uma indica o número de vértices do seu bloco
+    headers = []
+    position = 0
+    while position < len(rows):
+        count = rows[position, 0]
+        if count != int(count) or count < 0 or position + 1 + count > len(rows):
+            raise ValueError(
+                f"O bloco da linha {position + 1} de '{file_path}' não possui o número "
+                f"de vértices indicado no cabeçalho ({rows[position, 0]:g})"
+            )
+        headers.append(position)
+        position += 1 + int(count)
 
-    l_raw_lines = [
-        line_split_comp.split(raw_file_line.strip()) for raw_file_line in raw_file
-    ]
-    l_raw_lines = list(filter(lambda item: bool(item[0]), l_raw_lines))
-    float_raw_lines = [list(map(float, raw_line))[:2] for raw_line in l_raw_lines]
-    header_line = float_raw_lines.pop(0)
-    assert len(float_raw_lines) == int(header_line[0])
-    return pd.DataFrame(float_raw_lines, columns=["lat", "long"])
+    headers = np.asarray(headers)
+    coordinates = np.ascontiguousarray(np.delete(rows, headers, axis=0))
+    offsets = np.append(headers - np.arange(len(headers)), len(coordinates))
+    return coordinates, offsets
 
 
-def read_dat_file_to_dataframe(file_path: str) -> pd.DataFrame:
+def read_dat_file(file_path: str, dtype: np.dtype = np.float64) -> np.ndarray:
+    """
+    Lê um arquivo de dados do tipo .dat em uma única passada para um array NumPy.
+
+    A tokenização é feita pelo leitor em C do NumPy, evitando a criação de listas
+    e objetos float do Python para cada linha do arquivo.
+
+    Args:
+        file_path (str): Caminho do arquivo a ser lido.
+        dtype (np.dtype): Tipo de ponto flutuante do array de saída. Com ``np.float32``
+            as coordenadas deixam de ser exatamente iguais às lidas em ``np.float64``.
+
+    Returns:
+        np.ndarray: Array de formato (n, 3) com as colunas "lat", "long" e "data_value".
+    """
+    return np.loadtxt(file_path, dtype=dtype, ndmin=2)
+
+
+def iter_dat_file(
+    file_path: str,
+    bbox: Optional[BoundingBox] = None,
+    rows: Optional[Iterable[int]] = None,
+) -> Iterator[Tuple[float, float, float]]:
+    """
+    Lê um arquivo .dat linha a linha, produzindo apenas os pontos selecionados.
+
+    As linhas fora do retângulo ``bbox`` têm apenas as coordenadas convertidas (a
+    precipitação não é lida), e as linhas fora de ``rows`` não são convertidas; a
+    leitura termina após a última linha de ``rows``. A memória utilizada não depende do
+    tamanho da grade.
+
+    É a alternativa em streaming para arquivos que não cabem em memória: o caminho
+    principal (``read_forecast_cube``) não a utiliza, e sim ``read_dat_file_subset``,
+    que lê o arquivo inteiro para a memória de uma vez e é mais rápido para os arquivos
+    do ETA40.
+
+    Args:
+        file_path (str): Caminho do arquivo a ser lido.
+        bbox (Optional[BoundingBox]): Limites (lat_min, lat_max, long_min, long_max) dos
+            pontos a manter, inclusive (ver ``contour_bounding_box``). Se None, não
+            filtra.
+        rows (Optional[Iterable[int]]): Índices (base 0) das linhas a manter. Se None,
+            não filtra.
+
+    Yields:
+        Tuple[float, float, float]: Os valores "lat", "long" e "data_value" de cada
+        ponto.
+    """
+    if rows is not None:
+        rows = frozenset(int(row) for row in rows)
+        if not rows:
+            return
+        last_row = max(rows)
+
+    with open(file_path, "rb") as f:
+        for row, line in enumerate(f):
+            if rows is not None:
+                if row > last_row:
+                    break
+                if row not in rows:
+                    continue
+
+            fields = line.split()
+            if not fields:
+                continue
+
+            # Converte cada coluna apenas se a anterior estiver dentro do retângulo
+            lat = float(fields[0])
+            if bbox is not None and not bbox[0] <= lat <= bbox[1]:
+                continue
+            long = float(fields[1])
+            if bbox is not None and not bbox[2] <= long <= bbox[3]:
+                continue
+
+            yield lat, long, float(fields[2])
+
+
+def _fixed_record_dtype(first_line: bytes) -> Optional[np.dtype]:
+    """
+    Tipo estruturado de um registro de largura fixa, detectado no primeiro registro.
+
+    Returns:
+        Optional[np.dtype]: Campos "lat", "long", "data_value" e "eol" como bytes, ou None
+        se a linha não tiver o layout de ``FIXED_RECORD_PATTERN``.
+    """
+    match = FIXED_RECORD_PATTERN.match(first_line)
+    if match is None:
+        return None
+
+    lat, long, value, eol = (len(field) for field in match.groups())
+    return np.dtype(
+        [
+            ("lat", f"S{lat}"),
+            ("long", f"S{long}"),
+            ("data_value", f"S{value}"),
+            ("eol", f"S{eol}"),
+        ]
+    )
+
+
+def _fixed_layout_records(content: bytes) -> Optional[np.ndarray]:
+    """Registros de largura fixa de um arquivo .dat, sem cópia, ou None se o layout não for fixo."""
+    record_dtype = _fixed_record_dtype(content[: content.find(b"\n") + 1])
+    if record_dtype is None or len(content) % record_dtype.itemsize != 0:
+        return None
+
+    records = np.frombuffer(content, dtype=record_dtype)
+    if not np.all(records["eol"] == records["eol"][0]):
+        return None
+    return records
+
+
+def read_dat_file_subset(
+    file_path: str,
+    bbox: Optional[BoundingBox] = None,
+    rows: Optional[Iterable[int]] = None,
+    dtype: np.dtype = np.float64,
+) -> np.ndarray:
+    """
+    Lê apenas os pontos selecionados de um arquivo .dat para um array NumPy.
+
+    Nos arquivos de largura fixa (ETA40), os registros são lidos do buffer do arquivo como
+    um array estruturado, sem tokenização por linha: as latitudes são convertidas de uma
+    só vez, as longitudes apenas dos registros dentro da faixa de latitudes e a
+    precipitação apenas dos pontos selecionados. Os demais arquivos são lidos por
+    ``read_dat_file`` e filtrados. O resultado é o mesmo de ``iter_dat_file``.
+
+    Args:
+        file_path (str): Caminho do arquivo a ser lido.
+        bbox (Optional[BoundingBox]): Limites (lat_min, lat_max, long_min, long_max) dos
+            pontos a manter, inclusive (ver ``contour_bounding_box``). Se None, não filtra.
+        rows (Optional[Iterable[int]]): Índices (base 0) das linhas a manter. Se None, não filtra.
+        dtype (np.dtype): Tipo de ponto flutuante do array de saída.
+
+    Returns:
+        np.ndarray: Array de formato (k, 3) com as colunas "lat", "long" e "data_value",
+        na ordem do arquivo.
+    """
+    with open(file_path, "rb") as f:
+        content = f.read()
+
+    records = _fixed_layout_records(content)
+    if records is None:
+        data = read_dat_file(file_path)
+        columns = {name: data[:, i] for i, name in enumerate(DAT_COLUMNS)}
+    else:
+        columns = {name: records[name] for name in DAT_COLUMNS}
+
+    # Linhas selecionadas, na ordem do arquivo
+    n_rows = len(columns["lat"])
+    if rows is None:
+        selected = np.arange(n_rows)
+    else:
+        selected = np.unique(np.fromiter(rows, dtype=np.intp))
+        selected = selected[(selected >= 0) & (selected < n_rows)]
+
+    # Cada coluna é convertida apenas nas linhas que passaram pelos filtros anteriores
+    lat = columns["lat"][selected].astype(np.float64)
+    if bbox is not None:
+        inside = (lat >= bbox[0]) & (lat <= bbox[1])
+        selected, lat = selected[inside], lat[inside]
+
+    long = columns["long"][selected].astype(np.float64)
+    if bbox is not None:
+        inside = (long >= bbox[2]) & (long <= bbox[3])
+        selected, lat, long = selected[inside], lat[inside], long[inside]
+
+    value = columns["data_value"][selected].astype(np.float64)
+    return np.column_stack([lat, long, value]).astype(dtype, copy=False)
+
+
+def read_dat_file_to_dataframe(
+    file_path: str, bbox: Optional[BoundingBox] = None
+) -> pd.DataFrame:
     """
     Lê um arquivo de dados do tipo .dat e cria um DataFrame com as colunas "lat", "long", "data_value" e "file_path".
 
     Args:
         file_path (str): Caminho do arquivo a ser lido.
+        bbox (Optional[BoundingBox]): Se definido, lê apenas os pontos dentro do
+            retângulo (ver ``read_dat_file_subset``).
 
     Returns:
         pd.DataFrame: DataFrame contendo os dados do arquivo.
     """
     if file_path[-4:] == ".dat":
-        with open(file_path, "r") as f:
-            raw_file = f.readlines()
-
-        list_dados = [line.split() for line in raw_file]
-        float_raw_lines = [list(map(float, raw_line)) for raw_line in list_dados]
-        df = pd.DataFrame(float_raw_lines, columns=["lat", "long", "data_value"])
+        if bbox is None:
+            data = read_dat_file(file_path)
+        else:
+            data = read_dat_file_subset(file_path, bbox=bbox)
+        df = pd.DataFrame(data, columns=DAT_COLUMNS)
         df["file_path"] = file_path
         return df
 
 
-def multithreading_reader_dat_file(folder_path: str) -> pd.DataFrame:
+def list_dat_files(folder_path: str, pattern: str = "*.dat") -> List[str]:
+    """
+    Lista, em ordem alfabética, os arquivos de uma pasta que correspondem ao padrão glob.
+
+    Args:
+        folder_path (str): Caminho da pasta contendo os arquivos de dados.
+        pattern (str): Padrão glob dos arquivos a serem selecionados.
+
+    Returns:
+        List[str]: Caminhos dos arquivos selecionados.
+    """
+    return sorted(glob.glob(os.path.join(glob.escape(folder_path), pattern)))
+
+
+@profiled()
+def multithreading_reader_dat_file(
+    folder_path: str, pattern: str = "*.dat"
+) -> pd.DataFrame:
     """
     Lê vários arquivos de dados do tipo .dat em paralelo utilizando threads e cria um DataFrame combinado.
 
     Args:
         folder_path (str): Caminho da pasta contendo os arquivos de dados.
+        pattern (str): Padrão glob dos arquivos a serem lidos.
 
     Returns:
         pd.DataFrame: DataFrame combinado contendo os dados de todos os arquivos.
     """
-    file_paths = [
-        os.path.join(folder_path, filename) for filename in os.listdir(folder_path)
-    ]
+    file_paths = list_dat_files(folder_path, pattern)
     num_files = len(file_paths)
     num_cpus = multiprocessing.cpu_count()
-    num_workers = min(num_files, num_cpus)
+    num_workers = max(1, min(num_files, num_cpus))
 
     with ThreadPoolExecutor(max_workers=num_workers) as executor:
         dfs = executor.map(read_dat_file_to_dataframe, file_paths)
 
     combined_df = pd.concat(list(dfs), ignore_index=True)
     return combined_df
+
+
+class FixedLayoutDatReader(object):
+    """
+    Leitor de acesso aleatório, via memória mapeada, de arquivos .dat de largura fixa.
+
+    Os arquivos ETA40 têm todos os registros com o mesmo tamanho em bytes
+    (``"-75.00 -35.00   0.0\\r\\n"``) e a mesma ordem de pontos da grade. O layout é
+    validado uma única vez em um arquivo de referência; a partir daí, o registro do ponto
+    ``i`` de qualquer arquivo começa no byte ``i * record_length``. Cada arquivo é mapeado
+    em memória e apenas os registros dos pontos pedidos são decodificados, de modo que o
+    custo por arquivo é O(pontos pedidos) e não O(grade).
+
+    Em cada leitura, o tamanho do arquivo e as coordenadas dos registros lidos são
+    comparados aos do arquivo de referência.
+
+    Args:
+        template_path (str): Arquivo .dat de referência, que define o layout e a grade.
+
+    Attributes:
+        record_length (int): Tamanho, em bytes, de cada registro (incluindo a quebra de linha).
+        n_points (int): Número de pontos da grade.
+        lat (np.ndarray): Latitudes dos pontos da grade.
+        long (np.ndarray): Longitudes dos pontos da grade.
+
+    Raises:
+        ValueError: Se o arquivo de referência não tiver registros de largura fixa.
+    """
+
+    def __init__(self, template_path: str) -> None:
+        """
+        Detecta os campos no primeiro registro e valida o layout em todo o arquivo de referência.
+        """
+        with open(template_path, "rb") as f:
+            first_line = f.readline()
+            content = first_line + f.read()
+
+        record_dtype = _fixed_record_dtype(first_line)
+        if record_dtype is None or len(content) % len(first_line) != 0:
+            raise ValueError(
+                f"O arquivo '{template_path}' não possui registros de largura fixa"
+            )
+
+        self.record_length = len(first_line)
+        self.n_points = len(content) // self.record_length
+        self.record_dtype = record_dtype
+        self.eol = FIXED_RECORD_PATTERN.match(first_line).group(4)
+
+        records = np.frombuffer(content, dtype=self.record_dtype)
+        if not np.all(records["eol"] == self.eol):
+            raise ValueError(
+                f"O arquivo '{template_path}' não possui registros de largura fixa"
+            )
+
+        try:
+            self.lat = records["lat"].astype(np.float64)
+            self.long = records["long"].astype(np.float64)
+            records["data_value"].astype(np.float64)
+        except ValueError:
+            raise ValueError(
+                f"O arquivo '{template_path}' possui campos não numéricos"
+            ) from None
+
+        # Bytes das coordenadas, comparados com os registros lidos de outros arquivos
+        self._coordinates = records[["lat", "long"]].copy()
+
+    @property
+    def nbytes(self) -> int:
+        """Tamanho esperado, em bytes, de cada arquivo."""
+        return self.n_points * self.record_length
+
+    def cells_for_contour(self, contour: pd.DataFrame) -> np.ndarray:
+        """
+        Índices, sem repetição e em ordem crescente, dos pontos da grade associados a um contorno.
+
+        Args:
+            contour (pd.DataFrame): DataFrame com as colunas "lat" e "long" dos vértices do contorno.
+
+        Returns:
+            np.ndarray: Os índices dos pontos da grade (ver ``ContourGridIndex``).
+        """
+        return np.unique(ContourGridIndex(contour, self.lat, self.long).grid_indices)
+
+    def read_values(self, file_path: str, cells: Iterable[int]) -> np.ndarray:
+        """
+        Lê a precipitação dos pontos ``cells`` de um arquivo, sem ler o arquivo inteiro.
+
+        Args:
+            file_path (str): Caminho do arquivo .dat.
+            cells (Iterable[int]): Índices dos pontos da grade a serem lidos.
+
+        Returns:
+            np.ndarray: Array (len(cells),) com a precipitação de cada ponto.
+
+        Raises:
+            ValueError: Se o tamanho do arquivo ou as coordenadas dos pontos lidos forem
+                diferentes das do arquivo de referência.
+        """
+        cells = np.asarray(cells, dtype=np.intp)
+
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size != self.nbytes:
+                raise ValueError(
+                    f"O arquivo '{file_path}' não possui o layout do arquivo de referência"
+                )
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # A seleção copia apenas os registros pedidos; a view é descartada
+                # antes de fechar o mapeamento
+                view = np.frombuffer(mapped, dtype=self.record_dtype)
+                records = view[cells]
+                del view
+
+        if not (
+            np.all(records["eol"] == self.eol)
+            and np.array_equal(records[["lat", "long"]], self._coordinates[cells])
+        ):
+            raise ValueError(
+                f"O arquivo '{file_path}' não possui a grade do arquivo de referência"
+            )
+
+        return records["data_value"].astype(np.float64)
+
+
+def memory_mapped_reader_dat_file(
+    folder_path: str,
+    cells: Iterable[int],
+    pattern: str = "*.dat",
+    reader: Optional[FixedLayoutDatReader] = None,
+) -> ForecastCube:
+    """
+    Lê apenas os pontos ``cells`` de todos os arquivos .dat de uma pasta, via memória mapeada.
+
+    Args:
+        folder_path (str): Caminho da pasta contendo os arquivos de dados.
+        cells (Iterable[int]): Índices dos pontos da grade a serem lidos
+            (ver ``FixedLayoutDatReader.cells_for_contour``).
+        pattern (str): Padrão glob dos arquivos a serem lidos.
+        reader (Optional[FixedLayoutDatReader]): Leitor já validado, para reaproveitá-lo
+            entre chamadas. Se None, o primeiro arquivo é utilizado como referência.
+
+    Returns:
+        ForecastCube: Cubo cuja grade contém apenas os pontos ``cells``.
+
+    Raises:
+        ValueError: Se a pasta não contiver arquivos ou se algum arquivo não seguir o
+            layout e a grade do arquivo de referência.
+    """
+    file_paths = list_dat_files(folder_path, pattern)
+    if not file_paths:
+        raise ValueError(f"Nenhum arquivo '{pattern}' encontrado em '{folder_path}'")
+
+    if reader is None:
+        reader = FixedLayoutDatReader(file_paths[0])
+
+    cells = np.asarray(cells, dtype=np.intp)
+    values = np.empty((len(file_paths), len(cells)), dtype=np.float64)
+    for row, file_path in enumerate(file_paths):
+        values[row] = reader.read_values(file_path, cells)
+
+    return ForecastCube(
+        lat=reader.lat[cells],
+        long=reader.long[cells],
+        values=values,
+        file_paths=file_paths,
+    )
+
+
+def _grid_digest(array: np.ndarray) -> str:
+    """Calcula uma assinatura das coordenadas (lat, long) de um arquivo já lido."""
+    return hashlib.sha1(np.ascontiguousarray(array[:, :2]).tobytes()).hexdigest()
+
+
+def _read_values_into(
+    values: np.ndarray, row: int, file_path: str, digest: str
+) -> Optional[str]:
+    """
+    Lê um arquivo .dat e escreve seus valores na linha ``row`` do array de destino.
+
+    Returns:
+        Optional[str]: O caminho do arquivo se a sua grade for diferente da esperada, senão None.
+    """
+    array = read_dat_file(file_path)
+    if _grid_digest(array) != digest:
+        return file_path
+
+    values[row] = array[:, 2]
+    return None
+
+
+def _read_values_into_shared_memory(
+    task: Tuple[str, Tuple[int, int], int, str, str],
+) -> Optional[str]:
+    """
+    Versão de ``_read_values_into`` executada em processos: o destino é um bloco de
+    memória compartilhada, de modo que apenas o nome do bloco trafega entre processos.
+    """
+    shm_name, shape, row, file_path, digest = task
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return _read_values_into(
+            np.ndarray(shape, dtype=np.float64, buffer=shm.buf), row, file_path, digest
+        )
+    finally:
+        shm.close()
+
+
+@profiled(rows=lambda cube: cube.values.size)
+def read_forecast_cube(
+    folder_path: str,
+    pattern: str = "*.dat",
+    executor: str = "threads",
+    max_workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    cache: Optional[ArrayCache] = None,
+) -> ForecastCube:
+    """
+    Lê os arquivos .dat de uma pasta em um ForecastCube, armazenando a grade uma única vez.
+
+    O primeiro arquivo define a grade; os demais são lidos pelo executor escolhido e
+    escritos diretamente em suas linhas do array de valores. No modo "processes" esse
+    array fica em memória compartilhada, evitando serializar os dados lidos por cada processo.
+
+    Args:
+        folder_path (str): Caminho da pasta contendo os arquivos de dados.
+        pattern (str): Padrão glob dos arquivos a serem lidos.
+        executor (str): Modo de execução: "threads", "processes" ou "serial".
+        max_workers (Optional[int]): Número máximo de workers. Padrão: número de CPUs.
+        chunksize (Optional[int]): Número de arquivos enviados por vez a cada processo.
+            Padrão: arquivos divididos em cerca de quatro lotes por worker.
+        cache (Optional[ArrayCache]): Cache em disco do cubo. Em um acerto, os arrays são
+            mapeados em memória (somente leitura) sem reler os arquivos de texto.
+
+    Returns:
+        ForecastCube: Cubo com os valores de todos os arquivos, ordenados pelo nome do arquivo.
+
+    Raises:
+        ValueError: Se o modo de execução for inválido, se a pasta não contiver arquivos
+            ou se os arquivos não compartilharem a mesma grade.
+    """
+    if executor not in EXECUTOR_MODES:
+        raise ValueError(
+            f"Modo de execução '{executor}' inválido, utilize um de {EXECUTOR_MODES}"
+        )
+
+    file_paths = list_dat_files(folder_path, pattern)
+    if not file_paths:
+        raise ValueError(f"Nenhum arquivo '{pattern}' encontrado em '{folder_path}'")
+
+    if cache is not None:
+        arrays = cache.load("forecast_cube", file_paths, keys=CUBE_CACHE_KEYS)
+        if arrays is not None:
+            return ForecastCube(file_paths=file_paths, **arrays)
+
+    # O primeiro arquivo define a grade compartilhada por todos os demais
+    first = read_dat_file(file_paths[0])
+    digest = _grid_digest(first)
+    shape = (len(file_paths), len(first))
+
+    num_workers = max_workers or multiprocessing.cpu_count()
+    num_workers = max(1, min(num_workers, len(file_paths) - 1))
+    if chunksize is None:
+        chunksize = max(1, (len(file_paths) - 1) // (num_workers * 4))
+
+    rows = range(1, len(file_paths))
+
+    if executor == "processes":
+        nbytes = np.dtype(np.float64).itemsize * shape[0] * shape[1]
+        shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+        try:
+            shared_values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+            shared_values[0] = first[:, 2]
+            tasks = [(shm.name, shape, row, file_paths[row], digest) for row in rows]
+
+            with ProcessPoolExecutor(max_workers=num_workers) as pool:
+                mismatches = list(
+                    pool.map(
+                        _read_values_into_shared_memory, tasks, chunksize=chunksize
+                    )
+                )
+
+            values = shared_values.copy()
+            del shared_values
+        finally:
+            shm.close()
+            shm.unlink()
+    else:
+        values = np.empty(shape, dtype=np.float64)
+        values[0] = first[:, 2]
+
+        def read_row(row: int) -> Optional[str]:
+            return _read_values_into(values, row, file_paths[row], digest)
+
+        if executor == "threads":
+            with ThreadPoolExecutor(max_workers=num_workers) as pool:
+                mismatches = list(pool.map(read_row, rows))
+        else:
+            mismatches = [read_row(row) for row in rows]
+
+    mismatches = [file_path for file_path in mismatches if file_path is not None]
+    if mismatches:
+        raise ValueError(
+            f"O arquivo '{mismatches[0]}' não possui a mesma grade de '{file_paths[0]}'"
+        )
+
+    cube = ForecastCube(
+        lat=np.ascontiguousarray(first[:, 0]),
+        long=np.ascontiguousarray(first[:, 1]),
+        values=values,
+        file_paths=file_paths,
+    )
+
+    if cache is not None:
+        cache.store(
+            "forecast_cube",
+            file_paths,
+            {"lat": cube.lat, "long": cube.long, "values": cube.values},
+        )
+
+    return cube
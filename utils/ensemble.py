@@ -0,0 +1,249 @@
+import warnings
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.cache import ArrayCache
+from utils.data_reader import read_forecast_cube
+from utils.forecast_cube import CONTROL_MEMBER, ForecastCube
+from utils.spatial import ContourGridIndex
+
+# Percentis padrão do espalhamento entre os membros
+ENSEMBLE_PERCENTILES = (10, 50, 90)
+
+
+@dataclass
+class EnsembleCube(object):
+    """
+    Previsões de várias rodadas e membros de um conjunto sobre a mesma grade do modelo.
+
+    Os valores ficam em um único array 4D indexado por rodada, membro, antecedência e
+    ponto da grade, de modo que a acumulação ao longo das datas e as estatísticas entre
+    os membros são reduções vetorizadas sobre um eixo. Combinações sem arquivo (ex.: uma
+    rodada com menos dias de previsão) são preenchidas com NaN.
+
+    Attributes:
+        lat (np.ndarray): Array 1D (n_points,) com as latitudes da grade.
+        long (np.ndarray): Array 1D (n_points,) com as longitudes da grade.
+        values (np.ndarray): Array 4D (n_runs, n_members, n_leads, n_points) com a precipitação.
+        runs (np.ndarray): Datas das rodadas (datetime64[D]), em ordem cronológica.
+        members (List[str]): Nomes dos membros, com ``CONTROL_MEMBER`` primeiro, se presente.
+        leads (np.ndarray): Antecedências, em dias, em ordem crescente.
+        model (str): Nome do modelo de previsão (ex.: "ETA40").
+    """
+
+    lat: np.ndarray
+    long: np.ndarray
+    values: np.ndarray
+    runs: np.ndarray
+    members: List[str]
+    leads: np.ndarray
+    model: str
+
+    def __post_init__(self) -> None:
+        shape = (len(self.runs), len(self.members), len(self.leads), len(self.lat))
+        if self.values.shape != shape:
+            raise ValueError(
+                "O array 'values' deve ter formato (n_runs, n_members, n_leads, n_points) = "
+                f"{shape}, recebido {self.values.shape}"
+            )
+
+    @property
+    def n_runs(self) -> int:
+        """Número de rodadas."""
+        return self.values.shape[0]
+
+    @property
+    def n_members(self) -> int:
+        """Número de membros do conjunto."""
+        return self.values.shape[1]
+
+    @property
+    def n_leads(self) -> int:
+        """Número de antecedências (datas previstas por rodada)."""
+        return self.values.shape[2]
+
+    @property
+    def n_points(self) -> int:
+        """Número de pontos da grade."""
+        return self.values.shape[3]
+
+    @property
+    def target_dates(self) -> np.ndarray:
+        """Array (n_runs, n_leads) com a data prevista de cada rodada e antecedência."""
+        return self.runs[:, None] + self.leads.astype("timedelta64[D]")
+
+    @classmethod
+    def from_cube(cls, cube: ForecastCube) -> "EnsembleCube":
+        """
+        Reorganiza um ForecastCube pelos metadados do nome de cada arquivo.
+
+        Args:
+            cube (ForecastCube): Cubo com um arquivo por rodada, membro e data prevista.
+
+        Returns:
+            EnsembleCube: O cubo de conjunto equivalente.
+
+        Raises:
+            ValueError: Se algum nome de arquivo não seguir o padrão (ver
+                ``forecast_file_table``), se os arquivos forem de modelos diferentes ou se
+                houver arquivos repetidos.
+        """
+        files = cube.file_table()
+
+        models = files["modelo"].cat.remove_unused_categories().cat.categories
+        if len(models) > 1:
+            raise ValueError(
+                f"Os arquivos devem ser de um único modelo, encontrados {list(models)}"
+            )
+
+        runs, run_rows = np.unique(
+            files["data_emissao"].to_numpy().astype("datetime64[D]"),
+            return_inverse=True,
+        )
+        lead_days, lead_rows = np.unique(
+            files["antecedencia"].to_numpy(), return_inverse=True
+        )
+
+        # Membros em ordem alfabética, com o controle primeiro
+        members = files["membro"].cat.remove_unused_categories()
+        member_names = sorted(
+            members.cat.categories, key=lambda m: (m != CONTROL_MEMBER, m)
+        )
+        members = members.cat.reorder_categories(member_names)
+        member_rows = members.cat.codes.to_numpy()
+
+        # Posição de cada arquivo no cubo (rodada, membro, antecedência)
+        positions = np.ravel_multi_index(
+            (run_rows, member_rows, lead_rows),
+            (len(runs), len(member_names), len(lead_days)),
+        )
+        if len(np.unique(positions)) != len(positions):
+            raise ValueError(
+                "Existem arquivos repetidos para a mesma rodada, membro e data prevista"
+            )
+
+        values = np.full(
+            (len(runs), len(member_names), len(lead_days), cube.n_points), np.nan
+        )
+        values[run_rows, member_rows, lead_rows] = cube.values
+
+        return cls(
+            lat=cube.lat,
+            long=cube.long,
+            values=values,
+            runs=runs,
+            members=list(member_names),
+            leads=lead_days,
+            model=str(models[0]),
+        )
+
+    def basin_fields(
+        self, contour: pd.DataFrame, index: Optional[ContourGridIndex] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Seleciona os pontos da grade da bacia, na ordem poligonal (ver ``transform_data``).
+
+        Args:
+            contour (pd.DataFrame): Contorno da bacia (colunas "lat" e "long").
+            index (Optional[ContourGridIndex]): Índice pré-calculado do contorno sobre a
+                grade. Se None, o índice é construído.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: As latitudes e longitudes dos pontos
+            da bacia e o array (n_runs, n_members, n_leads, n_basin_points) de valores.
+        """
+        if index is None:
+            index = ContourGridIndex(contour, self.lat, self.long)
+
+        # Ponto da grade de cada coordenada da ordem poligonal
+        cells = np.unique(index.grid_indices)
+        cell_by_point = dict(zip(zip(self.lat[cells], self.long[cells]), cells))
+        ordered = np.asarray([cell_by_point[point] for point in index.polygon_order])
+
+        return self.lat[ordered], self.long[ordered], self.values[..., ordered]
+
+
+def read_ensemble_cube(
+    folder_path: str,
+    pattern: str = "*.dat",
+    cache: Optional[ArrayCache] = None,
+    **kwargs,
+) -> EnsembleCube:
+    """
+    Lê as previsões de várias rodadas e membros de uma pasta em um EnsembleCube.
+
+    Os arquivos são lidos por ``read_forecast_cube`` (leitura paralela e cache em disco) e
+    reorganizados pelo nome: ``<modelo>_pDDMMYYaDDMMYY[_<membro>].dat``.
+
+    Args:
+        folder_path (str): Caminho da pasta contendo os arquivos de dados.
+        pattern (str): Padrão glob dos arquivos a serem lidos.
+        cache (Optional[ArrayCache]): Cache em disco do cubo.
+        **kwargs: Demais argumentos de ``read_forecast_cube`` (ex.: ``executor``).
+
+    Returns:
+        EnsembleCube: O cubo de conjunto.
+    """
+    return EnsembleCube.from_cube(
+        read_forecast_cube(folder_path, pattern=pattern, cache=cache, **kwargs)
+    )
+
+
+def ensemble_statistics(
+    ensemble: EnsembleCube,
+    daily: np.ndarray,
+    percentiles: Iterable[float] = ENSEMBLE_PERCENTILES,
+) -> pd.DataFrame:
+    """
+    Acumula a precipitação diária ao longo das datas e resume o espalhamento entre membros.
+
+    A acumulação é uma soma cumulativa no eixo das antecedências e as estatísticas são
+    reduções no eixo dos membros, ambas sobre o array completo. Uma data ausente torna
+    NaN a acumulação das datas seguintes da mesma rodada e membro.
+
+    Args:
+        ensemble (EnsembleCube): O cubo de conjunto.
+        daily (np.ndarray): Array (n_runs, n_members, n_leads) com a precipitação diária da
+            bacia (ver ``PrecipitationModel.predict_fields``).
+        percentiles (Iterable[float]): Percentis calculados entre os membros.
+
+    Returns:
+        pd.DataFrame: DataFrame indexado por ("rodada", "data_previsao") com as colunas
+        "media", "minimo", "maximo" e "p<percentil>" da precipitação acumulada, e
+        "membros" com o número de membros disponíveis.
+    """
+    percentiles = list(percentiles)
+    accumulated = np.cumsum(daily, axis=-1)
+
+    # Membros ausentes (NaN) são ignorados; datas sem nenhum membro resultam em NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        statistics = {
+            "media": np.nanmean(accumulated, axis=1),
+            "minimo": np.nanmin(accumulated, axis=1),
+            "maximo": np.nanmax(accumulated, axis=1),
+            **dict(
+                zip(
+                    (f"p{q:g}" for q in percentiles),
+                    np.nanpercentile(accumulated, percentiles, axis=1),
+                )
+            ),
+        }
+
+    index = pd.MultiIndex.from_arrays(
+        [
+            np.repeat(ensemble.runs, ensemble.n_leads),
+            ensemble.target_dates.ravel(),
+        ],
+        names=["rodada", "data_previsao"],
+    )
+    result = pd.DataFrame(
+        {name: value.ravel() for name, value in statistics.items()}, index=index
+    )
+    result["membros"] = np.isfinite(accumulated).sum(axis=1).ravel()
+
+    # Combinações inexistentes (antecedência além do horizonte da rodada)
+    return result[result["membros"] > 0]
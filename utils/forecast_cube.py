@@ -0,0 +1,187 @@
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Nome dos arquivos de previsão: modelo, rodada (emissão), data prevista e, nas previsões
+# por conjunto, o sufixo do membro. Ex.: "ETA40_p011221a021221.dat", "ETA40_p011221a021221_m03.dat"
+FORECAST_FILE_PATTERN = re.compile(
+    r"^(?P<modelo>[^_]+)_p(?P<emissao>\d{6})a(?P<previsao>\d{6})(?:_(?P<membro>[^.]+))?\.dat$",
+    re.IGNORECASE,
+)
+
+# Membro atribuído aos arquivos sem sufixo (previsão determinística)
+CONTROL_MEMBER = "controle"
+
+
+def forecast_file_table(file_paths: Iterable[str]) -> pd.DataFrame:
+    """
+    Extrai os metadados dos nomes dos arquivos de previsão, uma linha por arquivo.
+
+    A extração e a conversão das datas são vetorizadas (``str.extract`` e ``to_datetime``)
+    e feitas uma única vez por arquivo; as tabelas por ponto carregam apenas o código do
+    arquivo (posição em ``file_paths``) e obtêm as datas por indexação.
+
+    Args:
+        file_paths (Iterable[str]): Caminhos dos arquivos (apenas o nome é utilizado).
+
+    Returns:
+        pd.DataFrame: DataFrame indexado pelo código do arquivo ("codigo_arquivo") com as
+        colunas "arquivo", "modelo" (categórica), "data_emissao" e "data_previsao"
+        (datetime64), "antecedencia" (dias) e "membro" (categórica, ``CONTROL_MEMBER``
+        para arquivos sem sufixo).
+
+    Raises:
+        ValueError: Se algum nome não seguir o padrão ``<modelo>_pDDMMYYaDDMMYY[_<membro>].dat``.
+    """
+    names = pd.Series([os.path.basename(path) for path in file_paths], dtype=object)
+    parts = names.str.extract(FORECAST_FILE_PATTERN)
+
+    invalid = parts["emissao"].isna().to_numpy()
+    if invalid.any():
+        raise ValueError(
+            f"O nome do arquivo '{names[invalid.argmax()]}' não segue o padrão "
+            "'<modelo>_pDDMMYYaDDMMYY[_<membro>].dat'"
+        )
+
+    issue_dates = pd.to_datetime(parts["emissao"], format="%d%m%y")
+    target_dates = pd.to_datetime(parts["previsao"], format="%d%m%y")
+
+    table = pd.DataFrame(
+        {
+            "arquivo": names,
+            "modelo": parts["modelo"].astype("category"),
+            "data_emissao": issue_dates,
+            "data_previsao": target_dates,
+            "antecedencia": (target_dates - issue_dates).dt.days.astype(np.int64),
+            "membro": parts["membro"].fillna(CONTROL_MEMBER).astype("category"),
+        }
+    )
+    table.index.name = "codigo_arquivo"
+    return table
+
+
+@dataclass
+class ForecastCube(object):
+    """
+    Estrutura compacta para um conjunto de previsões sobre a mesma grade do modelo ETA40.
+
+    As coordenadas da grade são armazenadas uma única vez e os valores de precipitação
+    ficam em um array 2D contíguo, indexado por arquivo de previsão (data) e por ponto
+    da grade. A memória cresce com datas × pontos, e não com datas × pontos × colunas.
+
+    Attributes:
+        lat (np.ndarray): Array 1D (n_points,) com as latitudes da grade.
+        long (np.ndarray): Array 1D (n_points,) com as longitudes da grade.
+        values (np.ndarray): Array 2D (n_dates, n_points) com a precipitação de cada arquivo.
+        file_paths (List[str]): Caminho do arquivo de origem de cada linha de ``values``.
+    """
+
+    lat: np.ndarray
+    long: np.ndarray
+    values: np.ndarray
+    file_paths: List[str]
+
+    def __post_init__(self) -> None:
+        if self.lat.shape != self.long.shape:
+            raise ValueError("As coordenadas 'lat' e 'long' devem ter o mesmo formato")
+
+        if self.values.shape != (len(self.file_paths), len(self.lat)):
+            raise ValueError(
+                "O array 'values' deve ter formato (n_dates, n_points) = "
+                f"({len(self.file_paths)}, {len(self.lat)}), recebido {self.values.shape}"
+            )
+
+    @property
+    def n_dates(self) -> int:
+        """Número de arquivos de previsão (datas) no cubo."""
+        return self.values.shape[0]
+
+    @property
+    def n_points(self) -> int:
+        """Número de pontos da grade."""
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays numéricos do cubo."""
+        return self.lat.nbytes + self.long.nbytes + self.values.nbytes
+
+    def file_table(self) -> pd.DataFrame:
+        """
+        Metadados dos arquivos do cubo, uma linha por linha de ``values`` (ver ``forecast_file_table``).
+
+        Returns:
+            pd.DataFrame: A tabela de metadados, indexada pelo código do arquivo.
+        """
+        return forecast_file_table(self.file_paths)
+
+    def grid_dataframe(self) -> pd.DataFrame:
+        """
+        Retorna as coordenadas da grade, uma linha por ponto.
+
+        Returns:
+            pd.DataFrame: DataFrame com as colunas "lat" e "long".
+        """
+        return pd.DataFrame({"lat": self.lat, "long": self.long})
+
+    def to_long_dataframe(self) -> pd.DataFrame:
+        """
+        Converte o cubo para o formato longo produzido por ``multithreading_reader_dat_file``
+        e esperado por ``apply_contour``.
+
+        Returns:
+            pd.DataFrame: DataFrame com as colunas "lat", "long", "data_value" e "file_path".
+        """
+        return pd.DataFrame(
+            {
+                "lat": np.tile(self.lat, self.n_dates),
+                "long": np.tile(self.long, self.n_dates),
+                "data_value": self.values.reshape(-1),
+                "file_path": np.repeat(
+                    np.asarray(self.file_paths, dtype=object), self.n_points
+                ),
+            }
+        )
+
+    @classmethod
+    def from_long_dataframe(cls, data: pd.DataFrame) -> "ForecastCube":
+        """
+        Constrói o cubo a partir de um DataFrame no formato longo.
+
+        Args:
+            data (pd.DataFrame): DataFrame com as colunas "lat", "long", "data_value" e "file_path".
+
+        Returns:
+            ForecastCube: O cubo equivalente.
+
+        Raises:
+            ValueError: Se algum arquivo não possuir valor para todos os pontos da grade.
+        """
+        file_paths = list(pd.unique(data["file_path"]))
+
+        grid = data.loc[:, ["lat", "long"]].drop_duplicates().reset_index(drop=True)
+
+        values = (
+            data.pivot_table(
+                index="file_path",
+                columns=["lat", "long"],
+                values="data_value",
+                aggfunc="first",
+            )
+            .reindex(index=file_paths)
+            .reindex(columns=pd.MultiIndex.from_frame(grid))
+        )
+
+        if values.isna().to_numpy().any():
+            raise ValueError("Todos os arquivos devem conter a mesma grade de pontos")
+
+        return cls(
+            lat=grid["lat"].to_numpy(),
+            long=grid["long"].to_numpy(),
+            values=np.ascontiguousarray(values.to_numpy()),
+            file_paths=file_paths,
+        )
@@ -0,0 +1,245 @@
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.data_reader import list_dat_files, read_dat_file_to_dataframe
+from utils.forecast_cube import forecast_file_table
+from utils.model import PrecipitationModel
+from utils.preprocess import apply_contour, transform_data
+from utils.spatial import contour_bounding_box
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+STATE_PATH: str = os.path.join(BASE_DIR, ".incremental_state.json")
+
+# Versão do formato do arquivo de estado (2: datas no formato ISO, AAAA-MM-DD;
+# 3: data de emissão da rodada de cada arquivo)
+STATE_VERSION = 3
+
+
+def _file_hash(file_path: str) -> str:
+    """Hash SHA-1 do conteúdo de um arquivo."""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _contour_hash(contour: pd.DataFrame) -> str:
+    """Hash dos vértices do contorno, para invalidar o estado quando a bacia muda."""
+    return hashlib.sha1(
+        contour.loc[:, ["lat", "long"]].to_numpy(dtype=np.float64).tobytes()
+    ).hexdigest()
+
+
+class IncrementalPipeline(object):
+    """
+    Pipeline incremental que processa apenas os arquivos de previsão novos ou alterados.
+
+    O estado persistido guarda, para cada arquivo .dat, o hash do conteúdo e o resultado
+    diário já calculado. A cada execução, apenas os arquivos novos (ou cujo conteúdo mudou)
+    passam por ``read_dat_file_to_dataframe``, ``apply_contour``, ``transform_data`` e
+    ``PrecipitationModel.predict``; o acumulado de cada rodada (data de emissão, extraída
+    do nome do arquivo por ``forecast_file_table``) é recalculado a partir dos valores
+    diários armazenados, sem misturar previsões de rodadas diferentes. O custo de cada
+    execução é O(arquivos novos).
+
+    Para evitar reler arquivos inalterados, o hash só é recalculado quando o mtime ou o
+    tamanho do arquivo mudam. Se o contorno mudar, todo o estado é descartado.
+
+    Args:
+        contour (pd.DataFrame): O contorno da bacia (ver ``read_contour_file``).
+        state_path (str): Caminho do arquivo JSON de estado.
+    """
+
+    def __init__(self, contour: pd.DataFrame, state_path: str = STATE_PATH) -> None:
+        """
+        Inicializa o pipeline e carrega o estado persistido, se existir.
+        """
+        self.contour = contour
+        self.state_path = state_path
+        self.contour_hash = _contour_hash(contour)
+        self.bbox = contour_bounding_box(contour)
+        self.files: Dict[str, dict] = self._load_state()
+
+    def _load_state(self) -> Dict[str, dict]:
+        """Lê o estado do disco, descartando-o se for de outra versão ou de outro contorno."""
+        if not os.path.exists(self.state_path):
+            return {}
+
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if (
+            state.get("version") != STATE_VERSION
+            or state.get("contour_hash") != self.contour_hash
+        ):
+            return {}
+
+        return state.get("files", {})
+
+    def save(self) -> None:
+        """Grava o estado de forma atômica (arquivo temporário renomeado)."""
+        state = {
+            "version": STATE_VERSION,
+            "contour_hash": self.contour_hash,
+            "files": self.files,
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def _is_up_to_date(self, file_path: str, stat: os.stat_result) -> bool:
+        """Indica se o resultado armazenado de um arquivo ainda é válido."""
+        entry = self.files.get(os.path.abspath(file_path))
+        if entry is None:
+            return False
+
+        if entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            return True
+
+        # mtime/tamanho mudaram: compara o conteúdo antes de reprocessar
+        if entry["hash"] == _file_hash(file_path):
+            entry["mtime_ns"], entry["size"] = stat.st_mtime_ns, stat.st_size
+            return True
+
+        return False
+
+    def _process_file(self, file_path: str) -> Tuple[pd.Timestamp, float]:
+        """Calcula o resultado diário de um único arquivo de previsão."""
+        # Apenas os pontos próximos à bacia são lidos
+        forecast = read_dat_file_to_dataframe(file_path, bbox=self.bbox)
+        df = transform_data(apply_contour(self.contour, forecast))
+
+        date = df["data_previsao"].iloc[0]
+        model = PrecipitationModel(data=df)
+
+        return date, float(model.predict(date))
+
+    def pending_files(self, folder_path: str, pattern: str = "*.dat") -> List[str]:
+        """
+        Lista os arquivos novos ou alterados de uma pasta, ainda sem resultado válido.
+
+        Arquivos que deixaram de existir na pasta são removidos do estado.
+
+        Args:
+            folder_path (str): Caminho da pasta contendo os arquivos de previsão.
+            pattern (str): Padrão glob dos arquivos de previsão.
+
+        Returns:
+            List[str]: Caminhos absolutos dos arquivos a processar.
+        """
+        file_paths = [
+            os.path.abspath(path) for path in list_dat_files(folder_path, pattern)
+        ]
+        folder = os.path.abspath(folder_path)
+        existing = set(file_paths)
+
+        # Remove arquivos que saíram da pasta
+        for file_path in list(self.files):
+            if os.path.dirname(file_path) == folder and file_path not in existing:
+                del self.files[file_path]
+
+        return [
+            file_path
+            for file_path in file_paths
+            if not self._is_up_to_date(file_path, os.stat(file_path))
+        ]
+
+    def record(self, file_path: str, date: Any, precipitation: float) -> None:
+        """
+        Armazena o resultado diário de um arquivo no estado (sem gravar em disco; ver ``save``).
+
+        Args:
+            file_path (str): Caminho do arquivo de previsão processado.
+            date (Any): Data de previsão do arquivo (datetime64, datetime ou Timestamp).
+            precipitation (float): Resultado diário do arquivo.
+        """
+        stat = os.stat(file_path)
+        issue_date = forecast_file_table([file_path])["data_emissao"].iloc[0]
+        self.files[os.path.abspath(file_path)] = {
+            "hash": _file_hash(file_path),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "data_emissao": issue_date.strftime("%Y-%m-%d"),
+            "data_previsao": pd.Timestamp(date).strftime("%Y-%m-%d"),
+            "precipitacao": float(precipitation),
+        }
+
+    def update(self, folder_path: str, pattern: str = "*.dat") -> int:
+        """
+        Processa os arquivos novos ou alterados de uma pasta e atualiza o estado.
+
+        Args:
+            folder_path (str): Caminho da pasta contendo os arquivos de previsão.
+            pattern (str): Padrão glob dos arquivos de previsão.
+
+        Returns:
+            int: O número de arquivos processados nesta execução.
+        """
+        pending = self.pending_files(folder_path, pattern)
+        for file_path in pending:
+            self.record(file_path, *self._process_file(file_path))
+
+        self.save()
+        return len(pending)
+
+    def result(self, folder_path: Optional[str] = None) -> pd.DataFrame:
+        """
+        Resultado diário e acumulado de cada rodada a partir do estado armazenado.
+
+        Args:
+            folder_path (Optional[str]): Se definido, considera apenas os arquivos dessa pasta.
+
+        Returns:
+            pd.DataFrame: DataFrame com as colunas "arquivo", "data_emissao",
+            "data_previsao", "precipitacao" e "precipitacao_acumulada" (acumulado dentro da
+            rodada), ordenado por rodada e, em cada rodada, em ordem cronológica.
+        """
+        files = self.files
+        if folder_path is not None:
+            folder = os.path.abspath(folder_path)
+            files = {
+                path: entry
+                for path, entry in files.items()
+                if os.path.dirname(path) == folder
+            }
+
+        df = pd.DataFrame(
+            [
+                (
+                    os.path.basename(path),
+                    entry["data_emissao"],
+                    entry["data_previsao"],
+                    entry["precipitacao"],
+                )
+                for path, entry in files.items()
+            ],
+            columns=["arquivo", "data_emissao", "data_previsao", "precipitacao"],
+        )
+
+        # Ordem por rodada e cronológica, com as datas convertidas de uma só vez
+        for column in ("data_emissao", "data_previsao"):
+            df[column] = pd.to_datetime(df[column], format="%Y-%m-%d")
+        df = df.sort_values(
+            ["data_emissao", "data_previsao"], kind="stable"
+        ).reset_index(drop=True)
+
+        df["precipitacao_acumulada"] = df.groupby("data_emissao")[
+            "precipitacao"
+        ].cumsum()
+        return df
@@ -1,7 +1,455 @@
+import os
+import threading
+from datetime import datetime
+from dataclasses import dataclass, field
+from functools import lru_cache, reduce
+from multiprocessing import shared_memory
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
 import numpy as np
 import pandas as pd
-from scipy.interpolate import griddata
+from scipy.interpolate import CloughTocher2DInterpolator
 from scipy.integrate import cumulative_trapezoid
+from scipy.spatial import Delaunay
+
+from utils.integration import BasinIntegrator
+from utils.profiler import profiled, stage
+from utils.spatial import contour_part_offsets
+
+# Resolução padrão (pontos por eixo) da malha de interpolação
+GRID_RESOLUTION = 1000
+
+# Número de conjuntos de pontos cujos pesos de interpolação ficam em memória
+WEIGHTS_CACHE_SIZE = 4
+
+# Tamanho máximo, em bytes, do tensor de pesos de um conjunto de pontos. Acima dele (bacias
+# com muitos pontos ou malhas muito finas), os pesos não são calculados nem guardados em
+# cache e a malha é interpolada diretamente, em blocos de FALLBACK_TILE_ROWS linhas
+WEIGHTS_MAX_BYTES = 128 * 2**20
+FALLBACK_TILE_ROWS = 128
+
+# Memória máxima, em bytes, das malhas avaliadas de uma só vez (malha interpolada e sua
+# integral cumulativa de cada data): acima dela, as datas são processadas em lotes
+GRID_BATCH_BYTES = 256 * 2**20
+
+# Métodos de cálculo da precipitação da bacia:
+#  - "grid": máximo da integral cumulativa (cumulative_trapezoid) sobre a malha interpolada
+#  - "exact": média exata, ponderada pela área, do interpolador linear sobre o contorno.
+#    Não é comparável ao "grid", que integra o interpolador Clough-Tocher
+PREDICTION_METHODS = ("grid", "exact")
+
+# Formato das datas de previsão em texto (ex.: "02/12/21"), o mesmo das figuras
+DATE_FORMAT = "%d/%m/%y"
+
+# Modos de execução da malha do método "grid": "serial" no próprio processo; "threads"
+# e "processes" distribuem blocos de linhas da malha entre workers
+PREDICTION_EXECUTORS = ("serial", "threads", "processes")
+
+# Tensores de pesos mapeados em cada processo de trabalho, pelo nome do bloco de memória
+# compartilhada (ver ``_weights_tile_shared_memory``)
+_WORKER_WEIGHTS: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+@lru_cache(maxsize=WEIGHTS_CACHE_SIZE * 4)
+def _triangulation(points_key: bytes) -> Delaunay:
+    """
+    Triangulação de Delaunay de um conjunto de pontos, compartilhada entre datas.
+
+    Args:
+        points_key (bytes): Os pontos (lat, long), em float64, serializados com ``tobytes``.
+            Os bytes são a própria chave do cache LRU.
+
+    Returns:
+        Delaunay: A triangulação dos pontos.
+    """
+    return Delaunay(np.frombuffer(points_key, dtype=np.float64).reshape(-1, 2))
+
+
+@lru_cache(maxsize=WEIGHTS_CACHE_SIZE * 4)
+def _grid_axes(points_key: bytes, resolution: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Eixos da malha de interpolação sobre a extensão de um conjunto de pontos.
+
+    As coordenadas são sempre float64: em float32 os extremos da malha podem cair fora
+    da envoltória convexa dos pontos e serem interpolados como NaN.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: As linspaces de latitude e longitude (somente leitura).
+    """
+    points = np.frombuffer(points_key, dtype=np.float64).reshape(-1, 2)
+
+    latitude_linspace = np.linspace(points[:, 0].min(), points[:, 0].max(), resolution)
+    longitude_linspace = np.linspace(points[:, 1].min(), points[:, 1].max(), resolution)
+
+    for array in (latitude_linspace, longitude_linspace):
+        array.flags.writeable = False
+    return latitude_linspace, longitude_linspace
+
+
+def _weights_fit(points_key: bytes, resolution: int, dtype: str) -> bool:
+    """Indica se o tensor de pesos (n_long, n_lat, n_points) cabe em ``WEIGHTS_MAX_BYTES``."""
+    n_points = len(points_key) // (2 * np.dtype(np.float64).itemsize)
+    nbytes = n_points * resolution * resolution * np.dtype(dtype).itemsize
+    return nbytes <= WEIGHTS_MAX_BYTES
+
+
+@lru_cache(maxsize=WEIGHTS_CACHE_SIZE)
+@profiled("interpolation_weights", rows=None)
+def _interpolation_weights(
+    points_key: bytes, resolution: int = GRID_RESOLUTION, dtype: str = "float64"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula os pesos da interpolação cúbica (Clough-Tocher) de um conjunto de pontos sobre a malha.
+
+    O interpolador é linear nos valores de precipitação: interpolar a matriz identidade
+    fornece, para cada ponto da malha, o peso de cada ponto de previsão. Assim, a
+    triangulação de Delaunay e a localização dos pontos da malha são feitas uma única vez
+    por conjunto de pontos, e cada data passa a custar apenas um produto matricial.
+
+    Args:
+        points_key (bytes): Os pontos (lat, long), em float64, serializados com ``tobytes``.
+            Os bytes são a própria chave do cache LRU.
+        resolution (int): Número de pontos da malha em cada eixo.
+        dtype (str): Tipo de ponto flutuante dos pesos (as coordenadas são sempre float64).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]: As linspaces de
+        latitude e longitude, a malha ``(grid_x, grid_y)`` e os pesos de formato
+        (n_long, n_lat, n_points). Os arrays são somente leitura, pois são compartilhados entre chamadas.
+    """
+    latitude_linspace, longitude_linspace = _grid_axes(points_key, resolution)
+
+    # Definir a mesgrid para a interpolação
+    grid_x, grid_y = np.meshgrid(latitude_linspace, longitude_linspace)
+
+    # Pesos: interpolação da matriz identidade sobre a triangulação
+    triangulation = _triangulation(points_key)
+    weights = CloughTocher2DInterpolator(triangulation, np.eye(triangulation.npoints))(
+        (grid_x, grid_y)
+    ).astype(dtype, copy=False)
+
+    arrays = (latitude_linspace, longitude_linspace, grid_x, grid_y, weights)
+    for array in arrays:
+        array.flags.writeable = False
+    return arrays
+
+
+@lru_cache(maxsize=WEIGHTS_CACHE_SIZE * 4)
+def _basin_integrator(
+    points_key: bytes, polygon_key: bytes, offsets_key: bytes
+) -> BasinIntegrator:
+    """
+    Integrador exato de uma bacia sobre a triangulação de um conjunto de pontos.
+
+    Args:
+        points_key (bytes): Os pontos (lat, long), em float64, serializados com ``tobytes``.
+        polygon_key (bytes): Os vértices do contorno, em float64, serializados com ``tobytes``.
+        offsets_key (bytes): O início de cada parte do contorno, em int64, serializado com
+            ``tobytes`` (ver ``contour_part_offsets``).
+
+    Returns:
+        BasinIntegrator: O integrador, com os pesos de cada ponto já calculados.
+    """
+    polygon = np.frombuffer(polygon_key, dtype=np.float64).reshape(-1, 2)
+    offsets = np.frombuffer(offsets_key, dtype=np.int64)
+    return BasinIntegrator(_triangulation(points_key), polygon, offsets)
+
+
+@profiled("cumulative_trapezoid")
+def _max_cumulative_integral(
+    precipitation_grid: np.ndarray, latitude_linspace: np.ndarray
+) -> np.ndarray:
+    """
+    Integral cumulativa ao longo do eixo das latitudes e seu valor máximo, ignorando NaN.
+
+    Args:
+        precipitation_grid (np.ndarray): Malhas interpoladas de formato (n_datas, n_long, n_lat).
+        latitude_linspace (np.ndarray): As latitudes da malha.
+
+    Returns:
+        np.ndarray: Array (n_datas,) com o máximo de cada malha (NaN se não houver valores).
+    """
+    precipitation_integral = cumulative_trapezoid(
+        precipitation_grid,
+        x=latitude_linspace.astype(precipitation_grid.dtype, copy=False),
+        axis=-1,
+    )
+    return np.fmax.reduce(
+        precipitation_integral.reshape(len(precipitation_integral), -1), axis=1
+    )
+
+
+def _predict_tile(
+    interpolator: CloughTocher2DInterpolator,
+    latitude_linspace: np.ndarray,
+    longitude_rows: np.ndarray,
+    dtype: str,
+) -> np.ndarray:
+    """
+    Interpola e integra um bloco de linhas da malha para todas as datas do interpolador.
+
+    Returns:
+        np.ndarray: Array (n_datas,) com o máximo da integral cumulativa no bloco.
+    """
+    grid_x, grid_y = np.meshgrid(latitude_linspace, longitude_rows)
+
+    # Bloco de malhas (n_datas, n_linhas, n_lat)
+    with stage("interpolation"):
+        precipitation_grid = np.moveaxis(
+            interpolator((grid_x, grid_y)).astype(dtype, copy=False), -1, 0
+        )
+
+    return _max_cumulative_integral(precipitation_grid, latitude_linspace)
+
+
+def _weights_tile(
+    weights: np.ndarray,
+    latitude_linspace: np.ndarray,
+    values: np.ndarray,
+    start: int,
+    stop: int,
+    dtype: str,
+) -> np.ndarray:
+    """
+    Interpola e integra as linhas ``start:stop`` da malha com o tensor de pesos em cache.
+
+    Returns:
+        np.ndarray: Array (n_datas,) com o máximo da integral cumulativa no bloco.
+    """
+    # Bloco de malhas (n_datas, n_linhas, n_lat)
+    with stage("interpolation"):
+        precipitation_grid = np.moveaxis(
+            weights[start:stop] @ values.astype(dtype, copy=False), -1, 0
+        )
+
+    return _max_cumulative_integral(precipitation_grid, latitude_linspace)
+
+
+def _weights_tile_shared_memory(
+    task: Tuple[str, Tuple[int, int, int], str, np.ndarray, np.ndarray, int, int],
+) -> np.ndarray:
+    """
+    Versão de ``_weights_tile`` executada em processos. O tensor de pesos é lido de um
+    bloco de memória compartilhada (ver ``PrecipitationModel._shared_weights``), mapeado
+    uma única vez por processo; apenas os valores e os limites do bloco trafegam.
+    """
+    shm_name, shape, dtype, latitude_linspace, values, start, stop = task
+
+    if shm_name not in _WORKER_WEIGHTS:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        weights = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        _WORKER_WEIGHTS[shm_name] = (shm, weights)
+
+    weights = _WORKER_WEIGHTS[shm_name][1]
+    return _weights_tile(weights, latitude_linspace, values, start, stop, dtype)
+
+
+def _predict_tile_shared_memory(
+    task: Tuple[str, int, int, int, str, int, int],
+) -> np.ndarray:
+    """
+    Versão de ``_predict_tile`` executada em processos. Os pontos, os valores e os eixos da
+    malha são lidos de um bloco de memória compartilhada (ver ``_shared_inputs``), de modo
+    que apenas o nome do bloco e os limites do bloco de linhas trafegam entre processos.
+    A triangulação fica em cache no processo entre blocos.
+    """
+    shm_name, n_points, n_dates, resolution, dtype, start, stop = task
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray(
+            (n_points * (2 + n_dates) + 2 * resolution,),
+            dtype=np.float64,
+            buffer=shm.buf,
+        )
+        offset = n_points * (2 + n_dates)
+        points = buffer[: 2 * n_points].reshape(n_points, 2).copy()
+        values = buffer[2 * n_points : offset].reshape(n_points, n_dates).copy()
+        latitude_linspace = buffer[offset : offset + resolution].copy()
+        offset += resolution
+        longitude_rows = buffer[offset + start : offset + stop].copy()
+        del buffer
+    finally:
+        shm.close()
+
+    interpolator = CloughTocher2DInterpolator(_triangulation(points.tobytes()), values)
+    return _predict_tile(interpolator, latitude_linspace, longitude_rows, dtype)
+
+
+def _shared_inputs(
+    points_key: bytes, values: np.ndarray, resolution: int
+) -> shared_memory.SharedMemory:
+    """
+    Copia pontos, valores e eixos da malha para um bloco de memória compartilhada, na
+    ordem lida por ``_predict_tile_shared_memory``. O bloco deve ser liberado com ``unlink``.
+    """
+    points = np.frombuffer(points_key, dtype=np.float64)
+    latitude_linspace, longitude_linspace = _grid_axes(points_key, resolution)
+    parts = [points, values.ravel(), latitude_linspace, longitude_linspace]
+
+    nbytes = sum(part.nbytes for part in parts)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, nbytes))
+    buffer = np.ndarray((nbytes // 8,), dtype=np.float64, buffer=shm.buf)
+    buffer[:] = np.concatenate(parts)
+    del buffer
+    return shm
+
+
+@dataclass(frozen=True, eq=False)
+class PredictionResult(object):
+    """
+    Resultado imutável da predição de uma data.
+
+    A malha interpolada só é incluída quando solicitada (``return_grid=True``); os arrays
+    são somente leitura e os eixos e a malha de coordenadas são compartilhados com o
+    cache de pesos, sem cópia.
+
+    Attributes:
+        date (Any): A data de previsão.
+        value (float): A integral cumulativa máxima da precipitação interpolada.
+        latitude_linspace (Optional[np.ndarray]): As latitudes da malha.
+        longitude_linspace (Optional[np.ndarray]): As longitudes da malha.
+        grid_x (Optional[np.ndarray]): A malha de coordenadas X (latitudes).
+        grid_y (Optional[np.ndarray]): A malha de coordenadas Y (longitudes).
+        precipitation_grid (Optional[np.ndarray]): A precipitação interpolada sobre a malha.
+    """
+
+    date: Any
+    value: float
+    latitude_linspace: Optional[np.ndarray] = field(default=None, repr=False)
+    longitude_linspace: Optional[np.ndarray] = field(default=None, repr=False)
+    grid_x: Optional[np.ndarray] = field(default=None, repr=False)
+    grid_y: Optional[np.ndarray] = field(default=None, repr=False)
+    precipitation_grid: Optional[np.ndarray] = field(default=None, repr=False)
+
+
+def _predict_points(
+    points_key: bytes,
+    values: np.ndarray,
+    date: Any,
+    resolution: int,
+    dtype: str,
+    return_grid: bool,
+) -> PredictionResult:
+    """Interpola e integra os valores de uma data sobre a malha (ver ``predict_precipitation``)."""
+    if _weights_fit(points_key, resolution, dtype):
+        latitude_linspace, longitude_linspace, grid_x, grid_y, weights = (
+            _interpolation_weights(points_key, resolution, dtype)
+        )
+
+        with stage("interpolation"):
+            precipitation_grid = weights @ values.astype(dtype, copy=False)
+    else:
+        # Pesos grandes demais: interpolação direta, sem tensor de pesos
+        latitude_linspace, longitude_linspace = _grid_axes(points_key, resolution)
+        grid_x, grid_y = np.meshgrid(latitude_linspace, longitude_linspace)
+        grid_x.flags.writeable = grid_y.flags.writeable = False
+
+        with stage("interpolation"):
+            interpolator = CloughTocher2DInterpolator(
+                _triangulation(points_key), values
+            )
+            precipitation_grid = interpolator((grid_x, grid_y)).astype(
+                dtype, copy=False
+            )
+
+    value = float(
+        _max_cumulative_integral(precipitation_grid[None], latitude_linspace)[0]
+    )
+    if not return_grid:
+        return PredictionResult(date=date, value=value)
+
+    precipitation_grid.flags.writeable = False
+    return PredictionResult(
+        date=date,
+        value=value,
+        latitude_linspace=latitude_linspace,
+        longitude_linspace=longitude_linspace,
+        grid_x=grid_x,
+        grid_y=grid_y,
+        precipitation_grid=precipitation_grid,
+    )
+
+
+def predict_precipitation(
+    latitude: np.ndarray,
+    longitude: np.ndarray,
+    precipitation: np.ndarray,
+    date: Any = None,
+    resolution: int = GRID_RESOLUTION,
+    dtype: np.dtype = np.float64,
+    return_grid: bool = False,
+) -> PredictionResult:
+    """
+    Calcula a integral cumulativa máxima da precipitação interpolada de um conjunto de pontos.
+
+    Função pura: não guarda estado além dos caches LRU de triangulação e pesos (cujos
+    arrays são somente leitura), podendo ser chamada concorrentemente de várias threads.
+
+    Args:
+        latitude (np.ndarray): Latitudes dos pontos, na ordem poligonal (ver ``transform_data``).
+        longitude (np.ndarray): Longitudes dos pontos.
+        precipitation (np.ndarray): Precipitação em cada ponto.
+        date (Any): A data de previsão, apenas repassada ao resultado.
+        resolution (int): Número de pontos da malha de interpolação em cada eixo.
+        dtype (np.dtype): Tipo de ponto flutuante dos pesos e da malha interpolada.
+        return_grid (bool): Se True, o resultado inclui a malha interpolada.
+
+    Returns:
+        PredictionResult: O resultado da data.
+
+    Raises:
+        ValueError: Se a resolução for menor que 2.
+    """
+    if resolution < 2:
+        raise ValueError("A resolução da malha deve ser de ao menos 2 pontos por eixo")
+
+    points = np.column_stack([latitude, longitude]).astype(np.float64)
+    return _predict_points(
+        points.tobytes(),
+        np.asarray(precipitation, dtype=np.float64),
+        date,
+        resolution,
+        np.dtype(dtype).name,
+        return_grid,
+    )
+
+
+def _date_key(date: Any) -> Any:
+    """
+    Normaliza uma data para a chave dos grupos: ``np.datetime64``, ``datetime`` e textos
+    no formato ``DATE_FORMAT`` ("02/12/21") ou ISO ("2021-12-02") viram ``pd.Timestamp``
+    (igual às chaves do ``groupby``, mas com outro hash).
+    """
+    if isinstance(date, str):
+        try:
+            return pd.Timestamp(datetime.strptime(date, DATE_FORMAT))
+        except ValueError:
+            pass
+        try:
+            return pd.Timestamp(date)
+        except ValueError:
+            # Texto que não é uma data: a busca nos grupos falha com KeyError
+            return date
+    return pd.Timestamp(date) if isinstance(date, (np.datetime64, datetime)) else date
+
+
+def _group_by_date(data: pd.DataFrame) -> Dict[object, Tuple[bytes, np.ndarray]]:
+    """
+    Agrupa os dados por data de previsão.
+
+    Returns:
+        Dict[object, Tuple[bytes, np.ndarray]]: Para cada data, a chave do conjunto de
+        pontos (ver ``_interpolation_weights``) e o array de precipitação.
+    """
+    return {
+        date: (
+            group.iloc[:, [0, 1]].to_numpy(dtype=np.float64).tobytes(),
+            group.iloc[:, 2].to_numpy(dtype=np.float64),
+        )
+        for date, group in data.groupby(data.columns[3], sort=False)
+    }
 
 
 class PrecipitationModel(object):
@@ -9,86 +457,467 @@ class PrecipitationModel(object):
     Uma classe para modelar previsões de precipitação e calcular integrais cumulativas.
 
     Args:
-        data (pd.DataFrame): Um DataFrame contendo os dados de previsão de precipitação com
+        data (Optional[pd.DataFrame]): Um DataFrame contendo os dados de previsão de precipitação com
                             as colunas 'latitude', 'longitude', 'data_previsao' e 'precipitacao'.
+                            Pode ser omitido quando apenas ``predict_fields`` for utilizado.
+        resolution (int): Número de pontos da malha de interpolação em cada eixo.
+        dtype (np.dtype): Tipo de ponto flutuante dos pesos e das malhas interpoladas
+            (``np.float32`` reduz a memória pela metade).
+        tile_rows (Optional[int]): Se definido, ``predict_many`` avalia a malha em blocos
+            com esse número de linhas, interpolando e integrando cada bloco de forma
+            independente. O pico de memória passa a ser limitado pelo bloco, e não pela malha.
+            Também é o caminho usado, com blocos de ``FALLBACK_TILE_ROWS``, quando o tensor
+            de pesos excede ``WEIGHTS_MAX_BYTES``.
+        contour (Optional[pd.DataFrame]): Contorno da bacia (colunas "lat" e "long"),
+            necessário para o método "exact".
+        executor (str): Modo de execução do método "grid" em ``predict_many``: "serial",
+            "threads" ou "processes". Nos dois últimos, blocos de linhas da malha são
+            distribuídos entre workers e combinados com ``np.fmax``, que não depende da
+            ordem de conclusão. Cada bloco é uma fatia do tensor de pesos em cache (em
+            processos, copiado uma única vez para memória compartilhada). O pool é criado
+            no primeiro uso e mantido até ``close``.
+        max_workers (Optional[int]): Número máximo de workers. Padrão: número de CPUs.
+
+    A classe é um invólucro fino sobre ``predict_precipitation``: os dados são agrupados
+    por data na construção e nenhum método altera os dados da instância, que pode ser
+    compartilhada entre threads. Com ``executor`` "threads" ou "processes", chame
+    ``close`` ao terminar para encerrar o pool e liberar a memória compartilhada.
 
     Attributes:
-        df (pd.DataFrame): O DataFrame contendo os dados de previsão de precipitação.
-        latitude_linspace (np.ndarray): Um array 1D representando a interpolação das latitudes.
-        longitude_linspace (np.ndarray): Um array 1D representando a interpolação das longitudes.
-        grid_x (np.ndarray): A malha de coordenadas X para interpolação.
-        grid_y (np.ndarray): A malha de coordenadas Y para interpolação.
-        precipitation_grid (np.ndarray): Uma matriz 2D contendo os valores interpolados de precipitação.
+        df (Optional[pd.DataFrame]): O DataFrame contendo os dados de previsão de precipitação.
     """
 
-    def __init__(self, data: pd.DataFrame) -> None:
+    def __init__(
+        self,
+        data: Optional[pd.DataFrame] = None,
+        resolution: int = GRID_RESOLUTION,
+        dtype: np.dtype = np.float64,
+        tile_rows: Optional[int] = None,
+        contour: Optional[pd.DataFrame] = None,
+        executor: str = "serial",
+        max_workers: Optional[int] = None,
+    ) -> None:
         """
         Inicializa a classe com os dados de previsão de precipitação.
         """
-        self.df = data.copy()
+        if executor not in PREDICTION_EXECUTORS:
+            raise ValueError(
+                f"Modo de execução '{executor}' inválido, utilize um de {PREDICTION_EXECUTORS}"
+            )
+
+        if resolution < 2:
+            raise ValueError(
+                "A resolução da malha deve ser de ao menos 2 pontos por eixo"
+            )
+
+        if tile_rows is not None and tile_rows < 1:
+            raise ValueError("O número de linhas por bloco deve ser positivo")
+
+        self.df = data.copy() if data is not None else None
+        self.resolution = resolution
+        self.dtype = np.dtype(dtype).name
+        self.tile_rows = tile_rows
+        self.contour = contour
+        self.executor = executor
+        self.max_workers = max_workers
+        self._groups = _group_by_date(self.df) if data is not None else {}
+
+        # Pool de workers e pesos em memória compartilhada, criados no primeiro uso
+        self._pool: Optional[Executor] = None
+        self._shared: Dict[Tuple[bytes, int, str], shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
 
-    def interpolation(self) -> np.ndarray:
+    def close(self) -> None:
+        """Encerra o pool de workers e libera os pesos em memória compartilhada."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            shared, self._shared = self._shared, {}
+
+        if pool is not None:
+            pool.shutdown()
+        for shm in shared.values():
+            shm.close()
+            shm.unlink()
+
+    def predict_result(self, date: Any, return_grid: bool = False) -> PredictionResult:
         """
-        Realiza a interpolação dos dados de previsão de precipitação.
+        Calcula o resultado imutável de uma data, opcionalmente com a malha interpolada.
+
+        Args:
+            date (Any): A data para a qual a previsão de precipitação será calculada.
+            return_grid (bool): Se True, o resultado inclui a malha interpolada (ex.: gráficos).
 
         Returns:
-            np.ndarray: Uma matriz 2D contendo os valores interpolados de precipitação.
+            PredictionResult: O resultado da data.
+
+        Raises:
+            KeyError: Se a data não estiver presente nos dados.
         """
-        self.latitude_linspace = np.linspace(
-            min(self.latitude), max(self.latitude), 1000
+        points_key, values = self._groups[_date_key(date)]
+        return _predict_points(
+            points_key, values, date, self.resolution, self.dtype, return_grid
         )
 
-        self.longitude_linspace = np.linspace(
-            min(self.longitude), max(self.longitude), 1000
+    def predict(self, date: str, method: str = "grid") -> float:
+        """
+        Calcula a integral cumulativa da precipitação interpolada para uma data específica.
+
+        Args:
+            date (str): A data para a qual a previsão de precipitação será calculada, em
+                texto ("02/12/21" ou "2021-12-02") ou como data (ex.: ``pd.Timestamp``).
+            method (str): "grid" (integral sobre a malha, padrão) ou "exact" (média exata
+                sobre o contorno da bacia, sem malha; ver ``BasinIntegrator``). O "exact"
+                integra o interpolador linear, e não o Clough-Tocher da malha: os valores
+                dos dois métodos não são comparáveis.
+
+        Returns:
+            float: A integral cumulativa máxima da precipitação interpolada ("grid") ou a
+            precipitação média da bacia em mm ("exact").
+        """
+        if method != "grid":
+            return self.predict_many([date], method=method)[0]
+
+        return self.predict_result(date).value
+
+    @profiled()
+    def predict_many(self, dates: Iterable, method: str = "grid") -> np.ndarray:
+        """
+        Calcula a integral cumulativa máxima da precipitação interpolada para várias datas.
+
+        Os dados são agrupados por data uma única vez. As datas que compartilham o mesmo
+        conjunto de pontos são interpoladas juntas, como um array empilhado de valores
+        sobre a mesma triangulação, e integradas em uma chamada vetorizada por lote de
+        ``_batch_size()`` datas, de modo que o pico de memória não cresce com o número de datas.
+
+        Args:
+            dates (Iterable): As datas para as quais a previsão de precipitação será calculada.
+            method (str): "grid" ou "exact" (ver ``predict``).
+
+        Returns:
+            np.ndarray: Array 1D com o resultado de cada data, na mesma ordem de ``dates``.
+
+        Raises:
+            KeyError: Se alguma data não estiver presente nos dados.
+            ValueError: Se o método for inválido ou se "exact" for usado sem contorno.
+        """
+        self._check_method(method)
+
+        dates = list(dates)
+        groups = self._groups
+
+        # Posições das datas de cada conjunto de pontos
+        positions_by_points: Dict[bytes, List[int]] = {}
+        for position, date in enumerate(dates):
+            points_key, _ = groups[_date_key(date)]
+            positions_by_points.setdefault(points_key, []).append(position)
+
+        pool = self._executor_pool(method)
+
+        result = np.empty(len(dates), dtype=np.float64)
+        for points_key, positions in positions_by_points.items():
+            for batch in self._batches(positions):
+                # Valores empilhados (n_points, n_datas do lote)
+                values = np.column_stack(
+                    [groups[_date_key(dates[p])][1] for p in batch]
+                )
+                result[batch] = self._predict_values(points_key, values, method, pool)
+
+        return result
+
+    @profiled(rows=lambda result: result.size)
+    def predict_fields(
+        self,
+        latitude: np.ndarray,
+        longitude: np.ndarray,
+        fields: np.ndarray,
+        method: str = "grid",
+    ) -> np.ndarray:
+        """
+        Calcula o resultado de vários campos de precipitação sobre os mesmos pontos.
+
+        Os campos podem ter qualquer número de eixos à frente do eixo dos pontos, por
+        exemplo (rodadas, membros, datas, pontos) de um ``EnsembleCube``: todos usam a
+        mesma triangulação e são interpolados juntos em lotes de ``_batch_size()`` campos,
+        como em ``predict_many``, de modo que o pico de memória não depende do tamanho do conjunto.
+        Campos com algum valor ausente (NaN) não são calculados e resultam em NaN.
+
+        Args:
+            latitude (np.ndarray): Latitudes dos pontos, na ordem poligonal (ver ``transform_data``).
+            longitude (np.ndarray): Longitudes dos pontos.
+            fields (np.ndarray): Array (..., n_points) com a precipitação de cada campo.
+            method (str): "grid" ou "exact" (ver ``predict``).
+
+        Returns:
+            np.ndarray: Array com o formato ``fields.shape[:-1]`` e o resultado de cada campo.
+
+        Raises:
+            ValueError: Se o método for inválido, se "exact" for usado sem contorno ou se
+                o último eixo de ``fields`` não corresponder aos pontos.
+        """
+        self._check_method(method)
+
+        fields = np.asarray(fields, dtype=np.float64)
+        if fields.ndim < 1 or fields.shape[-1] != len(latitude):
+            raise ValueError(
+                f"O último eixo de 'fields' deve ter {len(latitude)} pontos, "
+                f"recebido formato {fields.shape}"
+            )
+
+        points_key = np.column_stack([latitude, longitude]).astype(np.float64).tobytes()
+
+        # Campos empilhados (n_campos, n_points), apenas os completos são calculados
+        stacked = fields.reshape(-1, fields.shape[-1])
+        complete = np.flatnonzero(np.isfinite(stacked).all(axis=1))
+
+        result = np.full(len(stacked), np.nan)
+        pool = self._executor_pool(method)
+        for batch in self._batches(complete):
+            result[batch] = self._predict_values(
+                points_key, stacked[batch].T, method, pool
+            )
+
+        return result.reshape(fields.shape[:-1])
+
+    def _batch_size(self) -> int:
+        """Número de datas por lote, de modo que as malhas caibam em ``GRID_BATCH_BYTES``."""
+        # Por data: malha interpolada, integral cumulativa e um temporário da integração,
+        # em float64 no pior caso (interpolação direta)
+        grid_bytes = (
+            3 * self.resolution * self.resolution * np.dtype(np.float64).itemsize
         )
+        return max(1, GRID_BATCH_BYTES // grid_bytes)
+
+    def _batches(self, positions: Sequence[int]) -> Iterator[Sequence[int]]:
+        """Divide as posições (datas ou campos) em lotes de ``_batch_size()``."""
+        batch_size = self._batch_size()
+        for start in range(0, len(positions), batch_size):
+            yield positions[start : start + batch_size]
 
-        # Definir a mesgrid para a interpolação
-        grid_x, grid_y = np.meshgrid(
-            self.latitude_linspace,
-            self.longitude_linspace,
+    def _executor_pool(self, method: str) -> Optional[Executor]:
+        """Pool de workers do método "grid", criado no primeiro uso e mantido até ``close``."""
+        if method != "grid" or self.executor == "serial":
+            return None
+
+        with self._lock:
+            if self._pool is None:
+                if self.executor == "processes":
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _shared_weights(self, points_key: bytes) -> shared_memory.SharedMemory:
+        """Cópia do tensor de pesos em memória compartilhada, feita uma vez por conjunto de pontos."""
+        key = (points_key, self.resolution, self.dtype)
+        with self._lock:
+            if key not in self._shared:
+                weights = _interpolation_weights(*key)[4]
+                shm = shared_memory.SharedMemory(
+                    create=True, size=max(1, weights.nbytes)
+                )
+                np.ndarray(weights.shape, dtype=weights.dtype, buffer=shm.buf)[...] = (
+                    weights
+                )
+                self._shared[key] = shm
+            return self._shared[key]
+
+    def _predict_values(
+        self,
+        points_key: bytes,
+        values: np.ndarray,
+        method: str,
+        pool: Optional[Executor],
+    ) -> np.ndarray:
+        """Calcula o resultado de valores empilhados (n_points, n_datas) de um conjunto de pontos."""
+        if method == "exact":
+            return _basin_integrator(points_key, *self._polygon_key()).mean(values)
+        if pool is not None:
+            return self._predict_parallel(points_key, values, pool)
+        if self.tile_rows is None and _weights_fit(
+            points_key, self.resolution, self.dtype
+        ):
+            return self._predict_stacked(points_key, values)
+        return self._predict_stacked_tiled(points_key, values)
+
+    def _predict_stacked(self, points_key: bytes, values: np.ndarray) -> np.ndarray:
+        """Interpola e integra, de uma só vez, a malha completa de várias datas."""
+        latitude_linspace, _, _, _, weights = _interpolation_weights(
+            points_key, self.resolution, self.dtype
         )
-        self.grid_x = grid_x
-        self.grid_y = grid_y
-
-        # Interpolação
-        self.precipitation_grid = griddata(
-            (self.latitude, self.longitude),
-            self.precipitation,
-            (self.grid_x, self.grid_y),
-            method="cubic",
+
+        # Malhas (n_datas, n_long, n_lat)
+        with stage("interpolation"):
+            precipitation_grid = np.moveaxis(weights @ values.astype(self.dtype), -1, 0)
+
+        return _max_cumulative_integral(precipitation_grid, latitude_linspace)
+
+    def _predict_stacked_tiled(
+        self, points_key: bytes, values: np.ndarray
+    ) -> np.ndarray:
+        """
+        Interpola e integra a malha em blocos de linhas. A integral é feita ao longo das
+        latitudes (colunas), logo cada linha da malha é independente e o resultado é o
+        mesmo da malha completa. Sem ``tile_rows``, usa blocos de ``FALLBACK_TILE_ROWS``.
+        """
+        tile_rows = self.tile_rows or FALLBACK_TILE_ROWS
+        latitude_linspace, longitude_linspace = _grid_axes(points_key, self.resolution)
+        interpolator = CloughTocher2DInterpolator(_triangulation(points_key), values)
+
+        result = np.full(values.shape[1], np.nan)
+        for start in range(0, self.resolution, tile_rows):
+            result = np.fmax(
+                result,
+                _predict_tile(
+                    interpolator,
+                    latitude_linspace,
+                    longitude_linspace[start : start + tile_rows],
+                    self.dtype,
+                ),
+            )
+
+        return result
+
+    def _predict_parallel(
+        self, points_key: bytes, values: np.ndarray, pool: Executor
+    ) -> np.ndarray:
+        """
+        Distribui os blocos de linhas da malha entre os workers de ``pool``.
+
+        Sem ``tile_rows``, a malha é dividida em um bloco por worker. Cada bloco é uma
+        fatia do tensor de pesos em cache: em threads, o próprio tensor; em processos, sua
+        cópia em memória compartilhada, de modo que apenas os valores trafegam. Se os pesos
+        não couberem em ``WEIGHTS_MAX_BYTES``, cada bloco é interpolado diretamente.
+        """
+        tile_rows = self.tile_rows or -(
+            -self.resolution // (self.max_workers or os.cpu_count() or 1)
         )
-        return self.precipitation_grid
+        bounds = [
+            (start, min(start + tile_rows, self.resolution))
+            for start in range(0, self.resolution, tile_rows)
+        ]
 
-    def predict(self, date: str):
+        if _weights_fit(points_key, self.resolution, self.dtype):
+            latitude_linspace, _, _, _, weights = _interpolation_weights(
+                points_key, self.resolution, self.dtype
+            )
+            if isinstance(pool, ProcessPoolExecutor):
+                shm_name = self._shared_weights(points_key).name
+                tasks = [
+                    (
+                        shm_name,
+                        weights.shape,
+                        self.dtype,
+                        latitude_linspace,
+                        values,
+                        start,
+                        stop,
+                    )
+                    for start, stop in bounds
+                ]
+                tiles = list(pool.map(_weights_tile_shared_memory, tasks))
+            else:
+                tiles = list(
+                    pool.map(
+                        lambda bound: _weights_tile(
+                            weights, latitude_linspace, values, *bound, self.dtype
+                        ),
+                        bounds,
+                    )
+                )
+        elif isinstance(pool, ProcessPoolExecutor):
+            shm = _shared_inputs(points_key, values, self.resolution)
+            try:
+                tasks = [
+                    (shm.name, *values.shape, self.resolution, self.dtype, start, stop)
+                    for start, stop in bounds
+                ]
+                tiles = list(pool.map(_predict_tile_shared_memory, tasks))
+            finally:
+                shm.close()
+                shm.unlink()
+        else:
+            latitude_linspace, longitude_linspace = _grid_axes(
+                points_key, self.resolution
+            )
+            interpolator = CloughTocher2DInterpolator(
+                _triangulation(points_key), values
+            )
+            tiles = list(
+                pool.map(
+                    lambda bound: _predict_tile(
+                        interpolator,
+                        latitude_linspace,
+                        longitude_linspace[bound[0] : bound[1]],
+                        self.dtype,
+                    ),
+                    bounds,
+                )
+            )
+
+        # O máximo não depende da ordem dos blocos: o resultado é determinístico
+        return reduce(np.fmax, tiles, np.full(values.shape[1], np.nan))
+
+    def predict_all(self, method: str = "grid") -> pd.Series:
         """
-        Calcula a integral cumulativa da precipitação interpolada para uma data específica.
+        Calcula a integral cumulativa máxima da precipitação interpolada para todas as datas dos dados.
 
         Args:
-            date (str): A data para a qual a previsão de precipitação será calculada.
+            method (str): "grid" ou "exact" (ver ``predict``).
 
         Returns:
-            float: A integral cumulativa máxima da precipitação interpolada.
+            pd.Series: O resultado de cada data, indexado pelas datas em ordem crescente.
         """
-        self.date = date
-        self.data = list(
-            self.df.loc[self.df["data_previsao"] == self.date]
-            .copy()
-            .itertuples(index=False, name=None)
+        dates = self.df.iloc[:, 3].sort_values().unique()
+        return pd.Series(
+            self.predict_many(dates, method=method), index=dates, name="precipitacao"
         )
 
-        self.latitude = [d[0] for d in self.data]
-        self.longitude = [d[1] for d in self.data]
-        self.precipitation = [d[2] for d in self.data]
+    def basin_integral(self, dates: Iterable) -> pd.DataFrame:
+        """
+        Integral exata da precipitação sobre o contorno da bacia para várias datas.
 
-        # Calcular a integral da precipitação interpolada
-        precipitation_integral = cumulative_trapezoid(
-            self.interpolation(), x=self.grid_x
-        )
+        A integral é a do interpolador linear por partes da triangulação, não a do
+        Clough-Tocher usado pelo método "grid" (ver ``predict``).
 
-        # Criar uma máscara booleana para identificar valores não NaN
-        mask = ~np.isnan(precipitation_integral)
+        Args:
+            dates (Iterable): As datas de previsão.
 
-        # Aplicar a máscara para selecionar elementos não NaN
-        result = np.max(precipitation_integral[mask])
+        Returns:
+            pd.DataFrame: DataFrame indexado pelas datas com as colunas "media" (mm),
+            "total" (mm × graus²) e "area" (graus² da bacia cobertos pela triangulação).
+        """
+        self._check_method("exact")
 
-        return result
+        dates = list(dates)
+        groups = self._groups
+
+        rows = []
+        for date in dates:
+            points_key, values = groups[_date_key(date)]
+            integrator = _basin_integrator(points_key, *self._polygon_key())
+            rows.append(
+                (
+                    float(integrator.mean(values)),
+                    float(integrator.total(values)),
+                    integrator.area,
+                )
+            )
+
+        return pd.DataFrame(rows, index=dates, columns=["media", "total", "area"])
+
+    def _check_method(self, method: str) -> None:
+        """Valida o método de cálculo e seus pré-requisitos."""
+        if method not in PREDICTION_METHODS:
+            raise ValueError(
+                f"Método '{method}' inválido, utilize um de {PREDICTION_METHODS}"
+            )
+
+        if method == "exact" and self.contour is None:
+            raise ValueError("O método 'exact' requer o contorno da bacia ('contour')")
+
+    def _polygon_key(self) -> Tuple[bytes, bytes]:
+        """Vértices e offsets das partes do contorno serializados, chave do integrador em cache."""
+        return (
+            self.contour.loc[:, ["lat", "long"]].to_numpy(dtype=np.float64).tobytes(),
+            contour_part_offsets(self.contour).tobytes(),
+        )
@@ -1,12 +1,18 @@
 import os
+import sys
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.image as mpimg
 
-
+from functools import lru_cache
 from matplotlib.figure import Figure
-from typing import List
+from typing import List, Tuple, Union
+
+if __name__ == "__main__" and not __package__:
+    # Execução direta (python utils/plotter.py): a raiz do projeto não está no sys.path
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.profiler import profiled  # noqa: E402
 
 # Varíaveis globais
 FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
@@ -14,18 +20,73 @@ BASE_DIR: str = os.path.dirname(FILE_DIR)
 DATA_DIR: str = os.path.join(BASE_DIR, "data")
 IMAGES_DIR: str = os.path.join(BASE_DIR, "images")
 
-# Dados obetidos através do estudo de contorno, conforme a image 'contorno.png'
-POLYGONAL_ORDER = [
-    (-44.6, -22.2),
-    (-44.6, -21.8),
-    (-44.6, -21.4),
-    (-44.2, -21.4),
-    (-43.8, -21.4),
-    (-43.8, -21.8),
-    (-44.2, -21.8),
-    (-44.2, -22.2),
-    (-44.6, -22.2),
-]
+# Número máximo de pontos, por eixo, das malhas desenhadas com contourf
+RENDER_GRID_SIZE = 200
+
+# Abreviações dos meses nos rótulos das datas (independentes da localidade do sistema)
+MONTH_ABBREVIATIONS = np.array(
+    ["jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"]
+)
+
+
+def date_labels(dates: pd.DatetimeIndex) -> List[str]:
+    """
+    Rótulos "dd/mmm" das datas (ex.: "02/dez").
+
+    Args:
+        dates (pd.DatetimeIndex): As datas.
+
+    Returns:
+        List[str]: O rótulo de cada data.
+    """
+    return [
+        f"{day:02d}/{month}"
+        for day, month in zip(dates.day, MONTH_ABBREVIATIONS[dates.month - 1])
+    ]
+
+
+@lru_cache(maxsize=1)
+def _logo() -> np.ndarray:
+    """Logo do BTG, lido do disco uma única vez por processo (somente leitura)."""
+    img = mpimg.imread(os.path.join(IMAGES_DIR, "btg.png"))
+    img.flags.writeable = False
+    return img
+
+
+@lru_cache(maxsize=8)
+def _basin_outline(coordinates_key: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Polígono fechado da bacia a partir dos pontos da grade em ordem poligonal.
+
+    Args:
+        coordinates_key (bytes): Coordenadas (lat, long), em float64, serializadas com ``tobytes``.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: As latitudes e longitudes do polígono fechado.
+    """
+    outline = pd.DataFrame(
+        np.frombuffer(coordinates_key, dtype=np.float64).reshape(-1, 2)
+    ).drop_duplicates()
+    outline = np.concatenate([outline.to_numpy(), outline.to_numpy()[:1]])
+    return outline[:, 0], outline[:, 1]
+
+
+def decimate_grid(
+    *grids: np.ndarray, max_size: int = RENDER_GRID_SIZE
+) -> Tuple[np.ndarray, ...]:
+    """
+    Reduz malhas 2D por amostragem com passo fixo, para que cada eixo tenha no máximo
+    ``max_size`` pontos. O resultado é uma view, sem cópia dos dados.
+
+    Args:
+        *grids (np.ndarray): Malhas com o mesmo formato (ex.: grid_x, grid_y e valores).
+        max_size (int): Número máximo de pontos por eixo.
+
+    Returns:
+        Tuple[np.ndarray, ...]: As malhas reduzidas, na mesma ordem.
+    """
+    step = [max(1, -(-size // max_size)) for size in grids[0].shape]
+    return tuple(grid[:: step[0], :: step[1]] for grid in grids)
 
 
 def contour_figure(data: pd.DataFrame) -> Figure:
@@ -42,7 +103,8 @@ def contour_figure(data: pd.DataFrame) -> Figure:
         Figure: O objeto Figure do matplotlib contendo o gráfico de contorno.
 
     """
-    fig, ax = plt.subplots()
+    fig = Figure()
+    ax = fig.subplots()
 
     ax.plot(data["lat"], data["long"], color="#0A1E8C")
     ax.set_title("Bacia Rio do Grande")
@@ -70,7 +132,8 @@ def apply_contour_figure(data: pd.DataFrame) -> Figure:
 
     """
 
-    fig, ax = plt.subplots()
+    fig = Figure()
+    ax = fig.subplots()
 
     ax.plot(
         data["lat_aproximacao"],
@@ -102,73 +165,70 @@ def interpolation_figure(data: pd.DataFrame) -> Figure:
         data (pd.DataFrame): Um DataFrame contendo os dados de previsão de precipitação.
 
     Returns:
-        plt.Figure: Uma instância da figura gerada.
+        Figure: Uma instância da figura gerada.
     """
-    from model import PrecipitationModel
+    from utils.model import PrecipitationModel
 
     model = PrecipitationModel(data.copy())
 
-    z = 0
+    # Polígono fechado da bacia: 'data' já está na ordem poligonal (ver 'transform_data')
+    outline_lat, outline_long = _basin_outline(
+        data.loc[:, ["lat_aproximacao", "long_aproximacao"]]
+        .to_numpy(dtype=np.float64)
+        .tobytes()
+    )
+
     dates = data["data_previsao"].sort_values().unique()
 
-    # Criar uma figura com 5 colunas e 1 linha
-    fig, axs = plt.subplots(nrows=2, ncols=5, figsize=(18, 5))
+    # Criar uma figura com 5 colunas e 2 linhas
+    fig = Figure(figsize=(18, 5))
+    axs = fig.subplots(nrows=2, ncols=5)
 
-    for i in range(2):
-        for j in range(5):
-            model.predict(date=dates[z])
-            # Plot dos resultados
-            axs[i][j].contourf(
-                model.grid_x,
-                model.grid_y,
-                model.precipitation_grid,
-                levels=20,
-                cmap="Blues",
-            )
+    for ax, date in zip(axs.flat, dates):
+        prediction = model.predict_result(date, return_grid=True)
 
-            axs[i][j].plot(
-                [p[0] for p in POLYGONAL_ORDER],
-                [p[1] for p in POLYGONAL_ORDER],
-                color="red",
-            )
+        # Plot dos resultados, sobre a malha reduzida
+        ax.contourf(
+            *decimate_grid(
+                prediction.grid_x, prediction.grid_y, prediction.precipitation_grid
+            ),
+            levels=20,
+            cmap="Blues",
+        )
 
-            # Ajustar os limites dos eixos
-            axs[i][j].set_xlim(-45, -43.5)
-            axs[i][j].set_ylim(-22.4, -21.2)
+        ax.plot(outline_lat, outline_long, color="red")
 
-            z += 1
+        # Ajustar os limites dos eixos
+        ax.set_xlim(-45, -43.5)
+        ax.set_ylim(-22.4, -21.2)
 
-    plt.savefig(os.path.join(IMAGES_DIR, "interpolacao.png"))
+    fig.savefig(os.path.join(IMAGES_DIR, "interpolacao.png"))
 
     return fig
 
 
-def result_figure(result: List[float]) -> Figure:
+@profiled(rows=None)
+def result_figure(result: Union[pd.Series, List[float]]) -> Figure:
     """
     Cria uma figura que representa o resultado final da previsão de precipitação.
 
     Args:
-        result (List[float]): Uma lista contendo os valores de precipitação para cada dia.
+        result (Union[pd.Series, List[float]]): Os valores de precipitação de cada dia,
+            indexados pelas datas de previsão. Sem datas, os dias são numerados.
 
     Returns:
-        plt.Figure: Uma instância da figura gerada.
+        Figure: Uma instância da figura gerada.
     """
     # Strings para o eixo X
-    labels = [
-        "02/dez",
-        "03/dez",
-        "04/dez",
-        "05/dez",
-        "06/dez",
-        "07/dez",
-        "08/dez",
-        "09/dez",
-        "10/dez",
-        "11/dez",
-    ]
+    if isinstance(result, pd.Series) and isinstance(result.index, pd.DatetimeIndex):
+        labels = date_labels(result.index)
+    else:
+        labels = [f"Dia {day}" for day in range(1, len(result) + 1)]
+    result = np.asarray(result, dtype=np.float64)
 
     # Criar Figura
-    fig, ax1 = plt.subplots(figsize=(13.5, 6))
+    fig = Figure(figsize=(13.5, 6))
+    ax1 = fig.subplots()
 
     # Gráfico de barras
     bars = ax1.bar(labels, result, color="#0A1E8C", label="Previsão Diária")
@@ -219,18 +279,17 @@ def result_figure(result: List[float]) -> Figure:
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax2.legend(lines + lines2, labels + labels2, loc="upper left")
 
-    plt.title("Previsão de precipitação - Bacia Rio Grande")
+    ax2.set_title("Previsão de precipitação - Bacia Rio Grande")
 
     # Coordenadas para posicionar a imagem no centro
     img_x = 615
     img_y = 475
 
     # BTG Logo
-    img = mpimg.imread(os.path.join(IMAGES_DIR, "btg.png"))
-    plt.figimage(img, xo=img_x, yo=img_y, alpha=0.7)
+    fig.figimage(_logo(), xo=img_x, yo=img_y, alpha=0.7)
 
-    plt.tight_layout()
-    plt.savefig(os.path.join(IMAGES_DIR, "result.png"))
+    fig.tight_layout()
+    fig.savefig(os.path.join(IMAGES_DIR, "result.png"))
     return fig
 
 
@@ -239,10 +298,14 @@ def figures_to_readme() -> None:
     Gera e exibe figuras relevantes para inclusão no arquivo README.
     Realiza a leitura do arquivo de contorno, leitura dos arquivos de previsão,
     aplicação do contorno aos dados de previsão, transformação dos dados e geração de figuras de visualização.
+
+    Uso (a partir da raiz do projeto):
+        python utils/plotter.py
+        python -m utils.plotter
     """
 
-    from data_reader import read_contour_file, multithreading_reader_dat_file
-    from preprocess import apply_contour, transform_data
+    from utils.data_reader import read_contour_file, multithreading_reader_dat_file
+    from utils.preprocess import apply_contour, transform_data
 
     contour = (
         read_contour_file(file_path=os.path.join(DATA_DIR, "PSATCMG_CAMARGOS.bln")),
@@ -253,9 +316,20 @@ def figures_to_readme() -> None:
 
     df_transformed = transform_data(df)
 
-    contour_figure(data=contour)
-    apply_contour_figure(data=df)
-    interpolation_figure(data=df_transformed)
+    # As três figuras são independentes: geradas em paralelo pelo pool de renderização
+    from utils.render import start_render_pool, submit_figure
+
+    render_pool = start_render_pool(max_workers=3)
+    try:
+        figures = [
+            submit_figure(render_pool, "contour_figure", contour),
+            submit_figure(render_pool, "apply_contour_figure", df),
+            submit_figure(render_pool, "interpolation_figure", df_transformed),
+        ]
+        for figure in figures:
+            print(f"Figura: {figure.result()}")
+    finally:
+        render_pool.shutdown()
 
 
 if __name__ == "__main__":
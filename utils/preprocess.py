@@ -1,149 +1,121 @@
 import os
-import sys
-from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Point
+
+from utils.forecast_cube import ForecastCube
+from utils.profiler import profiled
+from utils.spatial import ContourGridIndex, derive_polygon_order
 
 # Varíaveis globais
 FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
 BASE_DIR: str = os.path.dirname(FILE_DIR)
 DATA_DIR: str = os.path.join(BASE_DIR, "data")
 
-# Dados obetidos através do estudo de contorno, conforme a image 'contorno.png'
-POLYGONAL_ORDER = [
-    (-44.6, -22.2),
-    (-44.6, -21.8),
-    (-44.6, -21.4),
-    (-44.2, -21.4),
-    (-43.8, -21.4),
-    (-43.8, -21.8),
-    (-44.2, -21.8),
-    (-44.2, -22.2),
-]
-
 
-def _create_geometry_column(df: pd.DataFrame) -> List[Point]:
+@profiled()
+def apply_contour(
+    contour_df: pd.DataFrame,
+    forecast_df: Union[pd.DataFrame, ForecastCube],
+    index: Optional[ContourGridIndex] = None,
+) -> pd.DataFrame:
     """
-    Cria uma lista de objetos Point do módulo shapely.geometry a partir das colunas "lat" e "long" de um DataFrame.
+    Realiza uma rotina de pré-processamento que associa cada vértice do contorno da bacia
+    hidrográfica ao ponto mais próximo da grade de previsão e ajusta as colunas.
+
+    A associação é feita por um ContourGridIndex (KD-tree sobre a grade), construído uma
+    única vez por contorno; a aplicação a cada arquivo de previsão é apenas uma seleção
+    de arrays, sem objetos Python por linha.
 
     Args:
-        df (pd.DataFrame): O DataFrame contendo as colunas "lat" e "long" que representam as coordenadas.
+        contour_df (pd.DataFrame): O DataFrame com as coordenadas do contorno.
+        forecast_df (Union[pd.DataFrame, ForecastCube]): Os dados de previsão, no formato
+            longo (colunas "lat", "long", "data_value" e "file_path") ou como ForecastCube.
+        index (Optional[ContourGridIndex]): Índice pré-calculado do contorno sobre a grade
+            da previsão. Se None, o índice é construído.
 
     Returns:
-        List[Point]: Uma lista de objetos Point criados a partir das coordenadas.
+        pd.DataFrame: O DataFrame resultante após a junção e ajustes. A coluna
+        "codigo_arquivo" é a linha do arquivo de origem na tabela de metadados
+        (ver ``forecast_file_table``) e "data_previsao" é a data prevista (datetime64).
 
     Raises:
-        ValueError: Se as colunas "lat" ou "long" não estiverem presentes no DataFrame.
+        ValueError: Se algum nome de arquivo não seguir o padrão dos arquivos de previsão.
 
     Example:
-        df = pd.DataFrame({
-            "lat": [latitude_1, latitude_2, latitude_3],
-            "long": [longitude_1, longitude_2, longitude_3]
-        })
-        geometry_list = _create_geometry_column(df)
-    """
-    columns = df.columns
-    if not "lat" in columns:
-        raise ValueError(
-            "O dataframe repassado como argumento não contém a coluna latitude 'lat'"
-        )
-
-    if not "long" in columns:
-        raise ValueError(
-            "O dataframe repassado como argumento não contém a coluna longitude 'long'"
-        )
+        contour = read_contour_file("PSATCMG_CAMARGOS.bln")
+        forecast = read_forecast_cube(DATA_DIR)
 
-    return [Point(xy) for xy in zip(df["lat"], df["long"])]
-
-
-def _format_date(string):
-    # Função para extrair e formatar a data
-
-    # Extrai a parte da string com a data (061221)
-    date_part = string[-10:-4]
+        preprocessed_data = apply_contour(contour, forecast)
+    """
+    if isinstance(forecast_df, ForecastCube):
+        cube = forecast_df
+    else:
+        cube = ForecastCube.from_long_dataframe(forecast_df)
+
+    if index is None:
+        index = ContourGridIndex.from_cube(contour_df, cube)
+
+    n_vertices = len(contour_df)
+    n_dates = cube.n_dates
+
+    # Uma linha por vértice do contorno e arquivo de previsão
+    vertex_rows = np.repeat(np.arange(n_vertices), n_dates)
+    grid_rows = index.grid_indices[vertex_rows]
+    date_rows = np.tile(np.arange(n_dates), n_vertices)
+
+    # Metadados extraídos uma única vez por arquivo e associados às linhas pelo código
+    files = cube.file_table()
+
+    result = pd.DataFrame(
+        {
+            "lat_referencia": contour_df["lat"].to_numpy()[vertex_rows],
+            "long_referencia": contour_df["long"].to_numpy()[vertex_rows],
+            "lat_aproximacao": cube.lat[grid_rows],
+            "long_aproximacao": cube.long[grid_rows],
+            "data_value": index.gather(cube.values)[date_rows, vertex_rows],
+            "distance": index.distance[vertex_rows],
+            "codigo_arquivo": date_rows,
+            "data_previsao": files["data_previsao"].to_numpy()[date_rows],
+        },
+        index=contour_df.index[vertex_rows],
+    )
 
-    # Converte a string em objeto de data
-    date_object = datetime.strptime(date_part, "%d%m%y")
+    # Parte de cada vértice em contornos com várias partes (ver ``derive_polygon_order``)
+    if "parte" in contour_df.columns:
+        result["parte"] = contour_df["parte"].to_numpy()[vertex_rows]
 
-    # Formata a data como '06/12/21'
-    formatted_date = date_object.strftime("%d/%m/%y")
-    return formatted_date
+    return result
 
 
-def apply_contour(
-    contour_df: pd.DataFrame,
-    forecast_df: pd.DataFrame,
+@profiled()
+def transform_data(
+    data: pd.DataFrame, polygon_order: Optional[List[Tuple[float, float]]] = None
 ) -> pd.DataFrame:
     """
-    Realiza uma rotina de pré-processamento que inclui a leitura do arquivo de contorno
-    da bacia hidrográfica, a conversão de DataFrames em GeoDataFrames, a junção por proximidade e ajustes nas colunas.
+    Realiza transformações específicas nos dados
 
     Args:
-        contour_file_path (str): O caminho para o arquivo de contorno.
-        forecast_df (pd.DataFrame): O DataFrame contendo os dados de previsão.
+        data (pd.DataFrame): O DataFrame resultante de ``apply_contour``.
+        polygon_order (Optional[List[Tuple[float, float]]]): Ordem poligonal dos pontos da
+            grade da bacia. Se None, a ordem é derivada do percurso do contorno em ``data``
+            (ver ``derive_polygon_order``).
 
     Returns:
-        pd.DataFrame: O DataFrame resultante após a junção e ajustes.
+        pd.DataFrame: O DataFrame com os pontos da bacia na ordem do polígono.
 
     Raises:
-        ValueError: Se o arquivo de contorno não existir.
-
-    Example:
-        contour_path = "PSATCMG_CAMARGOS.bln"
-
-        # Seus dados de previsão
-        forecast_data = pd.DataFrame(...)
-
-        preprocessed_data = preprocess_routine(contour_path, forecast_data)
+        ValueError: Se algum ponto dos dados não fizer parte de ``polygon_order``.
     """
-
-    # Converter 'pandas.DataFrame' em 'GeoDataFrame'
-    gcontour_df = gpd.GeoDataFrame(
-        contour_df, geometry=_create_geometry_column(contour_df)
-    )
-    gforecast_df = gpd.GeoDataFrame(
-        forecast_df, geometry=_create_geometry_column(forecast_df)
-    )
-
-    # Realizar a junção usando o método sjoin_nearest com base na coluna rounded_geometry
-    result = gpd.sjoin_nearest(
-        left_df=gcontour_df,
-        right_df=gforecast_df,
-        how="left",
-        distance_col="distance",
-        max_distance=sys.maxsize,
-    )
-
-    # Renomear colunas
-    result.rename(
-        columns={
-            "lat_left": "lat_referencia",
-            "long_left": "long_referencia",
-            "lat_right": "lat_aproximacao",
-            "long_right": "long_aproximacao",
-        },
-        inplace=True,
-    )
-
-    # Aplica a função para criar uma nova coluna 'formatted_date'
-    result["data_previsao"] = result["file_path"].apply(_format_date)
-
-    # retirar colunas não utilizadas
-    result.drop(columns=["index_right", "file_path"], inplace=True)
-
-    # Converter o GeoDataFrame para um DataFrame do pandas
-    # Remover a coluna de geometria
-    df_without_geometry = result.drop("geometry", axis=1)
-    pandas_df = df_without_geometry.copy()
-
-    return pandas_df
-
-
-def transform_data(data: pd.DataFrame) -> pd.DataFrame:
-    """Realiza transformações específicas nos dados"""
+    if polygon_order is None:
+        # As linhas de 'apply_contour' são indexadas pelo vértice do contorno
+        traversal = data.sort_index(kind="stable")
+        polygon_order = derive_polygon_order(
+            traversal["lat_aproximacao"].to_numpy(),
+            traversal["long_aproximacao"].to_numpy(),
+            traversal["parte"].to_numpy() if "parte" in traversal.columns else None,
+        )
 
     # Cópia do dataframe para variável 'df'
     df = data.copy()
@@ -153,10 +125,10 @@ def transform_data(data: pd.DataFrame) -> pd.DataFrame:
         :, ["lat_aproximacao", "long_aproximacao", "data_value", "data_previsao"]
     ].copy()
 
-    # Retirada de linhas duplicadas em um determinado ponto com os
-    # mesmos valores de precipitação
+    # Retirada de linhas duplicadas em um determinado ponto e data de previsão
+    # (vários vértices do contorno associados ao mesmo ponto da grade)
     df.drop_duplicates(
-        subset=["lat_aproximacao", "long_aproximacao", "data_value"], inplace=True
+        subset=["lat_aproximacao", "long_aproximacao", "data_previsao"], inplace=True
     )
 
     # Ordena o dataframe com base nas localizações e a data de previsão
@@ -167,18 +139,18 @@ def transform_data(data: pd.DataFrame) -> pd.DataFrame:
     # Resetar os índices
     df.reset_index(drop=True, inplace=True)
 
-    # Criar uma coluna que represente a ordem específica do polígono
-    df["ordem"] = df.apply(
-        lambda row: POLYGONAL_ORDER.index(
-            (row["lat_aproximacao"], row["long_aproximacao"])
-        ),
-        axis=1,
+    # Criar uma coluna que represente a ordem específica do polígono,
+    # por junção com a tabela (ponto -> posição no polígono)
+    order = pd.DataFrame(polygon_order, columns=["lat_aproximacao", "long_aproximacao"])
+    order["ordem"] = np.arange(len(order))
+    df = df.merge(
+        order, how="left", on=["lat_aproximacao", "long_aproximacao"], validate="m:1"
     )
 
-    # Ordenar o DataFrame pela coluna 'ordem' e, em seguida, remover a coluna 'ordem'
-    df_ordenado = df.sort_values(by="ordem").drop("ordem", axis=1)
+    if df["ordem"].isna().any():
+        raise ValueError("Existem pontos nos dados que não pertencem à ordem poligonal")
 
-    # df assume a ordenação
-    df = df_ordenado.copy()
+    # Ordenar o DataFrame pela coluna 'ordem' e, em seguida, remover a coluna 'ordem'
+    df = df.sort_values(by="ordem", kind="stable").drop("ordem", axis=1)
 
     return df
@@ -0,0 +1,278 @@
+import os
+import csv
+import sys
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional
+
+# Formatos de relatório suportados, pela extensão do arquivo
+REPORT_FORMATS = (".json", ".csv")
+
+
+@dataclass
+class StageStats(object):
+    """
+    Medidas acumuladas de uma etapa do pipeline.
+
+    Attributes:
+        name (str): Nome da etapa.
+        calls (int): Número de execuções da etapa.
+        wall_time (float): Tempo de relógio total, em segundos.
+        cpu_time (float): Tempo de CPU total do processo, em segundos.
+        peak_memory (Optional[int]): Maior pico de memória alocada pela etapa, em bytes
+            (apenas com ``trace_memory``).
+        rows (Optional[int]): Total de linhas produzidas pela etapa, quando informado.
+    """
+
+    name: str
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: Optional[int] = None
+    rows: Optional[int] = None
+
+
+class StageRecord(object):
+    """
+    Registro de uma execução de etapa, retornado por ``stage`` para informar o número de linhas.
+
+    Attributes:
+        rows (Optional[int]): Número de linhas produzidas pela execução.
+    """
+
+    __slots__ = ("rows",)
+
+    def __init__(self) -> None:
+        self.rows: Optional[int] = None
+
+
+class StageProfiler(object):
+    """
+    Registro de tempos por etapa do pipeline (tempo de relógio, tempo de CPU, pico de
+    memória e número de linhas).
+
+    As etapas são marcadas com o gerenciador de contexto ``stage`` ou com o decorador
+    ``profiled`` e as medidas são acumuladas por nome. Desativado, cada etapa custa apenas
+    uma verificação; ativado, duas leituras de relógio, o que permite mantê-lo ligado em
+    produção. O pico de memória usa ``tracemalloc``, cujo custo é alto, e por isso só é
+    medido com ``trace_memory=True``.
+
+    Etapas podem ser aninhadas; o tempo e a memória de uma etapa incluem os das etapas
+    internas. Etapas executadas em outros processos não são registradas.
+
+    O tempo é registrado por thread, mas o pico de memória do ``tracemalloc`` é global ao
+    processo: com etapas simultâneas em várias threads, os picos medidos misturam as
+    alocações de todas elas. Por isso ``trace_memory`` só é confiável em execução serial.
+
+    Args:
+        enabled (bool): Se False, nenhuma medida é registrada.
+        trace_memory (bool): Se True, mede o pico de memória de cada etapa com tracemalloc.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False) -> None:
+        """
+        Inicializa o registro vazio.
+        """
+        self.enabled = False
+        self.trace_memory = False
+        self.stats: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if enabled:
+            self.start(trace_memory=trace_memory)
+
+    def start(self, trace_memory: bool = False) -> None:
+        """
+        Ativa o registro das etapas.
+
+        Args:
+            trace_memory (bool): Se True, mede o pico de memória de cada etapa com tracemalloc.
+        """
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Desativa o registro das etapas, mantendo as medidas já feitas."""
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def reset(self) -> None:
+        """Descarta as medidas registradas."""
+        with self._lock:
+            self.stats = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """
+        Mede a execução de um bloco como a etapa ``name``.
+
+        Example:
+            with profiler.stage("transform_data") as record:
+                df = transform_data(df)
+                record.rows = len(df)
+
+        Args:
+            name (str): Nome da etapa.
+
+        Yields:
+            StageRecord: Registro onde o número de linhas pode ser informado.
+        """
+        record = StageRecord()
+        if not self.enabled:
+            yield record
+            return
+
+        trace_memory = self.trace_memory and tracemalloc.is_tracing()
+        if trace_memory:
+            # Pilha de (memória no início, maior pico absoluto das etapas internas)
+            stack = self._memory_stack()
+            current, peak = tracemalloc.get_traced_memory()
+
+            # O pico da etapa externa até aqui seria perdido com o reset_peak
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            stack.append([current, 0])
+            tracemalloc.reset_peak()
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.process_time() - cpu_start
+
+            peak_memory = None
+            if trace_memory:
+                start_memory, inner_peak = stack.pop()
+                absolute_peak = max(tracemalloc.get_traced_memory()[1], inner_peak)
+                peak_memory = absolute_peak - start_memory
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], absolute_peak)
+
+            self._add(name, wall_time, cpu_time, peak_memory, record.rows)
+
+    def _memory_stack(self) -> List[List[int]]:
+        """Pilha de etapas abertas da thread atual, usada para o pico de memória."""
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _add(
+        self,
+        name: str,
+        wall_time: float,
+        cpu_time: float,
+        peak_memory: Optional[int],
+        rows: Optional[int],
+    ) -> None:
+        """Acumula as medidas de uma execução na etapa ``name``."""
+        with self._lock:
+            stats = self.stats.setdefault(name, StageStats(name))
+            stats.calls += 1
+            stats.wall_time += wall_time
+            stats.cpu_time += cpu_time
+            if peak_memory is not None:
+                stats.peak_memory = max(stats.peak_memory or 0, peak_memory)
+            if rows is not None:
+                stats.rows = (stats.rows or 0) + rows
+
+    def report(self, file_path: str) -> None:
+        """
+        Grava as medidas em um arquivo JSON ou CSV, conforme a extensão.
+
+        Args:
+            file_path (str): Caminho do relatório (.json ou .csv).
+
+        Raises:
+            ValueError: Se a extensão do arquivo não for suportada.
+        """
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension not in REPORT_FORMATS:
+            raise ValueError(
+                f"Formato de relatório '{extension}' inválido, utilize um de {REPORT_FORMATS}"
+            )
+
+        with self._lock:
+            rows = [asdict(stats) for stats in self.stats.values()]
+
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
+
+        if extension == ".json":
+            report = {
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "argv": sys.argv,
+                "trace_memory": self.trace_memory,
+                "stages": rows,
+            }
+            with open(file_path, "w") as f:
+                json.dump(report, f, indent=2)
+        else:
+            with open(file_path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(StageStats.__annotations__))
+                writer.writeheader()
+                writer.writerows(rows)
+
+
+def _count_rows(result: Any) -> Optional[int]:
+    """Número de linhas de um resultado com ``len`` (DataFrame, array, lista), senão None."""
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+# Registro global utilizado por ``stage`` e ``profiled`` (desativado por padrão)
+PROFILER = StageProfiler()
+
+
+def stage(name: str) -> ContextManager[StageRecord]:
+    """Mede um bloco como a etapa ``name`` no registro global (ver ``StageProfiler.stage``)."""
+    return PROFILER.stage(name)
+
+
+def profiled(
+    name: Optional[str] = None,
+    rows: Optional[Callable[[Any], Optional[int]]] = _count_rows,
+) -> Callable:
+    """
+    Decorador que mede cada chamada da função como uma etapa do registro global.
+
+    Args:
+        name (Optional[str]): Nome da etapa. Padrão: o nome da função.
+        rows (Optional[Callable[[Any], Optional[int]]]): Função que calcula o número de
+            linhas a partir do retorno. Padrão: ``len`` do retorno, se houver.
+
+    Returns:
+        Callable: O decorador.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        stage_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+
+            with PROFILER.stage(stage_name) as record:
+                result = function(*args, **kwargs)
+                if rows is not None:
+                    record.rows = rows(result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,76 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+# Varíaveis globais
+FILE_DIR: str = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR: str = os.path.dirname(FILE_DIR)
+IMAGES_DIR: str = os.path.join(BASE_DIR, "images")
+
+# Arquivo gerado por cada função de ``utils.plotter``
+FIGURE_FILES = {
+    "contour_figure": "bacia_rio_grande.png",
+    "apply_contour_figure": "contorno.png",
+    "interpolation_figure": "interpolacao.png",
+    "result_figure": "result.png",
+}
+
+
+def _warm_up() -> None:
+    """Importa o matplotlib e o ``utils.plotter`` no processo de renderização."""
+    import utils.plotter  # noqa: F401
+
+
+def _render(figure: str, *args) -> str:
+    """
+    Gera uma figura de ``utils.plotter`` no processo de renderização.
+
+    Returns:
+        str: O caminho do arquivo gerado.
+    """
+    from utils import plotter
+
+    getattr(plotter, figure)(*args)
+    return os.path.join(IMAGES_DIR, FIGURE_FILES[figure])
+
+
+def start_render_pool(max_workers: Optional[int] = 1) -> ProcessPoolExecutor:
+    """
+    Cria o pool de processos de renderização das figuras.
+
+    Os processos importam o matplotlib ao iniciar: criado antes do cálculo, o pool faz
+    essa importação em paralelo, e o processo principal nunca importa o matplotlib.
+
+    Args:
+        max_workers (Optional[int]): Número de processos de renderização.
+
+    Returns:
+        ProcessPoolExecutor: O pool, a ser finalizado com ``shutdown``.
+    """
+    pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_up)
+
+    # Inicia os processos imediatamente, e não apenas na primeira figura
+    pool.submit(_warm_up)
+    return pool
+
+
+def submit_figure(pool: ProcessPoolExecutor, figure: str, *args) -> Future:
+    """
+    Agenda a geração de uma figura em segundo plano.
+
+    Args:
+        pool (ProcessPoolExecutor): O pool de renderização (ver ``start_render_pool``).
+        figure (str): Nome da função de ``utils.plotter`` (ex.: "result_figure").
+        *args: Argumentos da função.
+
+    Returns:
+        Future: Futuro com o caminho do arquivo gerado.
+
+    Raises:
+        ValueError: Se a figura não existir.
+    """
+    if figure not in FIGURE_FILES:
+        raise ValueError(
+            f"Figura '{figure}' inválida, utilize uma de {tuple(FIGURE_FILES)}"
+        )
+    return pool.submit(_render, figure, *args)
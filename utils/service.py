@@ -0,0 +1,236 @@
+import os
+import asyncio
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.data_reader import _grid_digest, read_contour_file, read_dat_file_subset
+from utils.forecast_cube import ForecastCube
+from utils.incremental import STATE_PATH, IncrementalPipeline
+from utils.model import PrecipitationModel
+from utils.preprocess import apply_contour, transform_data
+from utils.spatial import ContourGridIndex, contour_bounding_box
+
+# Intervalo padrão, em segundos, entre duas varreduras da pasta de previsões
+POLL_INTERVAL: float = 1.0
+
+logger = logging.getLogger(__name__)
+
+# Estado mantido em memória por cada processo de trabalho (ver ``_init_worker``)
+_WORKER_STATE: Dict[str, object] = {}
+
+
+def _init_worker(contour_path: str) -> None:
+    """
+    Inicializa um processo de trabalho: lê o contorno e calcula seu retângulo envolvente
+    uma única vez por processo.
+
+    O índice do contorno sobre a grade e as triangulações/pesos de ``utils.model`` ficam
+    em memória no processo entre um arquivo e outro.
+    """
+    _WORKER_STATE.clear()
+    _WORKER_STATE["contour"] = read_contour_file(contour_path)
+    _WORKER_STATE["bbox"] = contour_bounding_box(_WORKER_STATE["contour"])
+
+
+def _worker_index(cube: ForecastCube, digest: str) -> ContourGridIndex:
+    """Índice do contorno sobre a grade da previsão, reconstruído apenas se a grade mudar."""
+    if _WORKER_STATE.get("grid_digest") != digest:
+        _WORKER_STATE["index"] = ContourGridIndex.from_cube(
+            _WORKER_STATE["contour"], cube
+        )
+        _WORKER_STATE["grid_digest"] = digest
+    return _WORKER_STATE["index"]
+
+
+def score_forecast_file(file_path: str) -> Tuple[pd.Timestamp, float]:
+    """
+    Calcula o resultado diário de um arquivo de previsão em um processo de trabalho.
+
+    Args:
+        file_path (str): Caminho do arquivo .dat.
+
+    Returns:
+        Tuple[pd.Timestamp, float]: A data de previsão e a precipitação diária da bacia.
+    """
+    # Apenas os pontos próximos à bacia são lidos
+    data = read_dat_file_subset(file_path, bbox=_WORKER_STATE["bbox"])
+    cube = ForecastCube(
+        lat=data[:, 0], long=data[:, 1], values=data[None, :, 2], file_paths=[file_path]
+    )
+    index = _worker_index(cube, _grid_digest(data))
+
+    df = transform_data(
+        apply_contour(_WORKER_STATE["contour"], cube, index=index),
+        polygon_order=index.polygon_order,
+    )
+    date = df["data_previsao"].iloc[0]
+    return date, float(PrecipitationModel(data=df).predict_many([date])[0])
+
+
+class ForecastService(object):
+    """
+    Serviço de longa duração que observa a pasta de previsões e processa os arquivos novos.
+
+    A cada ``poll_interval`` segundos a pasta é varrida em um laço asyncio. Os arquivos
+    novos ou alterados (segundo o estado do ``IncrementalPipeline``) são processados em
+    um pool de processos via ``loop.run_in_executor``. Cada processo lê o contorno uma única
+    vez e mantém em memória o índice do contorno, as triangulações e os pesos de
+    interpolação, de modo que um arquivo novo custa apenas a leitura e a predição.
+
+    Um arquivo só é processado quando seu mtime e tamanho não mudam entre duas varreduras
+    consecutivas, para não ler arquivos que ainda estão sendo copiados. Arquivos com erro
+    são registrados no log e tentados novamente na próxima alteração.
+
+    O pool de processos é criado na primeira varredura com arquivos a processar e
+    encerrado por ``close`` (chamado ao fim de ``run``); ``scan_once`` também pode ser
+    usado diretamente, sem ``run``.
+
+    Args:
+        contour_path (str): Caminho do arquivo .bln do contorno da bacia.
+        folder_path (str): Pasta observada com os arquivos de previsão.
+        pattern (str): Padrão glob dos arquivos de previsão.
+        poll_interval (float): Intervalo, em segundos, entre as varreduras.
+        max_workers (Optional[int]): Número de processos de trabalho (padrão do ProcessPoolExecutor se None).
+        state_path (str): Caminho do arquivo JSON de estado do pipeline incremental.
+        on_result (Optional[Callable[[pd.DataFrame], None]]): Função chamada com o resultado
+            acumulado (ver ``IncrementalPipeline.result``) sempre que novos arquivos são processados.
+    """
+
+    def __init__(
+        self,
+        contour_path: str,
+        folder_path: str,
+        pattern: str = "*.dat",
+        poll_interval: float = POLL_INTERVAL,
+        max_workers: Optional[int] = None,
+        state_path: str = STATE_PATH,
+        on_result: Optional[Callable[[pd.DataFrame], None]] = None,
+    ) -> None:
+        """
+        Inicializa o serviço e carrega o estado do pipeline incremental.
+        """
+        self.contour_path = contour_path
+        self.folder_path = folder_path
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.max_workers = max_workers
+        self.on_result = on_result
+
+        self.pipeline = IncrementalPipeline(
+            read_contour_file(contour_path), state_path=state_path
+        )
+        self._stat: Dict[str, Tuple[int, int]] = {}
+        self._failed: Dict[str, Tuple[int, int]] = {}
+        self._executor: Optional[Executor] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    def _settled(self, file_paths: List[str]) -> List[str]:
+        """Seleciona os arquivos cujo mtime e tamanho não mudaram desde a varredura anterior."""
+        previous, self._stat = self._stat, {}
+        settled = []
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            self._stat[file_path] = (stat.st_mtime_ns, stat.st_size)
+            if self._failed.get(file_path) == self._stat[file_path]:
+                continue
+            if previous.get(file_path) == self._stat[file_path]:
+                settled.append(file_path)
+        return settled
+
+    def _pool(self) -> Executor:
+        """Pool de processos de trabalho, criado (e inicializado) no primeiro uso."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.contour_path,),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Encerra o pool de processos de trabalho, se tiver sido criado."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pending(self) -> List[str]:
+        """Arquivos novos ou alterados e já completos (lê e calcula o hash dos arquivos)."""
+        return self._settled(
+            self.pipeline.pending_files(self.folder_path, self.pattern)
+        )
+
+    def _record(self, pending: List[str], results: List[Any]) -> int:
+        """Registra os resultados no pipeline e grava o estado (calcula o hash dos arquivos)."""
+        processed = 0
+        for file_path, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.error("Falha ao processar %s: %s", file_path, result)
+                self._failed[file_path] = self._stat[file_path]
+                continue
+            self.pipeline.record(file_path, *result)
+            processed += 1
+
+        if processed:
+            self.pipeline.save()
+        return processed
+
+    async def scan_once(self) -> int:
+        """
+        Varre a pasta uma vez e processa os arquivos novos que já estão completos.
+
+        A listagem, o hash dos arquivos e a gravação do estado são feitos em uma thread,
+        para não bloquear o laço de eventos (e seus timers) em pastas grandes. Fora de
+        ``run``, chame ``close`` ao terminar para encerrar o pool de processos.
+
+        Returns:
+            int: O número de arquivos processados com sucesso.
+        """
+        loop = asyncio.get_running_loop()
+        pending = await asyncio.to_thread(self._pending)
+        if not pending:
+            return 0
+
+        executor = self._pool()
+        results = await asyncio.gather(
+            *[
+                loop.run_in_executor(executor, score_forecast_file, file_path)
+                for file_path in pending
+            ],
+            return_exceptions=True,
+        )
+
+        processed = await asyncio.to_thread(self._record, pending, results)
+        if processed and self.on_result is not None:
+            self.on_result(
+                await asyncio.to_thread(self.pipeline.result, self.folder_path)
+            )
+
+        return processed
+
+    async def run(self) -> None:
+        """
+        Executa o laço de varredura até que ``stop`` seja chamado e encerra o pool.
+        """
+        self._stop = asyncio.Event()
+        try:
+            while not self._stop.is_set():
+                await self.scan_once()
+                try:
+                    await asyncio.wait_for(
+                        self._stop.wait(), timeout=self.poll_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await asyncio.to_thread(self.close)
+
+    def stop(self) -> None:
+        """Solicita o fim do laço de varredura após a varredura em andamento."""
+        if self._stop is not None:
+            self._stop.set()
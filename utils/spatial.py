@@ -0,0 +1,326 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from utils.forecast_cube import ForecastCube
+
+# Espaçamento, em graus, da grade do modelo ETA40
+GRID_SPACING = 0.4
+
+
+class ContourGridIndex(object):
+    """
+    Índice que associa cada vértice de um contorno ao ponto mais próximo da grade de previsão.
+
+    A associação depende apenas do contorno e da grade, portanto é construída uma única
+    vez (com uma KD-tree sobre os pontos da grade) e reaproveitada para qualquer previsão
+    que compartilhe a mesma grade. Aplicá-la a uma previsão é um simples ``take`` de arrays.
+
+    Em caso de empate (vértice equidistante de dois pontos da grade), apenas um dos
+    pontos é associado ao vértice.
+
+    Args:
+        contour (pd.DataFrame): DataFrame com as colunas "lat" e "long" dos vértices do contorno.
+        grid_lat (np.ndarray): Array 1D com as latitudes dos pontos da grade.
+        grid_long (np.ndarray): Array 1D com as longitudes dos pontos da grade.
+        tree (Optional[cKDTree]): KD-tree já construída sobre a grade, para compartilhá-la
+            entre vários contornos. Se None, a KD-tree é construída.
+
+    Attributes:
+        contour (pd.DataFrame): Os vértices do contorno.
+        grid_lat (np.ndarray): Latitudes dos pontos da grade.
+        grid_long (np.ndarray): Longitudes dos pontos da grade.
+        grid_indices (np.ndarray): Índice, na grade, do ponto mais próximo de cada vértice.
+        distance (np.ndarray): Distância de cada vértice ao ponto da grade associado.
+    """
+
+    def __init__(
+        self,
+        contour: pd.DataFrame,
+        grid_lat: np.ndarray,
+        grid_long: np.ndarray,
+        tree: Optional[cKDTree] = None,
+    ) -> None:
+        """
+        Constrói o índice consultando a KD-tree da grade com todos os vértices do contorno.
+        """
+        _check_contour_columns(contour)
+
+        self.contour = contour
+        self.grid_lat = np.asarray(grid_lat)
+        self.grid_long = np.asarray(grid_long)
+
+        if tree is None:
+            tree = build_grid_tree(self.grid_lat, self.grid_long)
+
+        self.distance, self.grid_indices = tree.query(
+            contour.loc[:, ["lat", "long"]].to_numpy(), k=1
+        )
+
+    @classmethod
+    def from_cube(
+        cls,
+        contour: pd.DataFrame,
+        cube: ForecastCube,
+        tree: Optional[cKDTree] = None,
+    ) -> "ContourGridIndex":
+        """
+        Constrói o índice para a grade de um ForecastCube.
+        """
+        return cls(contour, cube.lat, cube.long, tree=tree)
+
+    @classmethod
+    def from_cube_many(
+        cls, contours: Dict[str, pd.DataFrame], cube: ForecastCube
+    ) -> Dict[str, "ContourGridIndex"]:
+        """
+        Constrói os índices de vários contornos sobre a mesma grade, compartilhando uma
+        única KD-tree entre todos eles.
+
+        Args:
+            contours (Dict[str, pd.DataFrame]): Contornos indexados pelo nome da bacia.
+            cube (ForecastCube): A previsão cuja grade será indexada.
+
+        Returns:
+            Dict[str, ContourGridIndex]: Os índices, com as mesmas chaves de ``contours``.
+        """
+        tree = build_grid_tree(cube.lat, cube.long)
+
+        return {
+            name: cls.from_cube(contour, cube, tree=tree)
+            for name, contour in contours.items()
+        }
+
+    @property
+    def polygon_order(self) -> List[Tuple[float, float]]:
+        """
+        Pontos da grade associados ao contorno, na ordem de percurso do polígono.
+
+        Os pontos são listados sem repetição, na ordem em que o contorno os visita a partir
+        do primeiro vértice, com orientação normalizada para o sentido horário no plano
+        (lat, long), que é a convenção da ordem poligonal estudada em 'contorno.png'.
+
+        Returns:
+            List[Tuple[float, float]]: As coordenadas (lat, long) dos pontos, em ordem.
+        """
+        cells = self.grid_indices
+        parts = (
+            self.contour["parte"].to_numpy()
+            if "parte" in self.contour.columns
+            else None
+        )
+        return derive_polygon_order(self.grid_lat[cells], self.grid_long[cells], parts)
+
+    def gather(self, values: np.ndarray) -> np.ndarray:
+        """
+        Seleciona, para cada vértice do contorno, o valor do ponto da grade associado.
+
+        Args:
+            values (np.ndarray): Array (..., n_points) com valores sobre a grade.
+
+        Returns:
+            np.ndarray: Array (..., n_vertices) com os valores associados aos vértices.
+        """
+        return np.take(values, self.grid_indices, axis=-1)
+
+
+def _check_contour_columns(contour: pd.DataFrame) -> None:
+    """Verifica se o contorno possui as colunas "lat" e "long"."""
+    for column in ("lat", "long"):
+        if column not in contour.columns:
+            raise ValueError(f"O dataframe de contorno não contém a coluna '{column}'")
+
+
+def contour_part_offsets(contour: pd.DataFrame) -> np.ndarray:
+    """
+    Início de cada parte de um contorno, seguido do número de vértices.
+
+    As partes são os trechos contíguos com o mesmo valor da coluna "parte" (ver
+    ``read_contour_file``); sem essa coluna, o contorno tem uma única parte.
+
+    Args:
+        contour (pd.DataFrame): DataFrame com os vértices do contorno.
+
+    Returns:
+        np.ndarray: Array (n_partes + 1,) de int64 com os offsets das partes.
+    """
+    if "parte" not in contour.columns:
+        return np.array([0, len(contour)], dtype=np.int64)
+
+    starts = np.flatnonzero(np.diff(contour["parte"].to_numpy())) + 1
+    return np.concatenate([[0], starts, [len(contour)]]).astype(np.int64)
+
+
+def contour_bounding_box(
+    contour: pd.DataFrame, margin: float = GRID_SPACING
+) -> Tuple[float, float, float, float]:
+    """
+    Retângulo envolvente dos vértices de um contorno, ampliado por uma margem.
+
+    Com margem de pelo menos meio espaçamento da grade, o ponto da grade mais próximo de
+    cada vértice está dentro do retângulo; o padrão (um espaçamento) dá folga para
+    grades com arredondamento nas coordenadas.
+
+    Args:
+        contour (pd.DataFrame): DataFrame com as colunas "lat" e "long" dos vértices do contorno.
+        margin (float): Margem, em graus, adicionada em cada direção.
+
+    Returns:
+        Tuple[float, float, float, float]: Os limites (lat_min, lat_max, long_min, long_max).
+    """
+    _check_contour_columns(contour)
+
+    lat = contour["lat"].to_numpy(dtype=np.float64)
+    long = contour["long"].to_numpy(dtype=np.float64)
+    return (
+        float(lat.min() - margin),
+        float(lat.max() + margin),
+        float(long.min() - margin),
+        float(long.max() + margin),
+    )
+
+
+def build_grid_tree(grid_lat: np.ndarray, grid_long: np.ndarray) -> cKDTree:
+    """
+    Constrói a KD-tree dos pontos de uma grade de previsão.
+
+    Args:
+        grid_lat (np.ndarray): Array 1D com as latitudes dos pontos da grade.
+        grid_long (np.ndarray): Array 1D com as longitudes dos pontos da grade.
+
+    Returns:
+        cKDTree: A KD-tree dos pontos (lat, long).
+    """
+    return cKDTree(np.column_stack([grid_lat, grid_long]))
+
+
+def derive_polygon_order(
+    lat: np.ndarray, long: np.ndarray, parts: Optional[np.ndarray] = None
+) -> List[Tuple[float, float]]:
+    """
+    Deriva a ordem poligonal dos pontos da grade visitados por um contorno.
+
+    Os pontos são mantidos na ordem da primeira visita, sem repetição, e a orientação é
+    normalizada para o sentido horário no plano (lat, long), mantendo o ponto inicial.
+    Em contornos com várias partes, cada parte é ordenada e orientada separadamente e as
+    partes são concatenadas na ordem do contorno, sem arestas entre elas.
+
+    Args:
+        lat (np.ndarray): Latitudes dos pontos da grade associados a cada vértice, na ordem do contorno.
+        long (np.ndarray): Longitudes dos pontos da grade associados a cada vértice, na ordem do contorno.
+        parts (Optional[np.ndarray]): Parte de cada vértice (coluna "parte" de
+            ``read_contour_file``). Se None, o contorno tem uma única parte.
+
+    Returns:
+        List[Tuple[float, float]]: As coordenadas (lat, long) dos pontos, em ordem.
+    """
+    lat, long = np.asarray(lat), np.asarray(long)
+    parts = np.zeros(len(lat), dtype=int) if parts is None else np.asarray(parts)
+
+    order: List[Tuple[float, float]] = []
+    for part in pd.unique(parts):
+        in_part = parts == part
+        order.extend(_ring_order(lat[in_part], long[in_part]))
+
+    # Pontos da grade visitados por mais de uma parte: mantida a primeira visita
+    return list(dict.fromkeys(order))
+
+
+def _ring_order(lat: np.ndarray, long: np.ndarray) -> List[Tuple[float, float]]:
+    """Ordem poligonal, no sentido horário, dos pontos visitados por uma única parte."""
+    cells = pd.DataFrame({"lat": lat, "long": long}).drop_duplicates()
+    lat = cells["lat"].to_numpy()
+    long = cells["long"].to_numpy()
+
+    # Área com sinal (fórmula do laço): positiva no sentido anti-horário
+    signed_area = np.sum(lat * np.roll(long, -1) - np.roll(lat, -1) * long) / 2
+    if signed_area > 0:
+        lat = np.concatenate([lat[:1], lat[1:][::-1]])
+        long = np.concatenate([long[:1], long[1:][::-1]])
+
+    return list(zip(lat.tolist(), long.tolist()))
+
+
+def _douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Vértices mantidos pela simplificação de Douglas-Peucker de uma linha poligonal.
+
+    A recursão é substituída por uma pilha de trechos; a distância de todos os vértices
+    internos de um trecho ao segmento entre suas extremidades é calculada de uma só vez.
+
+    Args:
+        points (np.ndarray): Array (n, 2) com os vértices da linha.
+        tolerance (float): Distância máxima, nas unidades das coordenadas, entre a linha
+            original e a simplificada.
+
+    Returns:
+        np.ndarray: Array booleano (n,) indicando os vértices mantidos.
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        segment = points[last] - points[first]
+        relative = points[first + 1 : last] - points[first]
+
+        # Distância de cada vértice interno ao segmento (ao ponto, se o segmento for nulo,
+        # como nos anéis fechados)
+        length = segment @ segment
+        if length > 0:
+            t = np.clip(relative @ segment / length, 0, 1)
+            relative = relative - t[:, None] * segment
+        distance = np.hypot(relative[:, 0], relative[:, 1])
+
+        farthest = int(np.argmax(distance))
+        if distance[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.extend([(first, split), (split, last)])
+
+    return keep
+
+
+def simplify_polygon(
+    coordinates: np.ndarray, tolerance: float, offsets: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simplifica as partes de um contorno pelo algoritmo de Douglas-Peucker.
+
+    Cada parte é simplificada de forma independente; o primeiro e o último vértice de
+    cada parte são sempre mantidos, logo anéis fechados continuam fechados.
+
+    Args:
+        coordinates (np.ndarray): Array (n, 2) com os vértices (lat, long) de todas as partes.
+        tolerance (float): Distância máxima, em graus, entre o contorno original e o
+            simplificado. Deve ser pequena em relação à bacia, para não degenerar as partes.
+        offsets (Optional[np.ndarray]): Início de cada parte em ``coordinates``, seguido
+            do número de vértices (ver ``read_bln_file``). Se None, há uma única parte.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Os vértices mantidos, contíguos, e os novos offsets.
+
+    Raises:
+        ValueError: Se a tolerância for negativa.
+    """
+    if tolerance < 0:
+        raise ValueError("A tolerância da simplificação não pode ser negativa")
+
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    if offsets is None:
+        offsets = np.array([0, len(coordinates)])
+
+    keep = np.zeros(len(coordinates), dtype=bool)
+    for first, last in zip(offsets[:-1], offsets[1:]):
+        if last > first:
+            keep[first:last] = _douglas_peucker(coordinates[first:last], tolerance)
+
+    # Número de vértices mantidos por parte
+    kept = np.concatenate([[0], np.cumsum(keep)])
+    return np.ascontiguousarray(coordinates[keep]), kept[offsets]